@@ -0,0 +1,352 @@
+"""
+bench.py - TurtlePlotBot performance benchmarks
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Benchmarks for stepper motion, font drawing, menu and form redraws and
+memory allocated drawing circles. Results are written as JSON so they can
+be compared between releases.
+
+On a computer the benchmarks run in the simulator, times are simulated
+time and `host_s` is the CPython run time of each benchmark::
+
+    python3 bench/bench.py [-o results.json] [benchmark ...]
+
+On the TurtlePlotBot copy bench.py to the device and run::
+
+    import bench
+    bench.main()
+
+The results are written to /bench.json. Counts only the simulator can
+make, like SPI bytes and file reads, are null on the device.
+
+Allocated bytes are measured with gc.mem_alloc() and the garbage collector
+disabled on the device and with tracemalloc in the simulator, so they are
+only comparable between runs on the same platform.
+"""
+
+#pylint: disable-msg=import-error
+import sys
+import gc
+import time
+import json
+
+#pylint: disable-msg=invalid-name
+const = lambda x: x
+
+_MOTION_MM = const(100)         # distance moved by the motion benchmarks
+_FONT_TEXT = "Abc"              # text drawn in each font
+_REDRAWS = const(10)            # menu and form redraws timed
+
+_SIM = None
+_HOST = sys.implementation.name != 'micropython'
+
+def _clock_us():
+    return time.ticks_us()
+
+def _host_time():
+    return time.perf_counter() if _HOST else 0
+
+def _i2c_transactions(bot):
+    """
+    Returns:
+        int: I2C transactions made, from the simulated bus or the bot profile
+    """
+    if _SIM is not None:
+        return bot.mcp23017._i2c.transactions
+
+    stats = bot.stats()
+    return stats['i2c_writes'] if stats else 0
+
+def _spi_bytes(ui):
+    """
+    Returns:
+        int: bytes sent to the display or None if they can not be counted
+    """
+    spi = getattr(ui.display, 'spi', None)
+    return spi.bytes if spi is not None and hasattr(spi, 'bytes') else None
+
+def _file_reads():
+    return _SIM.file_reads if _SIM is not None else None
+
+def _diff(after, before):
+    return None if after is None or before is None else after - before
+
+def _per(count, total):
+    return round(count / total, 3) if count is not None and total else None
+
+def _alloc_start():
+    gc.collect()
+    if _HOST:
+        import tracemalloc
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+
+    gc.disable()
+    return gc.mem_alloc()
+
+def _alloc_end(start):
+    if _HOST:
+        import tracemalloc
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak - start
+
+    used = gc.mem_alloc() - start
+    gc.enable()
+    return used
+
+def bench_motion(bot, ui): # pylint: disable-msg=unused-argument
+    """
+    Steps per second and I2C transactions per mm moving with the pen down
+    and up in each drive mode
+    """
+    import turtleplotbot
+
+    results = {}
+    modes = (
+        ('half_step', turtleplotbot.HALF_STEP),
+        ('full_step', turtleplotbot.FULL_STEP),
+        ('wave_drive', turtleplotbot.WAVE_DRIVE))
+
+    saved = bot.drive_mode()
+    for name, mode in modes:
+        for pen in ('down', 'up'):
+            # reset_state puts the drive modes back to half step
+            bot.reset_state()
+            bot.drive_mode(mode, mode)
+            if pen == 'down':
+                bot.pendown()
+
+            bot.profile(True)
+            i2c = _i2c_transactions(bot)
+            start = _clock_us()
+            bot.forward(_MOTION_MM)
+            elapsed = time.ticks_diff(_clock_us(), start)
+            i2c = _i2c_transactions(bot) - i2c
+            stats = bot.stats()
+            results[name + '_pen_' + pen] = {
+                'steps': stats['steps'],
+                'seconds': elapsed / 1000000,
+                'steps_per_s': _per(stats['steps'], elapsed / 1000000),
+                'i2c_per_mm': _per(i2c, _MOTION_MM),
+                'mean_step_us': stats['mean_us'],
+                'max_step_us': stats['max_us'],
+            }
+
+    bot.profile(False)
+    bot.reset_state()
+    bot.drive_mode(*saved)
+    return results
+
+def _fonts():
+    import uos
+    return sorted(
+        entry[0] for entry in uos.ilistdir('/fonts')
+        if entry[0].endswith('.fnt'))
+
+def bench_write(bot, ui): # pylint: disable-msg=unused-argument
+    """
+    Glyphs per second and file reads per glyph writing with
+    TurtlePlot.write in each font
+    """
+    results = {}
+    glyphs = len(_FONT_TEXT)
+    for font in _fonts():
+        bot.reset_state()
+        # the bot keeps its glyphs from earlier runs, time a cold cache
+        bot.glyph_cache().clear()
+        reads = _file_reads()
+        start = _clock_us()
+        bot.write(_FONT_TEXT, '/fonts/' + font)
+        elapsed = time.ticks_diff(_clock_us(), start) / 1000000
+        results[font] = {
+            'seconds': elapsed,
+            'glyphs_per_s': _per(glyphs, elapsed),
+            'reads_per_glyph': _per(_diff(_file_reads(), reads), glyphs),
+        }
+
+    bot.reset_state()
+    return results
+
+def bench_draw(bot, ui): # pylint: disable-msg=unused-argument
+    """
+    Glyphs per second, file reads and SPI bytes per glyph drawing on the
+    display with UI.draw in each font
+    """
+    results = {}
+    glyphs = len(_FONT_TEXT)
+    for font in _fonts():
+        ui.cls()
+        reads = _file_reads()
+        spi = _spi_bytes(ui)
+        start = _clock_us()
+        ui.draw(_FONT_TEXT, 0, 64, font='/fonts/' + font, scale=2)
+        elapsed = time.ticks_diff(_clock_us(), start) / 1000000
+        results[font] = {
+            'seconds': elapsed,
+            'glyphs_per_s': _per(glyphs, elapsed),
+            'reads_per_glyph': _per(_diff(_file_reads(), reads), glyphs),
+            'spi_bytes_per_glyph': _per(_diff(_spi_bytes(ui), spi), glyphs),
+        }
+
+    return results
+
+def _redraws(ui, widget, btn):
+    """
+    Time the first draw of a widget generator and the redraws after
+    sending it btn
+    """
+    spi = _spi_bytes(ui)
+    start = _clock_us()
+    next(widget)
+    first_ms = time.ticks_diff(_clock_us(), start) / 1000
+    first_spi = _diff(_spi_bytes(ui), spi)
+
+    spi = _spi_bytes(ui)
+    start = _clock_us()
+    for _ in range(_REDRAWS):
+        widget.send(btn)
+
+    redraw_ms = time.ticks_diff(_clock_us(), start) / 1000 / _REDRAWS
+    widget.close()
+    return {
+        'first_ms': first_ms,
+        'first_spi_bytes': first_spi,
+        'redraw_ms': redraw_ms,
+        'redraw_spi_bytes': _per(_diff(_spi_bytes(ui), spi), _REDRAWS),
+    }
+
+def bench_ui(bot, ui): # pylint: disable-msg=unused-argument
+    """
+    SPI bytes and time for menu and form redraws
+    """
+    import button
+
+    menu = ["Item {}".format(item) for item in range(20)]
+    form = [
+        [ui.HEAD, 0, "Draw A Star"],
+        [ui.INT, 0, 2, "Points:", 8, 2, 2, 5],
+        [ui.INT, 0, 4, "Length:", 8, 4, 2, 20],
+        [ui.OK, 0, 7, ("Next", "Cancel"), 0],
+    ]
+
+    return {
+        'menu': _redraws(ui, ui._menu("Benchmark", menu, 0, None), button.DOWN),
+        'form': _redraws(ui, ui._form(form), button.DOWN),
+    }
+
+def bench_circle(bot, ui): # pylint: disable-msg=unused-argument
+    """
+    Bytes allocated and time drawing circles
+    """
+    results = {}
+    for radius in (5, 20):
+        bot.reset_state()
+        bot.pendown()
+        start = _alloc_start()
+        clock = _clock_us()
+        bot.circle(radius)
+        elapsed = time.ticks_diff(_clock_us(), clock) / 1000000
+        results['radius_{}'.format(radius)] = {
+            'alloc_bytes': _alloc_end(start),
+            'seconds': elapsed,
+        }
+
+    bot.reset_state()
+    return results
+
+BENCHMARKS = (
+    ('motion', bench_motion),
+    ('write', bench_write),
+    ('draw', bench_draw),
+    ('ui', bench_ui),
+    ('circle', bench_circle),
+)
+
+def run(names=None):
+    """
+    Run the benchmarks
+
+    Args:
+        names (optional list): names of the benchmarks to run, defaults to all
+
+    Returns:
+        dict: the results
+    """
+    import vga2_bold_16x16 as font
+    import session
+    import tftui
+
+    ui = tftui.UI(font)
+    bot = session.bot()
+
+    results = {
+        'platform': sys.platform,
+        'implementation': sys.implementation.name,
+        'simulated': _SIM is not None,
+        'benchmarks': {},
+    }
+
+    for name, benchmark in BENCHMARKS:
+        if names and name not in names:
+            continue
+
+        host = _host_time()
+        results['benchmarks'][name] = benchmark(bot, ui)
+        if _HOST:
+            results['benchmarks'][name]['host_s'] = round(_host_time() - host, 3)
+
+    bot.done()
+    return results
+
+def main(file_name='/bench.json', names=None):
+    """
+    Run the benchmarks and write the results to file_name as JSON
+    """
+    results = run(names)
+    with open(file_name, 'w') as file:
+        json.dump(results, file)
+
+    return results
+
+def _host_main():
+    global _SIM # pylint: disable-msg=global-statement
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description='TurtlePlotBot benchmarks')
+    parser.add_argument('-o', '--output', default='bench.json', help='JSON results file')
+    parser.add_argument('benchmarks', nargs='*', help='benchmarks to run')
+    args = parser.parse_args()
+    output = os.path.abspath(args.output)
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sim'))
+    import simulator
+
+    _SIM = simulator.install()
+    main(output, args.benchmarks)
+    print('results written to', output)
+
+if __name__ == '__main__':
+    _host_main()
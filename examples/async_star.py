@@ -0,0 +1,37 @@
+'''
+Draw a star while showing a pause / cancel screen
+'''
+
+import uasyncio
+import vga2_bold_16x16 as font
+import tftui
+import session
+
+bot = session.bot()
+
+async def star(job, points=5, length=30):
+    '''
+    Draw a 'n' pointed star with 'length' sides, stopping if cancelled
+
+    Args:
+        job: Job object from ui.ajob
+        points: number of points
+        length: length of each side
+    '''
+    angle = 180.0 - 180.0 / points
+    bot.pendown()
+
+    for _ in range(points):
+        if not await job.checkpoint():
+            break
+
+        bot.forward(length)
+        bot.left(angle)
+        bot.forward(length)
+
+    bot.penup()
+
+uasyncio.run(tftui.UI(font).ajob("Drawing Star", star))
+bot.done()
+
+__import__("menu")      # return to turtleplotbot menu
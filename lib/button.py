@@ -27,6 +27,7 @@ SOFTWARE.
 
 # pylint: disable-msg=import-error, no-member
 import time
+import array
 import machine
 
 # pylint: disable-msg=invalid-name
@@ -41,6 +42,64 @@ ZERO = const(0)
 CHANGE = const(1)
 ENTER = const(35)
 
+_QUEUE_SIZE = const(32)     # number of pin changes the EventQueue can hold
+_IDLE_MS = const(10)        # ms to sleep while waiting for a pin change
+
+class EventQueue():
+    """
+    Ring buffer of timestamped pin changes filled by Pin interrupt handlers.
+    Storage is allocated up front so `put` does not allocate memory and can
+    be called from an interrupt handler.
+
+    Args:
+        size (int optional): maximum number of pending changes, defaults to 32
+    """
+    def __init__(self, size=_QUEUE_SIZE):
+        self.size = size
+        self.times = array.array('i', [0] * size)
+        self.events = bytearray(size)
+        self.head = 0
+        self.tail = 0
+        self.overflows = 0
+
+    def put(self, index, value):
+        """
+        Add a pin change to the queue, dropping it if the queue is full.
+
+        Args:
+            index (int): index of the button that changed
+            value (int): new pin value
+        """
+        head = (self.head + 1) % self.size
+        if head == self.tail:
+            self.overflows += 1
+            return
+
+        self.times[self.head] = time.ticks_ms()
+        self.events[self.head] = index << 1 | value
+        self.head = head
+
+    def get(self):
+        """
+        Remove the oldest pin change from the queue.
+
+        Returns:
+            tuple: (ms, index, value) or None if the queue is empty
+        """
+        if self.tail == self.head:
+            return None
+
+        event = self.events[self.tail]
+        result = (self.times[self.tail], event >> 1, event & 1)
+        self.tail = (self.tail + 1) % self.size
+        return result
+
+    def clear(self):
+        """
+        Discard all pending pin changes.
+        """
+        self.tail = self.head
+
 # pylint: disable-msg=too-many-instance-attributes
 class Button():
     """
@@ -66,6 +125,10 @@ class Button():
         self.debounce = debounce
         self.long = long
         self.active_low = active_low
+        self.queue = None
+        self.index = 0
+        self.settling = False
+        self._handler = self._irq
 
     def modify(self, debounce=None, long=None):
         """
@@ -112,13 +175,94 @@ class Button():
         self.last = value
         return 0
 
+    def irq(self, queue, index):
+        """
+        Report pin changes to queue using a Pin interrupt on both edges
+        instead of polling the pin with `read`.
+
+        Args:
+            queue (EventQueue): queue to add pin changes to
+            index (int): index to identify this button in the queue
+        """
+        self.queue = queue
+        self.index = index
+        self.state = self.pin.value() ^ (1 if self.active_low else 0)
+        self.last_ms = time.ticks_ms()
+        # a button already held down, like the one that started a program,
+        # is not reported as a long press
+        self.down = self.last_ms
+        self.fired = self.state == self.active
+        self.pin.irq(
+            handler=self._handler,
+            trigger=machine.Pin.IRQ_FALLING | machine.Pin.IRQ_RISING)
+
+    def _irq(self, pin):
+        """
+        Pin interrupt handler, must not allocate memory.
+        """
+        self.queue.put(self.index, pin.value())
+
+    def event(self, change_ms, value):
+        """
+        Debounce a pin change read from the EventQueue. A change is accepted
+        if it differs from the current state and at least `debounce` ms have
+        passed since the last accepted change.
+
+        Args:
+            change_ms (int): ticks_ms of the change
+            value (int): pin value after the change
+
+        Returns:
+            int: 1 if the change is a button press, otherwise 0
+        """
+        if self.active_low:
+            value ^= 1
+
+        if time.ticks_diff(change_ms, self.last_ms) < self.debounce:
+            self.settling = True
+            return 0
+
+        if value == self.state:
+            return 0
+
+        self.state = value
+        self.last_ms = change_ms
+        self.fired = False
+        if value == self.active:
+            self.down = change_ms
+            return 1
+
+        return 0
+
+    def poll(self, now_ms):
+        """
+        Check for a long press and resync the state after ignored bounces.
+
+        Args:
+            now_ms (int): current ticks_ms
+
+        Returns:
+            int: 1 if pressed, -1 if long pressed, otherwise 0
+        """
+        if self.settling and time.ticks_diff(now_ms, self.last_ms) > self.debounce:
+            self.settling = False
+            if self.event(now_ms, self.pin.value()):
+                return 1
+
+        if self.long and self.state == self.active and not self.fired:
+            if time.ticks_diff(now_ms, self.down) > self.long:
+                self.fired = True
+                return -1
+
+        return 0
+
 # pylint: disable-msg=too-few-public-methods
 class JoyStick():
     """
     JoyStick class, handles reading a five way switch style joystick. Uses
     the Button class and supports long press notification.
     """
-    def __init__(self, buttons=None):
+    def __init__(self, buttons=None, irq=False):
         """
         Initialize JoyStick
 
@@ -126,6 +270,10 @@ class JoyStick():
             value to return when switch is pressed and released. The second
             tuple element should be a Button object for the switch.
 
+            irq (optional bool): If True pin changes are queued by Pin
+            interrupts and `read` sleeps while waiting instead of polling
+            the buttons. Presses made while the program is busy are kept in
+            the queue until the next `read`.
         """
         if buttons is None:
             self.buttons = [
@@ -142,6 +290,25 @@ class JoyStick():
 
         self.max_ms = 0
         self.start_ms = 0
+        self.queue = None
+
+        if irq:
+            self.queue = EventQueue()
+            self.attach()
+
+    def attach(self):
+        """
+        Send the button pin interrupts to this JoyStick's queue again, used
+        after another JoyStick, like one created by a program, has taken
+        them over. Pending changes are discarded.
+        """
+        if self.queue is None:
+            return
+
+        for index, button in enumerate(self.buttons):
+            button[1].irq(self.queue, index)
+
+        self.queue.clear()
 
     def read(self, max_wait=0):
         """
@@ -162,10 +329,75 @@ class JoyStick():
             self.start_ms = time.ticks_ms()
 
         while True:
+            result = self._check()
+            if result:
+                return result
+
+            if self._expired():
+                return 0
+
+            if self.queue is not None:
+                time.sleep_ms(_IDLE_MS)
+
+    async def aread(self, max_wait=0):
+        """
+        Read JoyStick without blocking other uasyncio tasks
+
+        Args: max_wait (optional int): maximum time to wait for button press
+            in ms.
+
+        Returns: int: the same values as `read`
+        """
+        import uasyncio as asyncio
+
+        self.max_ms = max_wait
+        if max_wait:
+            self.start_ms = time.ticks_ms()
+
+        while True:
+            result = self._check()
+            if result:
+                return result
+
+            if self._expired():
+                return 0
+
+            await asyncio.sleep_ms(_IDLE_MS if self.queue is not None else 0)
+
+    def _expired(self):
+        """
+        Returns: bool: True if max_wait was given and has passed
+        """
+        return self.max_ms and time.ticks_diff(
+            time.ticks_ms(), self.start_ms) > self.max_ms
+
+    def _check(self):
+        """
+        Check the buttons once, using the EventQueue filled by the button
+        interrupts if there is one.
+
+        Returns: int: the value of the button pressed or 0
+        """
+        if self.queue is None:
             for button in self.buttons:
                 result = button[1].read()
                 if result:
                     return button[0] * result
 
-            if self.max_ms and time.ticks_ms() - self.start_ms > self.max_ms:
-                return 0
+            return 0
+
+        event = self.queue.get()
+        while event is not None:
+            change_ms, index, value = event
+            if self.buttons[index][1].event(change_ms, value):
+                return self.buttons[index][0]
+
+            event = self.queue.get()
+
+        now = time.ticks_ms()
+        for button in self.buttons:
+            result = button[1].poll(now)
+            if result:
+                return button[0] * result
+
+        return 0
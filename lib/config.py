@@ -0,0 +1,168 @@
+"""
+config.py - persistent settings stored in a btree file
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+_CONFIG = None
+
+def _bytes(value):
+    """
+    Return value encoded as bytes
+    """
+    return value.encode() if isinstance(value, str) else bytes(value)
+
+class Config:
+    """
+    Config: settings stored in a btree file. The btree is opened on first
+    use and kept open, values read are cached in memory and values written
+    are held until `flush()` or `close()` is called.
+
+    Args:
+        file_name (optional str): name of the btree file, defaults to ui.cfg
+    """
+    def __init__(self, file_name="ui.cfg"):
+        self.file_name = file_name
+        self.cfg_file = None
+        self.cfg_db = None
+        self.cache = {}
+        self.dirty = set()
+
+    def _open(self):
+        """
+        Open the btree file if it is not already open.
+
+        Returns:
+            btree: the open btree database
+        """
+        if self.cfg_db is None:
+            # pylint: disable-msg=import-error
+            import btree
+
+            try:
+                self.cfg_file = open(self.file_name, "r+b")
+            except OSError:
+                self.cfg_file = open(self.file_name, "w+b")
+
+            self.cfg_db = btree.open(self.cfg_file)
+
+        return self.cfg_db
+
+    def get(self, cfg_name):
+        """
+        get: get config setting
+
+        Args:
+            cfg_name ([str, bytes]): name of setting to load
+
+        Returns:
+            (bytes): value of setting, b'' if the setting does not exist
+        """
+        name = _bytes(cfg_name)
+        try:
+            return self.cache[name]
+        except KeyError:
+            pass
+
+        try:
+            cfg_value = self._open()[name]
+        except KeyError:
+            cfg_value = b''
+
+        self.cache[name] = cfg_value
+        return cfg_value
+
+    def put(self, cfg_name, cfg_value):
+        """
+        put: put config setting, the setting is written on the next flush
+
+        Args:
+            cfg_name ([str, bytes, bytearray]): name of setting to store
+            cfg_value ([str, bytes, bytearray]): value of setting to store
+        """
+        name = _bytes(cfg_name)
+        value = _bytes(cfg_value)
+        if self.cache.get(name) != value:
+            self.cache[name] = value
+            self.dirty.add(name)
+
+    def clear(self):
+        """
+        clear: remove all settings
+        """
+        cfg_db = self._open()
+        for name in list(cfg_db):
+            del cfg_db[name]
+
+        self.cache = {}
+        self.dirty = set()
+
+    def items(self):
+        """
+        items: flush pending writes and return all settings
+
+        Returns:
+            list: list of (name, value) tuples
+        """
+        self.flush()
+        cfg_db = self._open()
+        return [(name, cfg_db[name]) for name in cfg_db]
+
+    def flush(self):
+        """
+        flush: write pending settings to the btree file
+        """
+        if self.cfg_db is None and not self.dirty:
+            return
+
+        cfg_db = self._open()
+        for name in self.dirty:
+            cfg_db[name] = self.cache[name]
+
+        self.dirty = set()
+        cfg_db.flush()
+        self.cfg_file.flush()
+
+    def close(self):
+        """
+        close: write pending settings and close the btree file
+        """
+        self.flush()
+        if self.cfg_db is not None:
+            self.cfg_db.close()
+            self.cfg_file.close()
+            self.cfg_db = None
+            self.cfg_file = None
+
+def shared():
+    """
+    shared: return the shared Config object for ui.cfg, creating it on first
+    use.
+
+    Returns:
+        Config: the shared Config object
+    """
+    global _CONFIG # pylint: disable-msg=global-statement
+    if _CONFIG is None:
+        _CONFIG = Config()
+
+    return _CONFIG
@@ -0,0 +1,283 @@
+"""
+launcher.py - run the programs in /programs from the menu
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Each program is imported to run it, from a precompiled .mpy file when the
+cache holds an up to date one, so it does not have to be compiled on the
+device each time it is run. When it ends the modules it loaded are
+unloaded and the heap is collected, see `run`. When profiling is turned
+on with `profiling` the memory and time each run uses is recorded in the
+`runstats` log.
+
+The ESP32 can not compile .mpy files itself, `tools/mpycache.py` compiles
+the programs with mpy-cross on a computer into `programs/__mpy__` along
+with an index of the size and SHA256 digest of each source file. Copy the
+directory to `/programs/__mpy__` on the device.
+
+The index line for each program is::
+
+    name size mtime digest
+
+The first time a program is run the digest of its source is checked and
+the mtime of the source on the device is added to the index. After that
+the .mpy is used while the source has the same size and mtime. A program
+whose source has changed is imported from the source and its .mpy is
+removed until the cache is rebuilt.
+"""
+
+#pylint: disable-msg=import-error
+import sys
+import gc
+import uos
+
+import config
+
+PROGRAMS = "/programs"          # programs shown in the Run Program menu
+_CACHE = "/__mpy__"             # .mpy cache folder in PROGRAMS
+_INDEX = "/index"               # cache index file in the cache folder
+
+# modules kept loaded after a program ends, session keeps the TurtlePlotBot
+# they define between programs
+KEEP = ('turtleplotbot', 'turtleplot', 'mcp23017', 'servo', 'stepstats')
+
+def _digest(file_name):
+    """
+    Returns:
+        str: hex SHA256 digest of the file
+    """
+    import hashlib
+    import binascii
+
+    digest = hashlib.sha256()
+    buffer = bytearray(512)
+    with open(file_name, "rb") as file:
+        while True:
+            count = file.readinto(buffer)
+            if not count:
+                break
+            digest.update(buffer[:count])
+
+    return binascii.hexlify(digest.digest()).decode()
+
+class MpyCache:
+    """
+    Index of the precompiled programs in the cache folder
+
+    Args:
+        programs (optional str): folder holding the programs
+    """
+    def __init__(self, programs=PROGRAMS):
+        self.programs = programs
+        self.folder = programs + _CACHE
+        self.index = None
+        self.dirty = False
+
+    def _load(self):
+        """
+        Read the index file the first time it is needed
+
+        Returns:
+            dict: program name: [size, mtime, digest]
+        """
+        if self.index is None:
+            self.index = {}
+            try:
+                with open(self.folder + _INDEX) as file:
+                    for line in file:
+                        fields = line.split()
+                        if len(fields) == 4:
+                            self.index[fields[0]] = [
+                                int(fields[1]), int(fields[2]), fields[3]]
+            except OSError:
+                pass
+
+        return self.index
+
+    def save(self):
+        """
+        Write the index file if it has changed
+        """
+        if self.dirty:
+            with open(self.folder + _INDEX, "w") as file:
+                for name, (size, mtime, digest) in self.index.items():
+                    file.write("{} {} {} {}\n".format(name, size, mtime, digest))
+
+            self.dirty = False
+
+    def _remove(self, name):
+        """
+        Remove a program whose source has changed from the cache
+        """
+        del self.index[name]
+        self.dirty = True
+        try:
+            uos.remove("{}/{}.mpy".format(self.folder, name))
+        except OSError:
+            pass
+
+    def valid(self, name):
+        """
+        Check the cached .mpy of program name is up to date
+
+        Returns:
+            bool: True if the program should be imported from the cache
+        """
+        entry = self._load().get(name)
+        if entry is None:
+            return False
+
+        source = "{}/{}.py".format(self.programs, name)
+        try:
+            stat = uos.stat(source)
+            uos.stat("{}/{}.mpy".format(self.folder, name))
+        except OSError:
+            self._remove(name)
+            return False
+
+        size, mtime = stat[6], stat[8]
+        if entry[0] != size:
+            self._remove(name)
+            return False
+
+        # some file systems do not keep mtimes, check the digest every time
+        if mtime and entry[1] == mtime:
+            return True
+
+        if _digest(source) != entry[2]:
+            self._remove(name)
+            return False
+
+        if entry[1] != mtime:
+            entry[1] = mtime
+            self.dirty = True
+
+        return True
+
+_MPY_CACHE = None
+
+def mpy_cache():
+    """
+    Returns:
+        MpyCache: the shared cache index
+    """
+    global _MPY_CACHE # pylint: disable-msg=global-statement
+    if _MPY_CACHE is None:
+        _MPY_CACHE = MpyCache()
+
+    return _MPY_CACHE
+
+def _import(name):
+    """
+    Import program name, from its .mpy if the cache has an up to date one
+    """
+    cache = mpy_cache()
+    cached = cache.valid(name)
+    cache.save()
+    if not cached:
+        __import__(name)
+        return
+
+    # the program runs while it is imported so the cache folder stays at
+    # the front of the path until it returns
+    sys.path.insert(0, cache.folder)
+    try:
+        __import__(name)
+    finally:
+        sys.path.remove(cache.folder)
+
+def profiling(enable=None):
+    """
+    Turn recording the memory and time used by each program run on or
+    off, the setting is kept in the config.
+
+    Args:
+        enable (optional bool): True to record, False to stop recording
+
+    Returns:
+        bool: True if runs are recorded
+    """
+    cfg = config.shared()
+    if enable is not None:
+        cfg.put(b'PROFILE', b'1' if enable else b'')
+        cfg.flush()
+
+    return cfg.get(b'PROFILE') == b'1'
+
+def run(name, uio=None, profile=None):
+    """
+    Run program name and clean up after it. Modules the program imported
+    are removed from sys.modules, except the ones holding the shared
+    hardware, so the memory they use can be reclaimed, and the joystick
+    of uio gets its pin interrupts back from any UI the program created.
+
+    Args:
+        name (str): program module name, the file name without .py
+        uio (optional tftui.UI): UI to return to when the program ends
+        profile (optional bool): record the run in the `runstats` log,
+            defaults to the `profiling` setting
+
+    Returns:
+        tuple: (bytes free before, bytes free after) the program ran
+    """
+    if name in sys.modules:
+        del sys.modules[name]
+
+    stats = None
+    if profile is None:
+        profile = profiling()
+
+    if profile:
+        from runstats import RunStats
+        stats = RunStats(name)
+
+    gc.collect()
+    free_before = gc.mem_free()
+    loaded = set(sys.modules)
+    status = "ok"
+    if stats is not None:
+        stats.start()
+
+    try:
+        _import(name)
+    except Exception as error:
+        status = type(error).__name__
+        raise
+    finally:
+        if stats is not None:
+            stats.stop(status)
+
+        for module in list(sys.modules):
+            if module not in loaded and module not in KEEP:
+                del sys.modules[module]
+
+        if uio is not None:
+            uio.joystick.attach()
+
+        gc.collect()
+        free_after = gc.mem_free()
+        if stats is not None:
+            stats.free_after = free_after
+            stats.save()
+
+    print("{}: {} bytes free before, {} after".format(name, free_before, free_after))
+    return (free_before, free_after)
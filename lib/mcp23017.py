@@ -50,12 +50,22 @@ _MCP_IOCON_SEQOP  = const(32)
 _MCP_IOCON_MIRROR = const(64)
 _MCP_IOCON_BANK   = const(128)
 
+# registers kept in the write-through shadow, reads are served from RAM
+_MCP_SHADOWED     = const((1 << _MCP_IODIR) | (1 << _MCP_IOCON) | (1 << _MCP_GPPU) | (1 << _MCP_OLAT))
+
 
 class Port():
     # represents one of the two 8-bit ports
     def __init__(self, port, mcp):
         self._port = port & 1  # 0=PortA, 1=PortB
         self._mcp = mcp
+        self._regs = bytearray(_MCP_OLAT + 1)  # register addresses for the current bank
+        self._remap()
+
+    def _remap(self):
+        # precompute the register addresses, called when the bank changes
+        for reg in range(len(self._regs)):
+            self._regs[reg] = self._which_reg(reg)
 
     def _which_reg(self, reg):
         if self._mcp._config & 0x80 == 0x80:
@@ -72,15 +82,40 @@ class Port():
             setattr(self, reg, getattr(self, reg) & ~bit)
 
     def _read(self, reg):
-        return self._mcp._i2c.readfrom_mem(self._mcp._address, self._which_reg(reg), 1)[0]
+        if _MCP_SHADOWED >> reg & 1:
+            return self._mcp._shadow[reg << 1 | self._port]
+        buf = self._mcp._buf
+        self._mcp._i2c.readfrom_mem_into(self._mcp._address, self._regs[reg], buf)
+        return buf[0]
 
-    def _write(self, reg, val):
+    def _write(self, reg, val, buf=None):
+        val &= 0xff
+        if buf is None:
+            buf = self._mcp._buf
+        buf[0] = val
+        self._mcp._i2c.writeto_mem(self._mcp._address, self._regs[reg], buf)
+        shadow = self._mcp._shadow
+        shadow[reg << 1 | self._port] = val
+        if reg == _MCP_GPIO:
+            # writing to GPIO writes the output latch
+            shadow[_MCP_OLAT << 1 | self._port] = val
+        elif reg == _MCP_IOCON:
+            # if writing to the config register, make a copy in mcp so that it knows
+            # which bank you're using for subsequent writes
+            shadow[_MCP_IOCON << 1] = val
+            shadow[_MCP_IOCON << 1 | 1] = val
+            self._mcp._set_config(val)
+
+    def _update(self, reg, val):
+        # write a shadowed register only if the value changes
         val &= 0xff
-        self._mcp._i2c.writeto_mem(self._mcp._address, self._which_reg(reg), bytearray([val]))
-        # if writing to the config register, make a copy in mcp so that it knows
-        # which bank you're using for subsequent writes
-        if reg == _MCP_IOCON:
-            self._mcp._config = val
+        if self._mcp._shadow[reg << 1 | self._port] != val:
+            self._write(reg, val)
+
+    def set_bits(self, mask, val):
+        # set the output latch bits in mask to the bits in val, one write at most
+        latch = self._mcp._shadow[_MCP_OLAT << 1 | self._port]
+        self._update(_MCP_OLAT, (latch & ~mask) | (val & mask))
 
     @property
     def mode(self):
@@ -149,6 +184,11 @@ class Port():
         # writing to this register modifies the OLAT register for pins configured as output
         self._write(_MCP_GPIO, val)
 
+    def write_gpio(self, val, buf):
+        # write GPIO through a one byte buffer of the caller's, for timer and
+        # interrupt callbacks that may run while the shared buffer is in use
+        self._write(_MCP_GPIO, val, buf)
+
     @property
     def output_latch(self):
         return self._read(_MCP_OLAT)
@@ -163,6 +203,12 @@ class MCP23017():
         self._i2c = i2c
         self._address = address
         self._config = 0x00
+        self._shadow = bytearray(22)    # register values, index (reg << 1) | port
+        self._buf = bytearray(1)        # single register transfer buffer
+        self._block = memoryview(bytearray(22))  # block transfer buffer
+        self._pair = self._block[0:2]   # 16-bit register transfer buffer
+        self.porta = Port(0, self)
+        self.portb = Port(1, self)
         self._virtual_pins = {}
         self.init()
 
@@ -171,20 +217,125 @@ class MCP23017():
         if self._i2c.scan().count(self._address) == 0:
             raise OSError('MCP23017 not found at I2C address {:#x}'.format(self._address))
 
-        self.porta = Port(0, self)
-        self.portb = Port(1, self)
-
-        self.io_config = 0x00      # io expander configuration - same on both ports, only need to write once
+        self.io_config = 0x00      # io expander configuration - same on both ports, bank 0, sequential
 
         # Reset to all inputs with no pull-ups and no inverted polarity.
-        self.mode = 0xFFFF                       # in/out direction (0=out, 1=in)
-        self.input_polarity = 0x0000             # invert port input polarity (0=normal, 1=invert)
-        self.interrupt_enable = 0x0000           # int on change pins (0=disabled, 1=enabled)
-        self.default_value = 0x0000              # default value for int on change
-        self.interrupt_compare_default = 0x0000  # int on change control (0=compare to prev val, 1=compare to def val)
-        self.pullup = 0x0000                     # gpio weak pull up resistor - when configured as input (0=disabled, 1=enabled)
+        # IODIR, IPOL, GPINTEN, DEFVAL, INTCON, IOCON and GPPU in one transfer
+        regs = self._block[0:_MCP_GPPU * 2 + 2]
+        for reg in range(len(regs)):
+            regs[reg] = 0x00
+        regs[_MCP_IODIR * 2] = 0xFF                 # in/out direction (0=out, 1=in)
+        regs[_MCP_IODIR * 2 + 1] = 0xFF
+        self.write_block(0, regs)
         self.gpio = 0x0000                       # port (0=logic low, 1=logic high)
 
+    def _sequential(self):
+        # True if A and B registers are adjacent and the address pointer increments
+        return not self._config & (_MCP_IOCON_BANK | _MCP_IOCON_SEQOP)
+
+    def _read16(self, reg):
+        # read a register from both ports, one transfer when possible
+        if not self._sequential():
+            return self.porta._read(reg) | (self.portb._read(reg) << 8)
+        data = self._pair
+        self._i2c.readfrom_mem_into(self._address, reg << 1, data)
+        return data[0] | (data[1] << 8)
+
+    def _write16(self, reg, val):
+        # write a register on both ports, one transfer when possible
+        if not self._sequential():
+            self.porta._write(reg, val)
+            self.portb._write(reg, val >> 8)
+            return
+        data = self._pair
+        data[0] = val & 0xff
+        data[1] = (val >> 8) & 0xff
+        self.write_block(reg << 1, data)
+
+    def _reg_port(self, addr):
+        # logical (reg, port) of a chip register address in the current bank,
+        # ValueError if no register is at addr
+        if self._config & _MCP_IOCON_BANK:
+            reg, port = addr & 0x0f, (addr >> 4) & 1
+            valid = 0 <= addr < 0x20 and reg <= _MCP_OLAT
+        else:
+            reg, port = addr >> 1, addr & 1
+            valid = 0 <= addr and reg <= _MCP_OLAT
+        if not valid:
+            raise ValueError('no MCP23017 register at {:#x}'.format(addr))
+        return reg, port
+
+    def _check_block(self, start_reg, n):
+        # raise ValueError before a transfer if any address has no register
+        for offset in range(n):
+            self._reg_port(start_reg + offset)
+
+    def read_block(self, start_reg, n):
+        # read n registers starting at chip address start_reg, in one transfer
+        # in sequential mode or one per register when SEQOP fixes the address
+        # pointer, returns a view of an internal buffer that is valid until
+        # the next block transfer
+        self._check_block(start_reg, n)
+        data = self._block[0:n]
+        if self._config & _MCP_IOCON_SEQOP:
+            for offset in range(n):
+                self._i2c.readfrom_mem_into(
+                    self._address, start_reg + offset, data[offset:offset + 1])
+        else:
+            self._i2c.readfrom_mem_into(self._address, start_reg, data)
+        return data
+
+    def write_block(self, start_reg, buf):
+        # write buf to consecutive registers starting at chip address start_reg,
+        # in one transfer in sequential mode or one per register when SEQOP
+        # fixes the address pointer, updating the shadow registers
+        self._check_block(start_reg, len(buf))
+        if self._config & _MCP_IOCON_SEQOP:
+            buf = memoryview(buf)
+            for offset in range(len(buf)):
+                self._i2c.writeto_mem(
+                    self._address, start_reg + offset, buf[offset:offset + 1])
+        else:
+            self._i2c.writeto_mem(self._address, start_reg, buf)
+        config = None
+        for offset in range(len(buf)):
+            reg, port = self._reg_port(start_reg + offset)
+            self._shadow[reg << 1 | port] = buf[offset]
+            if reg == _MCP_GPIO:
+                self._shadow[_MCP_OLAT << 1 | port] = buf[offset]
+            elif reg == _MCP_IOCON:
+                config = buf[offset]
+        if config is not None:
+            self._shadow[_MCP_IOCON << 1] = config
+            self._shadow[_MCP_IOCON << 1 | 1] = config
+            self._set_config(config)
+
+    def snapshot(self):
+        # read the full register file, returns 22 bytes in bank 0 order
+        # (reg << 1) | port, one transfer in bank 0. Note reading INTCAP and
+        # GPIO clears any pending interrupt
+        if self._config & _MCP_IOCON_BANK:
+            data = bytearray(22)
+            for port in (0, 1):
+                regs = self.read_block(port << 4, _MCP_OLAT + 1)
+                for reg in range(_MCP_OLAT + 1):
+                    data[reg << 1 | port] = regs[reg]
+            return bytes(data)
+        return bytes(self.read_block(0, 22))
+
+    def restore(self, data):
+        # reload a register file saved by snapshot, IOCON is written first so
+        # the remaining registers are written using the saved bank setting
+        config = data[_MCP_IOCON << 1]
+        self.io_config = config
+        if config & _MCP_IOCON_BANK:
+            for port in (0, 1):
+                self.write_block(
+                    port << 4,
+                    bytes(data[reg << 1 | port] for reg in range(_MCP_OLAT + 1)))
+        else:
+            self.write_block(0, data)
+
     def config(self, interrupt_polarity=None, interrupt_open_drain=None, sda_slew=None, sequential_operation=None, interrupt_mirror=None, bank=None):
         io_config = self.porta.io_config
 
@@ -220,7 +371,14 @@ class MCP23017():
 
         # both ports share the same register, so you only need to write on one
         self.porta.io_config = io_config
+
+    def _set_config(self, io_config):
+        # keep a copy of IOCON and the register addresses for its bank
+        bank = (self._config ^ io_config) & _MCP_IOCON_BANK
         self._config = io_config
+        if bank:
+            self.porta._remap()
+            self.portb._remap()
 
     def _flip_bit(self, value, condition, bit):
         if condition:
@@ -240,7 +398,7 @@ class MCP23017():
         if value is not None:
             # 0: Pin is set to logic low
             # 1: Pin is set to logic high
-            port._flip_property_bit('gpio', value & 1, bit)
+            port._flip_property_bit('output_latch', value & 1, bit)
         if pullup is not None:
             # 0: Weak pull-up 100k ohm resistor disabled
             # 1: Weak pull-up 100k ohm resistor enabled
@@ -282,44 +440,39 @@ class MCP23017():
         return self.porta.mode | (self.portb.mode << 8)
     @mode.setter
     def mode(self, val):
-        self.porta.mode = val
-        self.portb.mode = (val >> 8)
+        self._write16(_MCP_IODIR, val)
 
     # input_polarity (IPOL register)
     @property
     def input_polarity(self):
-        return self.porta.input_polarity | (self.portb.input_polarity << 8)
+        return self._read16(_MCP_IPOL)
     @input_polarity.setter
     def input_polarity(self, val):
-        self.porta.input_polarity = val
-        self.portb.input_polarity = (val >> 8)
+        self._write16(_MCP_IPOL, val)
 
     # interrupt_enable (GPINTEN register)
     @property
     def interrupt_enable(self):
-        return self.porta.interrupt_enable | (self.portb.interrupt_enable << 8)
+        return self._read16(_MCP_GPINTEN)
     @interrupt_enable.setter
     def interrupt_enable(self, val):
-        self.porta.interrupt_enable = val
-        self.portb.interrupt_enable = (val >> 8)
+        self._write16(_MCP_GPINTEN, val)
 
     # default_value (DEFVAL register)
     @property
     def default_value(self):
-        return self.porta.default_value | (self.portb.default_value << 8)
+        return self._read16(_MCP_DEFVAL)
     @default_value.setter
     def default_value(self, val):
-        self.porta.default_value = val
-        self.portb.default_value = (val >> 8)
+        self._write16(_MCP_DEFVAL, val)
 
     # interrupt_compare_default (INTCON register)
     @property
     def interrupt_compare_default(self):
-        return self.porta.interrupt_compare_default | (self.portb.interrupt_compare_default << 8)
+        return self._read16(_MCP_INTCON)
     @interrupt_compare_default.setter
     def interrupt_compare_default(self, val):
-        self.porta.interrupt_compare_default = val
-        self.portb.interrupt_compare_default = (val >> 8)
+        self._write16(_MCP_INTCON, val)
 
     # io_config (IOCON register)
     # This register is duplicated in each port. Changing one changes both.
@@ -336,29 +489,27 @@ class MCP23017():
         return self.porta.pullup | (self.portb.pullup << 8)
     @pullup.setter
     def pullup(self, val):
-        self.porta.pullup = val
-        self.portb.pullup = (val >> 8)
+        self._write16(_MCP_GPPU, val)
 
     # interrupt_flag (INTF register)
     # read only
     @property
     def interrupt_flag(self):
-        return self.porta.interrupt_flag | (self.portb.interrupt_flag << 8)
+        return self._read16(_MCP_INTF)
 
     # interrupt_captured (INTCAP register)
     # read only
     @property
     def interrupt_captured(self):
-        return self.porta.interrupt_captured | (self.portb.interrupt_captured << 8)
+        return self._read16(_MCP_INTCAP)
 
     # gpio (GPIO register)
     @property
     def gpio(self):
-        return self.porta.gpio | (self.portb.gpio << 8)
+        return self._read16(_MCP_GPIO)
     @gpio.setter
     def gpio(self, val):
-        self.porta.gpio = val
-        self.portb.gpio = (val >> 8)
+        self._write16(_MCP_GPIO, val)
 
     # output_latch (OLAT register)
     @property
@@ -366,8 +517,14 @@ class MCP23017():
         return self.porta.output_latch | (self.portb.output_latch << 8)
     @output_latch.setter
     def output_latch(self, val):
-        self.porta.output_latch = val
-        self.portb.output_latch = (val >> 8)
+        self._write16(_MCP_OLAT, val)
+
+    def set_bits(self, mask, val):
+        # set the output latch bits in mask to the bits in val, one write per port at most
+        if mask & 0xff:
+            self.porta.set_bits(mask & 0xff, val)
+        if mask >> 8:
+            self.portb.set_bits(mask >> 8, val >> 8)
 
     # list interface
     # mcp[pin] lazy creates a VirtualPin(pin, port)
@@ -392,18 +549,18 @@ class VirtualPin():
     def value(self, val=None):
         # if val, write, else read
         if val is not None:
-            self._port.gpio = self._flip_bit(self._port.gpio, val & 1)
+            self._port.set_bits(self._bit, self._bit if val & 1 else 0)
         else:
             return self._get_bit(self._port.gpio)
 
     def input(self, pull=None):
         # if pull, enable pull up, else read
-        self._port.mode = self._flip_bit(self._port.mode, 1) # mode = input
+        self._port._update(_MCP_IODIR, self._flip_bit(self._port.mode, 1)) # mode = input
         if pull is not None:
-            self._port.pullup = self._flip_bit(self._port.pullup, pull & 1) # toggle pull up
+            self._port._update(_MCP_GPPU, self._flip_bit(self._port.pullup, pull & 1)) # toggle pull up
 
     def output(self, val=None):
         # if val, write, else read
-        self._port.mode = self._flip_bit(self._port.mode, 0) # mode = output
+        self._port._update(_MCP_IODIR, self._flip_bit(self._port.mode, 0)) # mode = output
         if val is not None:
-            self._port.gpio = self._flip_bit(self._port.gpio, val & 1)
+            self._port.set_bits(self._bit, self._bit if val & 1 else 0)
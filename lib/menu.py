@@ -25,30 +25,25 @@ SOFTWARE.
 #pylint: disable-msg=import-error
 import time
 import sys
-import gc
-import network
-import uos
 
 import vga2_bold_16x16 as font
 import tftui
+import launcher
 import button
+import config
+import session
 
-def reload(mod):
-    """
-    reload: Removes a module and re-imports allowing you to re-run programs
-
-    Args:
-        mod (str): Name of module to reload
-    """
-    mod_name = mod.__name__
-    del sys.modules[mod_name]
-    gc.collect()
-    return __import__(mod_name)
+# the network stack and the btree used by config are imported when a menu
+# item first needs them so the main menu is shown sooner after power on
+READY_MS = None             # ticks_ms after reset when the menu was ready
+_IMPORTED_MS = time.ticks_ms()
 
 def connect_ap(uio):
     """
     scan for ap's and allow user to select and connect to it
     """
+    import network
+
     sta_if = network.WLAN(network.STA_IF)
     sta_if.active(True)
     if sta_if.isconnected():
@@ -92,6 +87,7 @@ def connect_ap(uio):
             uio.cls("Connection", 0)
             if sta_if.isconnected():
                 uio.put(ap_name, ap_pass)
+                uio.flush()
                 uio.center("Successful", 1)
                 ifconfig = sta_if.ifconfig()
                 uio.center("IP Address:", 3)
@@ -107,6 +103,8 @@ def disconnect_ap(uio):
     """
     disconnect from ap
     """
+    import network
+
     sta_if = network.WLAN(network.STA_IF)
     uio.cls()
     uio.center("Disable AP", 0, uio.fg_hdr, uio.bg_hdr)
@@ -120,6 +118,8 @@ def enable_ap(uio):
     Ask user for ap_name and ap_password then start ap and save
     ap_name and ap_pass to uio.cfg btree file
     """
+    import network
+
     ap_name = uio.get(b'AP_NAME')
     ap_pass = uio.get(b'AP_PASS')
     ok = 0
@@ -159,6 +159,9 @@ def enable_ap(uio):
                 uio.center("Access Point", 0)
                 if sta_ap.active():
                     uio.put(ap_name, ap_pass)
+                uio.flush()
+
+                if sta_ap.active():
                     uio.center("Enabled", 1)
                     ifconfig = sta_ap.ifconfig()
                     uio.center("IP Address:", 3)
@@ -182,6 +185,8 @@ def disable_ap(uio):
     """
     disable AP if running
     """
+    import network
+
     sta_ap = network.WLAN(network.AP_IF)
     uio.cls()
     uio.center("Disable AP", 0, uio.fg_hdr, uio.bg_hdr)
@@ -194,15 +199,21 @@ def run_program(uio):
     """
     show list of python programs and allow user to select one to run
     """
-    programs = uos.listdir("/programs")
+    programs = tftui.DirItems(launcher.PROGRAMS, ".py")
     program = 0
     program = uio.menu("Run Program", programs, program)
     if program is not None:
-        mod_name = "".join(programs[program].split(".")[:-1])
-        if mod_name in sys.modules:
-            reload(sys.modules[mod_name])
-        else:
-            __import__(mod_name)
+        mod_name = "".join(programs.item(program).split(".")[:-1])
+        launcher.run(mod_name, uio)
+
+def _ready():
+    """
+    Report the time from reset to the main menu being shown
+    """
+    global READY_MS # pylint: disable-msg=global-statement
+    READY_MS = time.ticks_ms()
+    print("menu ready {} ms after reset, {} ms after imports".format(
+        READY_MS, time.ticks_diff(READY_MS, _IMPORTED_MS)))
 
 def main_menu(uio):
     """
@@ -217,6 +228,7 @@ def main_menu(uio):
         ("Quit", None)]
 
     option = 0
+    uio.on_ready = _ready
     while True:
         option = uio.menu("DrawBot Menu", menu, option, 0)
         if option not in [None, 5]:
@@ -229,6 +241,8 @@ def main_menu(uio):
             uio.center("Press to", 5)
             uio.wait("Continue", 6)
             uio.cls()
+            config.shared().close()
+            session.close()
             break
 
 main_menu(tftui.UI(font))
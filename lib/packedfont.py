@@ -0,0 +1,209 @@
+"""
+packedfont.py - draw packed bitmap fonts, decoding glyphs as they are used
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Packed font modules are written by `tools/fontsubset.py --pack`. Besides
+WIDTH, HEIGHT, FIRST, LAST and the optional MAP of a bitmap font module
+they have:
+
+    ROWS: the different glyph rows, (WIDTH + 7) // 8 bytes each
+    OFFSETS: little endian 16 bit offsets into GLYPHS of each glyph and
+        the end of the last one
+    GLYPHS: one byte for each glyph row, an index into ROWS or, from
+        REPEAT up, the previous row repeated byte - REPEAT + 1 more times
+
+A `PackedFont` keeps a few decoded glyphs in its FONT, `translate` decodes
+the characters of a string that are not already there and returns the
+string to draw. The st7789 driver only draws with a font module, so
+`module` points the WIDTH, HEIGHT, FIRST, LAST and FONT of this module at
+the decoded glyphs of a `PackedFont` and returns this module to pass to
+`st7789.ST7789.text`.
+"""
+
+import array
+import sys
+
+#pylint: disable-msg=invalid-name
+const = lambda x: x
+
+REPEAT = const(0xf0)            # glyph bytes from here repeat the last row
+_SLOTS = const(32)              # decoded glyphs kept, at most 127
+
+# the font drawn by st7789.ST7789.text, set by PackedFont.module
+WIDTH = 0
+HEIGHT = 0
+FIRST = 0
+LAST = 0
+FONT = None
+
+class PackedFont:  # pylint: disable=invalid-name, too-many-instance-attributes
+    """
+    Decoded glyph cache for a packed font module
+
+    Args:
+        font (module): packed font module
+        slots (int): number of decoded glyphs to keep, at most 127
+
+    Attributes:
+        hits (int): characters found already decoded
+        misses (int): characters decoded
+    """
+    def __init__(self, font, slots=_SLOTS):
+        self.WIDTH = font.WIDTH
+        self.HEIGHT = font.HEIGHT
+        self.FIRST = 1              # slot characters, never NUL
+        self.LAST = slots
+        self._row_bytes = (font.WIDTH + 7) // 8
+        self._glyph_bytes = self._row_bytes * font.HEIGHT
+        self.FONT = bytearray(slots * self._glyph_bytes)
+        self._font = font
+        self._map = getattr(font, 'MAP', None)
+        self._slots = {}                        # character: slot
+        self._chars = [None] * slots            # character in each slot
+        self._used = array.array('I', [0] * slots)
+        self._uses = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _index(self, char):
+        """
+        Returns:
+            int: glyph number of char, characters not in the font are
+            drawn as spaces
+        """
+        font = self._font
+        if self._map is not None:
+            index = self._map.find(char)
+            if index < 0:
+                index = max(self._map.find(' '), 0)
+            return index
+
+        code = ord(char)
+        if font.FIRST <= code <= font.LAST:
+            return code - font.FIRST
+
+        code = ord(' ')
+        return code - font.FIRST if font.FIRST <= code <= font.LAST else 0
+
+    def _decode(self, index, slot):
+        """
+        Decode glyph number index into slot
+        """
+        font = self._font
+        offsets = font.OFFSETS
+        glyphs = font.GLYPHS
+        rows = font.ROWS
+        row_bytes = self._row_bytes
+        out = self.FONT
+        pos = slot * self._glyph_bytes
+        row = 0
+        for offset in range(
+                offsets[index * 2] | offsets[index * 2 + 1] << 8,
+                offsets[index * 2 + 2] | offsets[index * 2 + 3] << 8):
+            byte = glyphs[offset]
+            count = 1
+            if byte >= REPEAT:
+                count = byte - REPEAT + 1
+            else:
+                row = byte * row_bytes
+
+            for _ in range(count):
+                out[pos:pos + row_bytes] = rows[row:row + row_bytes]
+                pos += row_bytes
+
+    def _load(self, char, stamp):
+        """
+        Decode char into the least recently used slot not used since stamp
+
+        Returns:
+            int: slot or None if every slot was used since stamp
+        """
+        used = self._used
+        oldest = None
+        for slot in range(len(used)):
+            if used[slot] < stamp and (oldest is None or used[slot] < used[oldest]):
+                oldest = slot
+
+        if oldest is None:
+            return None
+
+        if self._chars[oldest] is not None:
+            del self._slots[self._chars[oldest]]
+
+        self._decode(self._index(char), oldest)
+        self._chars[oldest] = char
+        self._slots[char] = oldest
+        self.misses += 1
+        return oldest
+
+    def translate(self, txt, start=0):
+        """
+        Decode the characters of txt from start that are not already
+        decoded.
+
+        Args:
+            txt (str): text to draw
+            start (int): index of the first character to draw
+
+        Returns:
+            tuple: (str to draw with this font, index in txt after the
+            last character translated). When txt has more different
+            characters than there are slots, draw the string returned and
+            translate the rest starting from the index.
+        """
+        self._uses += 1
+        stamp = self._uses
+        out = []
+        end = start
+        while end < len(txt):
+            char = txt[end]
+            slot = self._slots.get(char)
+            if slot is None:
+                slot = self._load(char, stamp)
+                if slot is None:
+                    break
+            else:
+                self.hits += 1
+
+            self._used[slot] = stamp
+            out.append(chr(self.FIRST + slot))
+            end += 1
+
+        return ''.join(out), end
+
+    def module(self):
+        """
+        Point this module's font attributes at the decoded glyphs, call
+        before each draw as every PackedFont shares them.
+
+        Returns:
+            module: this module, a bitmap font module for
+            `st7789.ST7789.text` drawing the strings `translate` returns
+        """
+        global WIDTH, HEIGHT, FIRST, LAST, FONT # pylint: disable-msg=global-statement
+        WIDTH = self.WIDTH
+        HEIGHT = self.HEIGHT
+        FIRST = self.FIRST
+        LAST = self.LAST
+        FONT = self.FONT
+        return sys.modules[__name__]
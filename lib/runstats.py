@@ -0,0 +1,214 @@
+"""
+runstats.py - memory and time used by each program run from the menu
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+
+While a program runs a timer samples the free heap to find its lowest and
+highest values, counts the collections it sees and adds up the growth of
+the heap between samples. Allocations that are collected before the next
+sample are missed so `allocated` is a lower bound. The wall time and the
+time the shared TurtlePlotBot spent in stepper moves are recorded as well.
+
+The last run of each program is kept in a small text log, one line per
+program::
+
+    name status runs ms move_ms free_before free_low free_high free_after gc_runs allocated
+
+status is ok or the name of the exception that ended the program.
+
+Example::
+
+    import runstats
+
+    for name, results in runstats.load().items():
+        print(name, results['free_low'])
+"""
+
+#pylint: disable-msg=import-error
+import time
+import gc
+import machine
+
+import session
+
+#pylint: disable-msg=invalid-name
+const = lambda x: x
+
+STATS_LOG = "/stats.log"        # last run of each program
+_SAMPLE_TIMER = const(1)        # timer used to sample the heap
+_SAMPLE_MS = const(20)          # ms between heap samples
+
+# values in each log line after the name and status
+_FIELDS = (
+    'runs', 'ms', 'move_ms', 'free_before', 'free_low', 'free_high',
+    'free_after', 'gc_runs', 'allocated')
+
+def _move_ms():
+    """
+    Returns:
+        int: ticks_ms the shared TurtlePlotBot has spent in stepper moves,
+        0 if there is no bot. Use time.ticks_diff to take differences.
+    """
+    bot = session.active()
+    return bot.move_ms if bot is not None else 0
+
+# pylint: disable-msg=too-many-instance-attributes
+class RunStats():
+    """
+    Memory and time used by one run of a program
+
+    Args:
+        name (str): program module name
+    """
+    def __init__(self, name):
+        self.name = name
+        self.status = "ok"
+        self.free_before = 0        # bytes free when the program started
+        self.free_low = 0           # fewest bytes free seen
+        self.free_high = 0          # most bytes free seen
+        self.free_after = 0         # bytes free after the program was unloaded
+        self.gc_runs = 0            # collections seen while running
+        self.allocated = 0          # heap growth seen between samples
+        self.ms = 0                 # wall time in ms
+        self.move_ms = 0            # ms spent in stepper moves
+        self._last_alloc = 0
+        self._start_ms = 0
+        self._move_ms = 0
+        self._timer = machine.Timer(_SAMPLE_TIMER)
+        self._sample_cb = self._sample
+
+    def _sample(self, timer): # pylint: disable=unused-argument
+        """
+        Sample timer callback, record the free heap
+        """
+        free = gc.mem_free()
+        if free < self.free_low:
+            self.free_low = free
+
+        if free > self.free_high:
+            self.free_high = free
+
+        # memory in use only goes down when the heap has been collected
+        alloc = gc.mem_alloc()
+        if alloc < self._last_alloc:
+            self.gc_runs += 1
+        else:
+            self.allocated += alloc - self._last_alloc
+
+        self._last_alloc = alloc
+
+    def start(self):
+        """
+        Start sampling, call just before the program is imported
+        """
+        self.free_before = self.free_low = self.free_high = gc.mem_free()
+        self._last_alloc = gc.mem_alloc()
+        self._move_ms = _move_ms()
+        self._start_ms = time.ticks_ms()
+        self._timer.init(
+            mode=machine.Timer.PERIODIC,
+            period=_SAMPLE_MS,
+            callback=self._sample_cb)
+
+    def stop(self, status="ok"):
+        """
+        Stop sampling, call as soon as the program returns
+
+        Args:
+            status (optional str): ok or the name of the exception that
+                ended the program
+        """
+        self._timer.deinit()
+        self._sample(None)
+        self.ms = time.ticks_diff(time.ticks_ms(), self._start_ms)
+        self.move_ms = max(time.ticks_diff(_move_ms(), self._move_ms), 0)
+        self.status = status
+
+    def save(self, file_name=STATS_LOG):
+        """
+        Replace the program's line in the log with this run
+
+        Args:
+            file_name (optional str): log file name
+        """
+        log = load(file_name)
+        runs = log[self.name]['runs'] if self.name in log else 0
+        results = self.results()
+        results['runs'] = runs + 1
+        log[self.name] = results
+        with open(file_name, "w") as file:
+            for name, values in log.items():
+                file.write("{} {} {}\n".format(
+                    name,
+                    values['status'],
+                    " ".join(str(values[field]) for field in _FIELDS)))
+
+    def results(self):
+        """
+        Returns:
+            dict: the values of a log line, runs is 1
+        """
+        results = {'status': self.status, 'runs': 1}
+        for field in _FIELDS[1:]:
+            results[field] = getattr(self, field)
+
+        return results
+
+def load(file_name=STATS_LOG):
+    """
+    Read the log
+
+    Args:
+        file_name (optional str): log file name
+
+    Returns:
+        dict: program name: dict of status and the values of `RunStats`
+    """
+    log = {}
+    try:
+        with open(file_name) as file:
+            for line in file:
+                fields = line.split()
+                if len(fields) == len(_FIELDS) + 2:
+                    values = {'status': fields[1]}
+                    for field, value in zip(_FIELDS, fields[2:]):
+                        values[field] = int(value)
+                    log[fields[0]] = values
+    except OSError:
+        pass
+
+    return log
+
+def clear(file_name=STATS_LOG):
+    """
+    Remove the log
+
+    Args:
+        file_name (optional str): log file name
+    """
+    import uos
+
+    try:
+        uos.remove(file_name)
+    except OSError:
+        pass
@@ -35,33 +35,55 @@ class Servo:
         min_us (int): The minimum signal length supported by the servo.
         max_us (int): The maximum signal length supported by the servo.
         angle (int): The angle between the minimum and maximum positions.
+        rate (int): The speed of the servo in degrees per second, used to
+            work out how long a move takes.
 
     """
-    def __init__(self, pin, freq=50, min_us=1000, max_us=2000, angle=180):
+    def __init__(self, pin, freq=50, min_us=1000, max_us=2000, angle=180, rate=360):
         self.min_us = min_us
         self.max_us = max_us
         self.us = 0
         self.freq = freq
         self.angle = angle
+        self.rate = rate
+        self.position = None
         self.pwm = PWM(pin, freq=freq, duty=0)
 
+    def travel_ms(self, degrees):
+        """Return the ms needed to move from the last commanded angle to
+        ``degrees``, the full range if the position is not known."""
+        if self.position is None:
+            distance = self.angle
+        else:
+            distance = abs(degrees - self.position)
+        return distance * 1000 // self.rate
+
     def write_us(self, us):
         """Set the signal to be ``us`` microseconds long. Zero disables it."""
         if us == 0:
             self.pwm.duty(0)
+            # the servo is no longer held, its position is unknown
+            self.position = None
             return
         us = min(self.max_us, max(self.min_us, us))
         duty = us * 1024 * self.freq // 1000000
         self.pwm.duty(duty)
 
     def write_angle(self, degrees=None, radians=None):
-        """Move to the specified angle in ``degrees`` or ``radians``."""
+        """Move to the specified angle in ``degrees`` or ``radians``.
+        Returns the ms the servo needs to reach the angle, 0 if it is
+        already there."""
         if degrees is None:
             degrees = math.degrees(radians)
         degrees = degrees % 360
+        if degrees == self.position:
+            return 0
+        travel = self.travel_ms(degrees)
         total_range = self.max_us - self.min_us
         us = self.min_us + total_range * degrees // self.angle
         self.write_us(us)
+        self.position = degrees
+        return travel
 
     def deinit(self):
         self.pwm.deinit()
@@ -0,0 +1,107 @@
+"""
+session.py - hardware shared by the programs run from the menu
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+The hardware is created the first time it is asked for and kept until
+`close` is called, so programs do not re-initialize the I2C bus, the
+MCP23017 and the pen servo each time they run.
+
+Example::
+
+    import session
+
+    bot = session.bot()
+    bot.forward(20)
+    bot.done()
+"""
+
+#pylint: disable-msg=import-error
+import machine
+
+#pylint: disable-msg=invalid-name
+const = lambda x: x
+
+_SCL_PIN = const(22)        # i2c SCL Pin
+_SDA_PIN = const(21)        # i2c SDA Pin
+
+_I2C = None
+_BOT = None
+
+def i2c():
+    """
+    i2c: return the shared I2C bus, creating it on first use
+
+    Returns:
+        machine.I2C: the shared I2C bus
+    """
+    global _I2C # pylint: disable-msg=global-statement
+    if _I2C is None:
+        _I2C = machine.I2C(
+            scl=machine.Pin(_SCL_PIN),
+            sda=machine.Pin(_SDA_PIN),
+            freq=100000)
+
+    return _I2C
+
+def bot():
+    """
+    bot: return the shared TurtlePlotBot, creating it on first use. An
+    existing bot has its turtle state reset so each program starts at the
+    origin with the pen up.
+
+    Returns:
+        TurtlePlotBot: the shared TurtlePlotBot
+    """
+    global _BOT # pylint: disable-msg=global-statement
+    if _BOT is None:
+        from turtleplotbot import TurtlePlotBot
+        _BOT = TurtlePlotBot(i2c=i2c())
+    else:
+        _BOT.reset_state()
+
+    return _BOT
+
+def active():
+    """
+    active: return the shared TurtlePlotBot without creating it
+
+    Returns:
+        TurtlePlotBot: the shared TurtlePlotBot or None if there is none
+    """
+    return _BOT
+
+def close():
+    """
+    close: de-initialize the shared hardware, it will be created again if
+    it is asked for.
+    """
+    global _BOT, _I2C # pylint: disable-msg=global-statement
+    if _BOT is not None:
+        _BOT.close()
+        _BOT = None
+
+    if _I2C is not None:
+        # not every port's machine.I2C has deinit
+        if hasattr(_I2C, 'deinit'):
+            _I2C.deinit()
+        _I2C = None
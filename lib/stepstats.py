@@ -0,0 +1,167 @@
+"""
+stepstats.py - step timing statistics for the TurtlePlotBot
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+The interval between the starts of consecutive steps in a move is counted
+in a fixed size histogram, the time spent writing to the MCP23017 and
+waiting for the step delay is totalled and whatever is left of each
+interval is Python overhead. All storage is allocated when the StepStats
+is created so recording a step does not allocate memory.
+
+Example::
+
+    import session
+
+    bot = session.bot()
+    bot.profile(True)
+    bot.forward(20)
+    print(bot.stats())
+"""
+
+#pylint: disable-msg=import-error
+import time
+import array
+import gc
+
+#pylint: disable-msg=invalid-name
+const = lambda x: x
+
+_BINS = const(16)           # number of histogram bins, the last one is overflow
+_BIN_US = const(250)        # width of each histogram bin in us
+
+# pylint: disable-msg=too-many-instance-attributes
+class StepStats():
+    """
+    Step timing statistics recorded by `TurtlePlotBot` while profiling
+
+    Args:
+        bins (optional int): number of histogram bins, defaults to 16
+        bin_us (optional int): width of each bin in us, defaults to 250
+    """
+    def __init__(self, bins=_BINS, bin_us=_BIN_US):
+        self.bins = bins
+        self.bin_us = bin_us
+        self.histogram = array.array('I', [0] * bins)
+        self.reset()
+
+    def reset(self):
+        """
+        Clear all counts and totals to start a new job
+        """
+        for index in range(self.bins):
+            self.histogram[index] = 0
+
+        self.steps = 0              # step intervals recorded
+        self.moves = 0              # stepper moves
+        self.min_us = 0             # shortest step interval
+        self.max_us = 0             # longest step interval
+        self.total_us = 0           # sum of step intervals
+        self.i2c_writes = 0         # I2C transactions made by the bot
+        self.i2c_us = 0             # us spent in I2C writes
+        self.wait_us = 0            # us spent waiting for the step delay
+        self.pen_moves = 0          # pen servo actuations
+        self.gc_runs = 0            # garbage collections seen during moves
+        self.last_us = None         # ticks_us the last step started
+        self.last_alloc = gc.mem_alloc()
+
+    def step(self, start_us, end_us):
+        """
+        Record a step written to the steppers
+
+        Args:
+            start_us (int): ticks_us before the I2C write
+            end_us (int): ticks_us after the I2C write
+        """
+        # pylint: disable=no-member
+        self.i2c_writes += 1
+        self.i2c_us += time.ticks_diff(end_us, start_us)
+
+        if self.last_us is not None:
+            interval = time.ticks_diff(start_us, self.last_us)
+            if not self.steps or interval < self.min_us:
+                self.min_us = interval
+
+            if interval > self.max_us:
+                self.max_us = interval
+
+            self.steps += 1
+            self.total_us += interval
+            self.histogram[min(interval // self.bin_us, self.bins - 1)] += 1
+
+        self.last_us = start_us
+
+        # memory in use only goes down when the heap has been collected
+        alloc = gc.mem_alloc()
+        if alloc < self.last_alloc:
+            self.gc_runs += 1
+
+        self.last_alloc = alloc
+
+    def waited(self, wait_us):
+        """
+        Record time spent waiting for the step delay
+
+        Args:
+            wait_us (int): us waited
+        """
+        self.wait_us += wait_us
+
+    def move_done(self, writes=0):
+        """
+        Record the end of a move, the time until the next move is not a
+        step interval.
+
+        Args:
+            writes (optional int): I2C writes made at the end of the move
+        """
+        self.moves += 1
+        self.i2c_writes += writes
+        self.last_us = None
+
+    def results(self):
+        """
+        Return the statistics recorded since the last reset
+
+        Returns:
+            dict: counts and times in us, `histogram` is a list of step
+            counts for each `bin_us` wide range of intervals starting at 0,
+            the last bin counts all longer intervals. `other_us` is the time
+            spent outside of I2C writes and step delay waits.
+        """
+        busy = self.i2c_us + self.wait_us
+        return {
+            'steps': self.steps,
+            'moves': self.moves,
+            'min_us': self.min_us,
+            'max_us': self.max_us,
+            'mean_us': self.total_us // self.steps if self.steps else 0,
+            'total_us': self.total_us,
+            'i2c_writes': self.i2c_writes,
+            'i2c_us': self.i2c_us,
+            'wait_us': self.wait_us,
+            'other_us': max(self.total_us - busy, 0),
+            'pen_moves': self.pen_moves,
+            'gc_runs': self.gc_runs,
+            'bin_us': self.bin_us,
+            'histogram': list(self.histogram),
+        }
@@ -25,9 +25,10 @@ SOFTWARE.
 
 # pylint: disable-msg=import-error
 from machine import Pin, SPI
+import uos
 import st7789
 import button
-import btree
+import config
 
 # pylint: disable-msg=invalid-name
 const = lambda x: x
@@ -43,6 +44,157 @@ NUM = [
     ["123", "456", "789", ".\x1b\x7f"]
 ]
 
+def _charmap(font):
+    """
+    Returns:
+        dict: character to glyph character for a subset font with a MAP,
+        see tools/fontsubset.py, or None
+    """
+    chars = getattr(font, 'MAP', None)
+    if chars is None:
+        return None
+
+    return {char: chr(font.FIRST + index) for index, char in enumerate(chars)}
+
+class ListItems:
+    """
+    ListItems: menu item provider for a list or tuple already in memory
+
+    Args:
+        items (list): list of menu items
+    """
+    def __init__(self, items):
+        self.items = items
+
+    def count(self):
+        """
+        Returns:
+            int: number of items
+        """
+        return len(self.items)
+
+    def item(self, index):
+        """
+        Returns:
+            the menu item at index
+        """
+        return self.items[index]
+
+class DirItems:
+    """
+    DirItems: menu item provider for the files in a directory, sorted by
+    name. Only a window of file names around the visible menu rows is kept
+    in memory, the directory is rescanned for the names before or after the
+    window when the menu scrolls outside of it.
+
+    Args:
+        path (str): directory to list
+        suffix (optional str): only list files ending with suffix
+        window (optional int): number of names to keep in memory, should be
+            about twice the number of menu rows shown.
+    """
+    def __init__(self, path, suffix=None, window=16):
+        self.path = path
+        self.suffix = suffix
+        self.window = window
+        self.first = 0
+        self.names = []
+        self.total = None
+
+    def _names(self):
+        """
+        Generator returning the matching file names in directory order.
+        """
+        for entry in uos.ilistdir(self.path):
+            name = entry[0]
+            if entry[1] != 0x4000 and (
+                    self.suffix is None or name.endswith(self.suffix)):
+                yield name
+
+    def _scan(self, after=None, before=None, last=False):
+        """
+        Returns:
+            list: the window first, or last if last is True, names in sorted
+            order that come after `after` and before `before`. At most twice
+            the window of names are held while scanning.
+        """
+        names = []
+        for name in self._names():
+            if (after is None or name > after) and (before is None or name < before):
+                names.append(name)
+                if len(names) > self.window * 2:
+                    names.sort()
+                    names = names[-self.window:] if last else names[:self.window]
+
+        names.sort()
+        return names[-self.window:] if last else names[:self.window]
+
+    def count(self):
+        """
+        Returns:
+            int: number of matching files, counted once and remembered
+        """
+        if self.total is None:
+            self.total = 0
+            for _ in self._names():
+                self.total += 1
+        return self.total
+
+    def item(self, index):
+        """
+        Returns:
+            str: the file name at index in name order
+        """
+        if not self.first <= index < self.first + len(self.names):
+            # start again from the nearest end of the list if it is closer
+            # than the window
+            distance = abs(index - self.first)
+            if not self.names or index < distance:
+                self.first, self.names = 0, self._scan()
+            elif self.count() - 1 - index < distance:
+                self.names = self._scan(last=True)
+                self.first = self.count() - len(self.names)
+
+            # move the window half its size at a time so scrolling back and
+            # forth over its edge does not rescan each time
+            while index >= self.first + len(self.names):
+                half = max(len(self.names) // 2, 1)
+                self.names = self._scan(after=self.names[half - 1])
+                self.first += half
+
+            while index < self.first:
+                half = len(self.names) // 2
+                names = self._scan(before=self.names[half], last=True)
+                self.first += half - len(names)
+                self.names = names
+
+        return self.names[index - self.first]
+
+class Job:
+    """
+    Job: pause and cancel state shared between a uasyncio job and the
+    `UI.ajob` control screen.
+    """
+    def __init__(self):
+        self.paused = False
+        self.cancelled = False
+
+    async def checkpoint(self):
+        """
+        Let other tasks run and wait here while the job is paused. Jobs should
+        await this between moves.
+
+        Returns:
+            bool: False if the job has been cancelled
+        """
+        import uasyncio as asyncio
+
+        await asyncio.sleep_ms(0)
+        while self.paused and not self.cancelled:
+            await asyncio.sleep_ms(50)
+
+        return not self.cancelled
+
 # pylint: disable-msg=too-many-instance-attributes
 class UI:
     """
@@ -76,6 +228,12 @@ class UI:
 
         self.display.init()
         self.font = font
+        self._charmap = _charmap(font)
+        self._packed = None
+        if hasattr(font, 'GLYPHS'):
+            from packedfont import PackedFont
+            self._packed = PackedFont(font)
+            self._charmap = None
         self.width = self.display.width()
         self.height = self.display.height()
         self.max_chars = self.width // self.font.WIDTH
@@ -86,7 +244,101 @@ class UI:
         self.bg_act = st7789.WHITE
         self.fg_hdr = st7789.WHITE
         self.bg_hdr = st7789.RED
-        self.joystick = button.JoyStick()
+        self.joystick = button.JoyStick(irq=True)
+        self.cursor = None
+        self.blink = False
+        self.cursor_task = False
+        self.on_ready = None        # called once when the first widget is shown
+
+    def _run(self, widget):
+        """
+        Run a widget generator reading the joystick each time it yields. The
+        generator yields the maximum time in ms to wait for a button, 0 to
+        wait forever, and is sent the button read.
+
+        Returns:
+            The value returned by the widget generator
+        """
+        cursor = self.cursor
+        finished = False
+        try:
+            max_wait = next(widget)
+            if self.on_ready is not None:
+                on_ready, self.on_ready = self.on_ready, None
+                on_ready()
+
+            while True:
+                max_wait = widget.send(self.joystick.read(max_wait))
+        except StopIteration as result:
+            finished = True
+            return result.value
+        finally:
+            if not finished:
+                self._abandon(widget, cursor)
+
+    async def _arun(self, widget):
+        """
+        Run a widget generator like `_run` without blocking other uasyncio
+        tasks. The input field cursor is blinked by a separate task.
+
+        Returns:
+            The value returned by the widget generator
+        """
+        import uasyncio as asyncio
+
+        cursor = self.cursor
+        finished = False
+        cursor_task = self.cursor_task
+        self.cursor_task = True
+        blinker = None if cursor_task else asyncio.create_task(self._ablink())
+        try:
+            max_wait = next(widget)
+            while True:
+                max_wait = widget.send(await self.joystick.aread(max_wait))
+        except StopIteration as result:
+            finished = True
+            return result.value
+        finally:
+            self.cursor_task = cursor_task
+            if blinker is not None:
+                blinker.cancel()
+            if not finished:
+                self._abandon(widget, cursor)
+
+    def _abandon(self, widget, cursor):
+        """
+        Clean up after a widget that was cancelled or raised an exception
+        instead of returning, closing it and putting the input field cursor
+        back the way the widget found it like a widget that returns does.
+        """
+        widget.close()
+        self.cursor = cursor
+
+    def _blink_cursor(self):
+        """
+        Toggle the input field cursor if an input field is active.
+        """
+        if self.cursor is None:
+            return
+
+        self.display.fill_rect(
+            self.cursor*self.font.WIDTH,
+            2*self.font.HEIGHT,
+            self.font.WIDTH,
+            self.font.HEIGHT-1,
+            self.bg if self.blink else self.fg)
+
+        self.blink = not self.blink
+
+    async def _ablink(self, period=500):
+        """
+        Task to blink the input field cursor every period ms.
+        """
+        import uasyncio as asyncio
+
+        while True:
+            await asyncio.sleep_ms(period)
+            self._blink_cursor()
 
     @staticmethod
     def get(cfg_name):
@@ -99,51 +351,26 @@ class UI:
         Returns:
             (string): value of setting
         """
-        name = cfg_name.encode() if isinstance(cfg_name, str) else cfg_name
-        try:
-            cfg_file = open("ui.cfg", "r+b")
-        except OSError:
-            cfg_file = open("ui.cfg", "w+b")
-
-        cfg_db = btree.open(cfg_file)
-        try:
-            cfg_value = cfg_db[name]
-        except KeyError:
-            cfg_value = b''
-
-        cfg_db.close()
-        cfg_file.close()
-
-        return cfg_value.decode('ascii')
+        return config.shared().get(cfg_name).decode('ascii')
 
     @staticmethod
     def put(cfg_name, cfg_value):
         """
-        put: put config setting into btree ui.cfg file
+        put: put config setting into btree ui.cfg file. The setting is
+        written when `flush` is called.
 
         Args:
             cfg_name ([str, bytes, bytearray]): name of setting to store
             cfg_value ([str, bytes, bytearray]): value of setting to store
         """
-        if isinstance(cfg_name, str):
-            name = cfg_name.encode()
-        else:
-            name = cfg_name
-
-        if isinstance(cfg_value, str):
-            value = cfg_value.encode()
-        else:
-            value = cfg_value
+        config.shared().put(cfg_name, cfg_value)
 
-        try:
-            cfg_file = open("ui.cfg", "r+b")
-        except OSError:
-            cfg_file = open("ui.cfg", "w+b")
-
-        cfg_db = btree.open(cfg_file)
-        cfg_db[name] = value
-        cfg_db.close()
-        cfg_file.close()
+    @staticmethod
+    def flush():
+        """
+        flush: write settings saved with `put` to the btree ui.cfg file
+        """
+        config.shared().flush()
 
     def size(
             self,
@@ -163,10 +390,10 @@ class UI:
             characters = int.from_bytes(file.read(2), 'little')
             if characters > 96:
                 begins = 0x00
-                ends = characters
+                ends = characters - 1
             else:
                 begins = 0x20
-                ends = characters + 0x20
+                ends = characters + 0x1f
 
             for char in [ord(char) for char in message]:
                 if begins <= char <= ends:
@@ -207,10 +434,10 @@ class UI:
             characters = int.from_bytes(file.read(2), 'little')
             if characters > 96:
                 begins = 0x00
-                ends = characters
+                ends = characters - 1
             else:
                 begins = 0x20
-                ends = characters + 0x20
+                ends = characters + 0x1f
 
             for char in [ord(char) for char in message]:
                 if begins <= char <= ends:
@@ -257,6 +484,41 @@ class UI:
 
                     pos_x += width * scale
 
+    def text(self, txt, x_offset, y_offset, fg, bg):
+        """
+        Draw txt in the UI font at x_offset, y_offset, translating it first
+        if the font is a subset with a MAP or decoding its glyphs if the
+        font is packed.
+
+        Args:
+            txt (str or bytes): Text to draw
+            x_offset (int): column in pixels
+            y_offset (int): row in pixels
+            fg (int): 565 color for character forground
+            bg (int): 565 color for character background
+        """
+        packed = self._packed
+        charmap = self._charmap
+        if (packed is not None or charmap is not None) and not isinstance(txt, str):
+            txt = ''.join([chr(char) for char in txt])
+
+        if packed is not None:
+            start = 0
+            while start < len(txt):
+                glyphs, end = packed.translate(txt, start)
+                self.display.text(
+                    packed.module(), glyphs, x_offset, y_offset, fg, bg)
+                x_offset += (end - start) * self.font.WIDTH
+                start = end
+
+            return
+
+        if charmap is not None:
+            blank = charmap.get(' ', ' ')
+            txt = ''.join([charmap.get(char, blank) for char in txt])
+
+        self.display.text(self.font, txt, x_offset, y_offset, fg, bg)
+
     def character(self, char, col=0, line=0, fg=None, bg=None):
         """
         Write a character using the fg and bg colors.
@@ -283,7 +545,7 @@ class UI:
             self.font.HEIGHT,
             bg)
 
-        self.display.text(font, chr(char), x_offset, y_offset, fg, bg)
+        self.text(chr(char), x_offset, y_offset, fg, bg)
 
     def write(self, txt, col=0, line=0, fg=None, bg=None):
         """
@@ -310,13 +572,7 @@ class UI:
             self.font.HEIGHT,
             bg)
 
-        self.display.text(
-            self.font,
-            txt,
-            x_offset,
-            y_offset,
-            fg,
-            bg)
+        self.text(txt, x_offset, y_offset, fg, bg)
 
     def writeln(self, txt, col=0, line=0, fg=None, bg=None):
         """
@@ -344,7 +600,7 @@ class UI:
             self.font.HEIGHT,
             bg)
 
-        self.display.text(self.font, txt, x_offset, y_offset, fg, bg)
+        self.text(txt, x_offset, y_offset, fg, bg)
 
     def center(self, txt, line=0, fg=None, bg=None):
         """
@@ -406,6 +662,77 @@ class UI:
         self.center(text, line, fg, bg)
         return self.joystick.read()
 
+    async def await_(self, text, line=0, fg=None, bg=None):
+        """
+        Async version of `wait`, named await_ as await is a reserved word.
+
+        Returns:
+            int: button pressed
+        """
+        if fg is None:
+            fg = self.fg
+        if bg is None:
+            bg = self.bg
+
+        self.center(text, line, fg, bg)
+        return await self.joystick.aread()
+
+    async def ajob(self, title, job):
+        """
+        Run a job while showing a screen that lets the user pause, resume or
+        cancel it. The screen is removed when the job finishes.
+
+        Args:
+            title (str): title to show while the job runs
+            job (function): async function taking a `Job` argument, it should
+                stop when `await job.checkpoint()` returns False
+
+        Returns:
+            bool: True if the job ran to completion, False if it was cancelled
+
+        Example::
+
+            async def square(job):
+                for _ in range(4):
+                    if not await job.checkpoint():
+                        break
+                    bot.forward(20)
+                    bot.left(90)
+
+            uasyncio.run(ui.ajob("Square", square))
+        """
+        import uasyncio as asyncio
+
+        state = Job()
+        control = asyncio.create_task(self._ajob_control(title, state))
+        try:
+            await job(state)
+        finally:
+            control.cancel()
+
+        return not state.cancelled
+
+    async def _ajob_control(self, title, state):
+        """
+        Pause, resume and cancel screen used by `ajob`
+        """
+        option = 0
+        while not state.cancelled:
+            self.cls()
+            self.center(title, 0, self.fg_hdr, self.bg_hdr)
+            self.center("Paused" if state.paused else "Running", 3)
+            btn, option = await self.aselect(
+                0,
+                7,
+                ("Resume" if state.paused else "Pause", "Cancel"),
+                option)
+
+            if btn == button.CENTER:
+                if option == 0:
+                    state.paused = not state.paused
+                else:
+                    state.cancelled = True
+
     def underline(self, col, line, width, fg=None, bg=None):
         """
         underline - draw underline on line starting at col for width characters
@@ -431,6 +758,40 @@ class UI:
             w,
             self.fg)
 
+    @staticmethod
+    def _menu_text(menu, index, menu_text):
+        """
+        Return the text to show for the menu item at index
+        """
+        item = menu.item(index)
+        return item if menu_text is None else item[menu_text]
+
+    def _menu_letter(self, menu, current, menu_text, direction):
+        """
+        Find the first menu item starting with the next (direction 1) or
+        previous (direction -1) first letter, searching from current.
+
+        Returns:
+            int: index of the item found or current if none was found
+        """
+        menu_count = menu.count()
+        letter = self._menu_text(menu, current, menu_text)[:1]
+        index = current + direction
+        while 0 <= index < menu_count:
+            if self._menu_text(menu, index, menu_text)[:1] != letter:
+                break
+            index += direction
+        else:
+            return current
+
+        if direction < 0:
+            # back up to the first item of the letter group found
+            letter = self._menu_text(menu, index, menu_text)[:1]
+            while index and self._menu_text(menu, index-1, menu_text)[:1] == letter:
+                index -= 1
+
+        return index
+
     def menu(self, title, menu, active=None, menu_text=None):
         """
         show menu and return user selection
@@ -443,6 +804,8 @@ class UI:
         CENTER selects the current menu item
         RIGHT  selects the current menu item
         LEFT   Cancels and exits menu
+        CHANGE moves to the next first letter
+        ENTER  moves to the previous first letter
         ====== ===============================
 
         ====== ===============================
@@ -453,9 +816,13 @@ class UI:
         ====== ===============================
 
         Args:
-            menu (list): list of menu items active (int): currently active
-            menu option menu_text (optional int): item to use as menu text if
-            the menu list contains a list or tuple
+            menu (list or provider): list of menu items or a provider object
+            with a `count()` method returning the number of items and an
+            `item(index)` method returning the item at index. Only the
+            visible rows are fetched from a provider.
+            active (int): currently active menu option
+            menu_text (optional int): item to use as menu text if the menu
+            list contains a list or tuple
 
         Returns:
             The index number of the option that was selected or None if
@@ -482,54 +849,83 @@ class UI:
             #
             scan = sta_if.scan()
             connect = ui.menu("Select AP", scan, connect, 0)
+
+        Example using a provider::
+
+            programs = tftui.DirItems("/programs", ".py")
+            program = ui.menu("Run Program", programs)
+            if program is not None:
+                print(programs.item(program))
+        """
+        return self._run(self._menu(title, menu, active, menu_text))
+
+    async def amenu(self, title, menu, active=None, menu_text=None):
+        """
+        Async version of `menu`, other uasyncio tasks keep running while
+        waiting for the user.
+
+        Returns:
+            The index number of the option that was selected or None
+        """
+        return await self._arun(self._menu(title, menu, active, menu_text))
+
+    def _menu(self, title, menu, active, menu_text):
+        """
+        menu widget generator used by `menu` and `amenu`
         """
-        menu_count = len(menu)
+        if not hasattr(menu, "item"):
+            menu = ListItems(menu)
+
+        menu_count = menu.count()
+        rows = self.max_lines-1
 
         # adjust first if the current option would be off the screen
         current = 0 if active is None else active
-        first_shown = current-self.max_lines+2 if current > self.max_lines-2 else 0
+        first_shown = current-rows+1 if current > rows-1 else 0
 
         self.cls()
         self.center(title, 0, self.fg_hdr, self.bg_hdr)
 
         # display the menu on line 2 thru max_lines-1
         while True:
-            for line in range(self.max_lines-1):
+            for line in range(rows):
                 menu_item = first_shown + line
                 if menu_item < menu_count:
                     self.writeln(
-                        menu[menu_item] if menu_text is None
-                        else menu[menu_item][menu_text],
+                        self._menu_text(menu, menu_item, menu_text),
                         0,
                         line+1,
                         self.fg_act if menu_item == current else self.fg,
                         self.bg_act if menu_item == current else self.bg)
 
             # wait for button to be pressed and released
-            btn = self.joystick.read()
+            btn = yield 0
             # move up one menu item if possible
             if btn == button.UP:
                 if current > 0:
                     current -= 1
-                    if current < first_shown:
-                        first_shown -= 1
 
             # move down one menu item if possible
             elif btn == button.DOWN:
                 if current < menu_count-1:
                     current += 1
-                    if current >= self.max_lines -1:
-                        first_shown = current - self.max_lines+2
 
             # move to first menu item
-            if btn == -button.UP:
+            elif btn == -button.UP:
                 current = 0
-                first_shown = 0
 
             # move to last menu item
             elif btn == -button.DOWN:
-                current = menu_count
-                first_shown = current - self.max_lines+1
+                current = max(menu_count-1, 0)
+
+            # move to the next or previous first letter
+            elif btn in (button.CHANGE, button.ENTER, -button.ENTER):
+                if menu_count:
+                    current = self._menu_letter(
+                        menu,
+                        current,
+                        menu_text,
+                        1 if btn == button.CHANGE else -1)
 
             # return menu item value one was selected
             elif btn in (button.CENTER, button.RIGHT):
@@ -539,6 +935,12 @@ class UI:
             elif btn in (button.LEFT, -button.LEFT):
                 return None
 
+            # scroll to keep the current item on the screen
+            if current < first_shown:
+                first_shown = current
+            elif current >= first_shown + rows:
+                first_shown = current - rows + 1
+
     def input(self, label, max_len, value, kbd=None, header=None):
         """
         Single field input using onscreen keyboard
@@ -569,6 +971,21 @@ class UI:
         The hollow triangle is the enter key that exits the field.
         The space between these two keys is used as the spacebar.
 
+        """
+        return self._run(self._input(label, max_len, value, kbd, header))
+
+    async def ainput(self, label, max_len, value, kbd=None, header=None):
+        """
+        Async version of `input`, the cursor is blinked by a uasyncio task.
+
+        Returns:
+            The the button used to exit and the string value
+        """
+        return await self._arun(self._input(label, max_len, value, kbd, header))
+
+    def _input(self, label, max_len, value, kbd, header):
+        """
+        input widget generator used by `input` and `ainput`
         """
         if kbd is None:
             kbd = ALNUM
@@ -581,7 +998,7 @@ class UI:
         rows = [64+line*self.font.HEIGHT for line in range(lines_count)]
         active_row = 0
         active_col = 0
-        blink = False
+        self.blink = False
 
         if isinstance(value, (int, float)):
             value = str(value)
@@ -609,8 +1026,7 @@ class UI:
                 columns[line_idx] = self.width//2-lengths[line_idx]*(self.font.WIDTH)//2
 
                 for chr_idx, char in enumerate(kb_line):
-                    self.display.text(
-                        self.font,
+                    self.text(
                         char,
                         columns[line_idx]+chr_idx*self.font.WIDTH,
                         rows[line_idx],
@@ -623,8 +1039,7 @@ class UI:
             Show the active_row and active_col key for the active_kdb in
             the specified fg and bg colors.
             """
-            self.display.text(
-                self.font,
+            self.text(
                 kbd[active_kbd][active_row][active_col],
                 columns[active_row]+active_col*self.font.WIDTH,
                 rows[active_row],
@@ -659,8 +1074,7 @@ class UI:
         def show_char(char):
             """
             """
-            self.display.text(
-                self.font,
+            self.text(
                 char,
                 current*self.font.WIDTH,
                 2*self.font.HEIGHT,
@@ -675,6 +1089,7 @@ class UI:
                 show_char(" ")
                 value = value[:-1]
                 current -= 1
+                self.cursor = current
 
         def append_char(char):
             nonlocal current, value
@@ -682,18 +1097,21 @@ class UI:
                 show_char(char)
                 value += char
                 current += 1
+                self.cursor = current
 
         show_kbd()
+        self.cursor = current
 
         while True:
             show_key(self.fg_act, self.bg_act)
-            btn = self.joystick.read(500)
+            btn = yield 0 if self.cursor_task else 500
             if btn != 0:
                 show_key(self.fg, self.bg)
 
                 if btn == button.CENTER:
                     char = ord(kbd[active_kbd][active_row][active_col])
                     if char == 0x7f:
+                        self.cursor = None
                         return (btn, value)
                     elif char == 0x001b:
                         backspace_char()
@@ -713,16 +1131,11 @@ class UI:
                 elif btn == button.RIGHT:
                     move_key(active_row, active_col+1)
                 elif btn in [button.ENTER, -button.ENTER]:
+                    self.cursor = None
                     return (btn, value)
 
-            self.display.fill_rect(
-                current*self.font.WIDTH,
-                2*self.font.HEIGHT,
-                self.font.WIDTH,
-                self.font.HEIGHT-1,
-                self.bg if blink else self.fg)
-
-            blink = not blink
+            if not self.cursor_task:
+                self._blink_cursor()
 
     def select(self, column, line, options, value):
         """
@@ -749,6 +1162,21 @@ class UI:
         CENTER exits and returns current selection
         ====== ==========================================
 
+        """
+        return self._run(self._select_option(column, line, options, value))
+
+    async def aselect(self, column, line, options, value):
+        """
+        Async version of `select`
+
+        Returns:
+            tuple (exit, value)
+        """
+        return await self._arun(self._select_option(column, line, options, value))
+
+    def _select_option(self, column, line, options, value):
+        """
+        select widget generator used by `select`, `aselect` and forms
         """
         btn = 0
         option_count = len(options)
@@ -764,7 +1192,7 @@ class UI:
 
                 location += len(option)+1
 
-            btn = self.joystick.read()
+            btn = yield 0
 
             if btn == button.LEFT:
                 value -= 1
@@ -821,8 +1249,7 @@ class UI:
             self.underline(column, line, max_length)
             return True
 
-        btn, value =  self.input(label, max_length, value, header=header)
-        return (btn, value)
+        return self._input(label, max_length, value, None, header)
 
     def _integer(self, active, init, params, header=None):
         """
@@ -847,10 +1274,11 @@ class UI:
             self.underline(column, line, max_length)
             return True
 
-        btn, s_value = self.input(label, max_length, s_value, NUM, header=header)
-        value = int(s_value)
+        def integer_input():
+            btn, i_value = yield from self._input(label, max_length, s_value, NUM, header)
+            return (btn, int(i_value))
 
-        return (btn, int(value))
+        return integer_input()
 
     def _text(self, active, init, params): # pylint: disable-msg=unused-argument
         """
@@ -903,7 +1331,7 @@ class UI:
         if label is not None:
             self.write(label, l_col, l_line, self.fg, self.bg)
 
-        return self.select(col, line, options, value)
+        return self._select_option(col, line, options, value)
 
     def _ok(self, active, init, params, header=None):
         return self._select(active, init, params, header)
@@ -1077,6 +1505,21 @@ class UI:
 
         """
 
+        return self._run(self._form(items))
+
+    async def aform(self, items, line=7): # pylint: disable-msg=unused-argument
+        """
+        Async version of `form`
+
+        Returns:
+            tuple (exit, value)
+        """
+        return await self._arun(self._form(items))
+
+    def _form(self, items):
+        """
+        form widget generator used by `form` and `aform`
+        """
         self.cls()
         header = None
         fields = []
@@ -1102,7 +1545,8 @@ class UI:
                     if item[self.FUN].__name__ == "_ok":
                         if index == current:
                             was_ok = True
-                            btn, value = item[self.FUN](index == current, False, item[1:])
+                            btn, value = yield from item[self.FUN](
+                                index == current, False, item[1:])
                             if btn == button.CENTER:
                                 return (btn, value)
 
@@ -1110,11 +1554,12 @@ class UI:
                         index += 1
 
             if not was_ok:
-                btn = self.joystick.read()
+                btn = yield 0
 
             if btn == button.CENTER:
                 field = items[fields[current]][self.FLD]
-                btn, value = field(False, False, items[fields[current]][1:], header)
+                btn, value = yield from field(
+                    False, False, items[fields[current]][1:], header)
                 items[fields[current]][self.VAL] = value
 
             if btn == button.UP:
@@ -65,6 +65,13 @@
 """
 
 import math
+import array
+import collections
+
+_GLYPH_CACHE_BYTES = 8192           # bytes of parsed glyphs kept by write
+_GLYPH_OVERHEAD = 64                # bytes counted for each cached glyph
+_POINT_FIELDS = 3                   # x, y, draw
+_NO_GLYPH = (0, None)               # characters not in the font
 
 class Vec2D:
     """A 2 dimensional vector class, used as a helper class for implementing
@@ -126,6 +133,71 @@ class Vec2D:
         return "(%.2f,%.2f)" % (self.vector[0], self.vector[1])
 
 
+class GlyphCache:
+    """Least recently used cache of parsed glyphs used by `TurtlePlot.write`.
+
+    Only reading and parsing the font file is saved, each point of a cached
+    glyph still goes through `TurtlePlot._goto` and has its turn and
+    distance worked out again.
+
+    Args:
+        budget (int): bytes of parsed glyphs to keep, 0 turns the cache off
+
+    Attributes:
+        used (int): bytes of parsed glyphs kept
+        hits (int): number of glyphs found in the cache
+        misses (int): number of glyphs read from the font file
+    """
+    DEFAULT_BUDGET = _GLYPH_CACHE_BYTES
+
+    def __init__(self, budget=DEFAULT_BUDGET):
+        self.budget = budget
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()   # key: (bytes, glyph), oldest first
+
+    def get(self, key):
+        """
+        Returns:
+            tuple: the glyph cached for key or None
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        # put it back as the most recently used
+        self._entries[key] = entry
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, glyph, size):
+        """
+        Add a glyph of size bytes, removing the least recently used glyphs
+        to keep within the budget.
+        """
+        if size > self.budget:
+            return
+
+        while self._entries and self.used + size > self.budget:
+            oldest = next(iter(self._entries))
+            self.used -= self._entries.pop(oldest)[0]
+
+        self._entries[key] = (size, glyph)
+        self.used += size
+
+    def clear(self, budget=None):
+        """
+        Remove all glyphs, optionally changing the budget
+        """
+        if budget is not None:
+            self.budget = budget
+
+        self._entries = collections.OrderedDict()
+        self.used = 0
+
+
 class TurtlePlot: #pylint: disable=no-self-use,too-many-instance-attributes,too-many-locals,too-many-public-methods
     """TurtlePlot Class
     """
@@ -146,6 +218,7 @@ class TurtlePlot: #pylint: disable=no-self-use,too-many-instance-attributes,too-
         self._fullcircle = 360
         self._degrees_per_au = 1
         self._drawing = False
+        self._glyphs = GlyphCache()
 
 
     def mode(self, mode=None):
@@ -850,52 +923,139 @@ class TurtlePlot: #pylint: disable=no-self-use,too-many-instance-attributes,too-
             The default scale setting is is 1.0, a scale of '2' would double
             the size of the glyphs.
 
+            Glyph points are kept in font units in a cache shared by all
+            fonts and scales, see :func:`glyph_cache`. Every point is
+            still moved to with `_goto`.
+
         """
         was_down = self._drawing
         self.penup()
-        with open(font_file, "rb", buffering=0) as file:
-            characters = int.from_bytes(file.read(2), 'little')
-            if characters > 96:
-                begins = 0x00
-                ends = characters
-            else:
-                begins = 0x20
-                ends = characters + 0x20
-
-            for char in [ord(char) for char in message]:
-                if begins <= char <= ends:
-                    is_down = False
-                    (pos_x, pos_y) = self.position()
-                    file.seek((char-begins+1)*2)
-                    file.seek(int.from_bytes(file.read(2), 'little'))
-                    length = ord(file.read(1))
-                    left, right = file.read(2)
-
-                    left -= 0x52            # Position left side of the glyph
-                    right -= 0x52           # Position right side of the glyph
-                    width = right - left    # Calculate the character width
-
-                    for _ in range(length):
-                        vector_x, vector_y = file.read(2)
-                        vector_x -= 0x52
-                        vector_y -= 0x52
-
-                        if vector_x == -50:
-                            is_down = False
-                            continue
-
+        (pos_x, pos_y) = self.position()
+        file = None
+        try:
+            for char in message:
+                key = (font_file, char)
+                glyph = self._glyphs.get(key)
+                if glyph is None:
+                    if file is None:
+                        file = open(font_file, "rb", buffering=0)
+                        characters = int.from_bytes(file.read(2), 'little')
+                        if characters > 96:
+                            begins = 0x00
+                            ends = characters - 1
+                        else:
+                            begins = 0x20
+                            ends = characters + 0x1f
+
+                    glyph = self._read_glyph(file, ord(char), begins, ends)
+                    points = glyph[1]
+                    self._glyphs.put(
+                        key, glyph,
+                        _GLYPH_OVERHEAD + (len(points) * 2 if points else 0))
+
+                width, points = glyph
+                if points:
+                    # strokes that start where the last one ended, like
+                    # joined letters in script fonts, continue without
+                    # lifting the pen
+                    end = Vec2D(pos_x + points[0], pos_y + points[1])
+                    if abs(end - self._position):
+                        self._goto(end, False)
+
+                    for index in range(_POINT_FIELDS, len(points), _POINT_FIELDS):
                         self._goto(
-                            Vec2D(pos_x + vector_x - left, pos_y - vector_y),
-                            is_down)
+                            Vec2D(pos_x + points[index], pos_y + points[index+1]),
+                            bool(points[index+2]))
+
+                # the next glyph starts width units along the baseline,
+                # move straight to its first point
+                pos_x += width
 
-                        is_down = True
+            self._goto(Vec2D(pos_x, pos_y), False)
 
-                    self._goto(Vec2D(pos_x + width, pos_y), False)
+        finally:
+            if file is not None:
+                file.close()
 
         if was_down:
             self.pendown()
 
 
+    @staticmethod
+    def _read_glyph(file, char, begins, ends):
+        """
+        Read a glyph from a font file into the points `write` moves to.
+
+        Args:
+            file (file): open font file
+            char (int): character code
+            begins (int): first character in the font
+            ends (int): last character in the font
+
+        Returns:
+            tuple: (width, points) where points is an array of the font's
+            integer x, y relative to the glyph's origin and draw for each
+            point, None if the glyph has no points. Points that do not move
+            are left out and draw is 0 for the first point.
+        """
+        if not begins <= char <= ends:
+            return _NO_GLYPH
+
+        file.seek((char-begins+1)*2)
+        file.seek(int.from_bytes(file.read(2), 'little'))
+        length = ord(file.read(1))
+        left, right = file.read(2)
+
+        left -= 0x52            # Position left side of the glyph
+        right -= 0x52           # Position right side of the glyph
+        width = right - left    # Calculate the character width
+
+        points = array.array('h')
+        last_x = last_y = None
+        is_down = False
+        for _ in range(length):
+            vector_x, vector_y = file.read(2)
+            vector_x -= 0x52
+            vector_y -= 0x52
+
+            if vector_x == -50:
+                is_down = False
+                continue
+
+            point_x = vector_x - left
+            point_y = -vector_y
+            if last_x is None:
+                points.extend((point_x, point_y, 0))
+            elif point_x != last_x or point_y != last_y:
+                points.extend((point_x, point_y, is_down))
+
+            last_x, last_y = point_x, point_y
+            is_down = True
+
+        return (width, points if points else None)
+
+
+    def glyph_cache(self, budget=None):
+        """
+        Set how many bytes of parsed glyphs `write` keeps so characters
+        it has drawn before are drawn without reading and parsing the font
+        file again. The moves are still worked out point by point. A
+        TurtlePlotBot keeps its cache from one program to the next.
+
+        Args:
+            budget (optional int): cache size in bytes, 0 turns the cache
+                off. Changing the budget empties the cache.
+
+        Returns:
+            GlyphCache: the cache, with the budget, bytes used, hits and
+            misses
+        """
+        if budget is not None:
+            self._glyphs.clear(budget)
+
+        return self._glyphs
+
+
     def _turn(self, angle):
         """
         Turn turtle left by angle units
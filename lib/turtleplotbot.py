@@ -45,11 +45,11 @@ hardware interface needed by the `turtleplotbot` module to run a
 
 #pylint: disable-msg=import-error
 import time
-from math import pi
+from math import pi, atan2, degrees, radians, sin, cos
 import machine
 import mcp23017
 from servo import Servo
-from turtleplot import TurtlePlot
+from turtleplot import TurtlePlot, Vec2D, GlyphCache
 
 #pylint: disable-msg=invalid-name
 const = lambda x: x
@@ -62,43 +62,80 @@ _SERVO_PIN      = const(13)         # Servo control pin
 
 _PEN_UP_ANGLE   = const(90)         # servo angle for pen up
 _PEN_DOWN_ANGLE = const(180)        # servo angle for pen down
+_PEN_RATE       = const(360)        # servo speed in degrees per second
+_PEN_CLEARANCE  = const(40)         # percent of pen up travel before moving
 _STEPS_PER_REV  = const(4076)       # stepper steps per revolution
 _WHEEL_DIAMETER = 64.5    	        # in mm (increase = spiral out)
 _WHEELBASE      = 112.5             # in mm (increase = spiral in)
+_HOLD_MS        = const(500)        # ms to keep stepper coils on after a move
+_STEP_DELAY     = const(1000)       # us delay between steps
+_HOLD_TIMER     = const(0)          # timer used to turn stepper coils off
 _LEFT_MOTOR     = const(0)          # left motor index
 _RIGHT_MOTOR    = const(1)          # right motor index
 
 _WHEEL_BPI      = _WHEELBASE * pi
 _STEPS_PER_MM   = _STEPS_PER_REV / (_WHEEL_DIAMETER * pi)
+_STEPS_PER_DEG  = _WHEEL_BPI * _STEPS_PER_MM / 360
 _MOTORS         = (_LEFT_MOTOR, _RIGHT_MOTOR)
 
 _STEP_MASKS     = (
     0b1000, 0b1100, 0b0100, 0b0110, 0b0010, 0b0011, 0b0001, 0b1001
 )
 
+# stepper drive modes, steps are always counted in half steps
+HALF_STEP       = const(0)          # one or two coils, 8 phases per cycle
+FULL_STEP       = const(1)          # two coils, the odd half step phases
+WAVE_DRIVE      = const(2)          # one coil, the even half step phases
+
+# (half steps per step, phase parity) for each drive mode
+_DRIVE_MODES    = ((1, None), (2, 1), (2, 0))
+
 class TurtlePlotBot(TurtlePlot):  # pylint: disable=too-many-instance-attributes, too-many-public-methods
     """
     Initialize the TurtlePlotBot
 
     Args:
+        scl (int): SCL pin number, defaults to _SCL_PIN
+        sda (int): SDA pin number, defaults to _SDA_PIN
         i2c (machine.I2C): The I2C peripheral to use.
-        Defaults to creating a device using the pins
-        defined in _SCL_PIN and _SDA_PIN.
+        Defaults to creating a device using the scl and sda pins.
+
+    Note:
+        Programs should use `session.bot()` to share one TurtlePlotBot
+        instead of creating a new one each time they run.
     """
-    def __init__(self, scl=_SCL_PIN, sda=_SDA_PIN):
+    def __init__(self, scl=_SCL_PIN, sda=_SDA_PIN, i2c=None):
         """
         Initialize the turtleplotbot, optionally passing an i2c object to use.
         """
         self._current_step = [0, 0]         # current step indexes
-        self._step_delay = 1000             # us delay between steps
-        self._pen_delay = 250               # ms delay for pen raise or lower
-
-        self.mcp23017 = mcp23017.MCP23017(
-            machine.I2C(
+        self._wheel_steps = [0, 0]          # absolute wheel positions in steps
+        self._remainder = [0.0, 0.0]        # fractional steps carried to next move
+        self._turn_base = 0                 # turn steps at the last reset
+        self._odometer = Vec2D(0, 0)        # position from the steps taken
+        self._draw_mode = HALF_STEP         # drive mode while the pen is down
+        self._travel_mode = HALF_STEP       # drive mode while the pen is up
+        self._hold_ms = _HOLD_MS            # ms to hold stepper coils on after a move
+        self._hold_timer = machine.Timer(_HOLD_TIMER)
+        self._holding = False               # True while the release timer is running
+        self._release_cb = self._release
+        self._release_buf = bytearray(1)    # transfer buffer used by _release
+        self._profile = None                # StepStats while profiling
+        self.move_ms = 0                    # ticks_ms spent in stepper moves
+        self._move_frac = 0                 # us of move_ms not counted yet
+        self._step_delay = _STEP_DELAY      # us delay between steps
+        self._pen_delay = 0                 # extra ms delay for pen raise or lower
+        self._pen_clearance = _PEN_CLEARANCE # percent of pen up travel before moving
+        self._pen_clear = time.ticks_ms()   # ticks_ms when moves may start
+        self._pen_settled = self._pen_clear # ticks_ms when the pen stops moving
+
+        if i2c is None:
+            i2c = machine.I2C(
                 scl=machine.Pin(scl),
                 sda=machine.Pin(sda),
-                freq=100000),
-            0x20)
+                freq=100000)
+
+        self.mcp23017 = mcp23017.MCP23017(i2c, _I2C_ADDR)
 
         # pylint: disable=no-member
 
@@ -110,7 +147,8 @@ class TurtlePlotBot(TurtlePlot):  # pylint: disable=too-many-instance-attributes
             freq=50,
             min_us=600,
             max_us=2400,
-            angle=180)
+            angle=180,
+            rate=_PEN_RATE)
 
         time.sleep_ms(100)
         self._pen_servo.write_angle(degrees=_PEN_UP_ANGLE)
@@ -127,40 +165,293 @@ class TurtlePlotBot(TurtlePlot):  # pylint: disable=too-many-instance-attributes
 
         Note:
             Both steppers always move the same distance, but not
-            always in the same direction. De-energizes the stepper
-            coils after moving to save power.
+            always in the same direction. The fraction of a step that
+            can not be moved is carried over to the next move so rounding
+            errors do not build up. De-energizes the stepper coils after
+            moving to save power.
 
         Args:
             left (float or integer): millimeters to move left stepper
             right (float or integer): millimeters to move right stepper
 
         """
-        steppers = [int(left * _STEPS_PER_MM), int(right * _STEPS_PER_MM)]
-        steps = abs(steppers[_LEFT_MOTOR])
-
-        for _ in range(steps):
+        profile = self._profile
+        stride, parity = _DRIVE_MODES[
+            self._draw_mode if self._drawing else self._travel_mode]
+
+        steppers = [0, 0]
+        for motor, distance in ((_LEFT_MOTOR, left), (_RIGHT_MOTOR, right)):
+            target = distance * _STEPS_PER_MM + self._remainder[motor]
+            steppers[motor] = int(target)
+            self._remainder[motor] = target - steppers[motor]
+
+        # a move too short for a step leaves the coils and hold timer alone
+        if not steppers[_LEFT_MOTOR] and not steppers[_RIGHT_MOTOR]:
+            return
+
+        remaining = [abs(steppers[_LEFT_MOTOR]), abs(steppers[_RIGHT_MOTOR])]
+        directions = [
+            -1 if steppers[motor] > 0 else 1 for motor in _MOTORS]
+        masks = [0, 0]
+
+        # wait for a raising pen to clear the paper
+        self._wait_until(self._pen_clear)
+        move_start = time.ticks_us()
+
+        # keep the coils on, this move continues from the held position
+        if self._holding:
+            self._hold_timer.deinit()
+            self._holding = False
+
+        stepping = True
+        while stepping:
             # pylint: disable=no-member
             last = time.ticks_us()
-            out = 0
+            stepping = False
             for motor in _MOTORS:
-                if steppers[motor]:
-                    self._current_step[motor] &= 0x07
-                    mask = _STEP_MASKS[self._current_step[motor]]
-                    out |= mask <<4 if motor else mask
+                phase = self._current_step[motor]
+                step = stride
+                if parity is not None and phase & 1 != parity:
+                    # move to a phase used by the drive mode with a half step
+                    step = 1
+
+                if remaining[motor] >= step:
+                    stepping = True
+                    remaining[motor] -= step
+                    phase = (phase + directions[motor] * step) & 0x07
+                    self._current_step[motor] = phase
+                    masks[motor] = _STEP_MASKS[phase]
+
+            if not stepping:
+                break
+
+            if profile is None:
+                self.mcp23017.porta.gpio = masks[_LEFT_MOTOR] | masks[_RIGHT_MOTOR] << 4
+            else:
+                start = time.ticks_us()
+                self.mcp23017.porta.gpio = masks[_LEFT_MOTOR] | masks[_RIGHT_MOTOR] << 4
+                profile.step(start, time.ticks_us())
+                start = time.ticks_us()
 
-                    if steppers[motor] > 0:
-                        self._current_step[motor] -= 1
+            while time.ticks_diff(time.ticks_us(), last) < self._step_delay:
+                time.sleep_us(100)
 
-                    if steppers[motor] < 0:
-                        self._current_step[motor] += 1
+            if profile is not None:
+                profile.waited(time.ticks_diff(time.ticks_us(), start))
+
+        # half steps too short for a full step are carried to the next move
+        for motor in _MOTORS:
+            if remaining[motor]:
+                unmoved = -directions[motor] * remaining[motor]
+                steppers[motor] -= unmoved
+                self._remainder[motor] += unmoved
+
+        self._wheel_steps[_LEFT_MOTOR] += steppers[_LEFT_MOTOR]
+        self._wheel_steps[_RIGHT_MOTOR] += steppers[_RIGHT_MOTOR]
+
+        # de-energize stepper coils between moves to save power, after the
+        # hold time if there is one so closely spaced moves keep their position
+        if self._hold_ms:
+            self._holding = True
+            self._hold_timer.init(
+                mode=machine.Timer.ONE_SHOT,
+                period=self._hold_ms,
+                callback=self._release_cb)
+        else:
+            self.mcp23017.porta.gpio = 0x00 # all pins low
 
-            self.mcp23017.porta.gpio = out
+        if profile is not None:
+            profile.move_done(0 if self._hold_ms else 1)
 
-            while time.ticks_diff(time.ticks_us(), last) < self._step_delay:
-                time.sleep_us(100)
+        # count whole ms wrapping like ticks_ms so the total stays a small
+        # int, the bot is kept from one program to the next
+        moved = self._move_frac + time.ticks_diff(time.ticks_us(), move_start)
+        self.move_ms = time.ticks_add(self.move_ms, moved // 1000)
+        self._move_frac = moved % 1000
 
-        # de-energize stepper coils between moves to save power
-        self.mcp23017.porta.gpio = 0x00 # all pins low
+
+    def _release(self, timer): # pylint: disable=unused-argument
+        """
+        Hold timer callback, de-energize the stepper coils
+        """
+        if self._holding:
+            self._holding = False
+            # the callback can run while a port write is filling the shared
+            # transfer buffer, so it writes through its own
+            self.mcp23017.porta.write_gpio(0x00, self._release_buf) # all pins low
+            if self._profile is not None:
+                self._profile.i2c_writes += 1
+
+
+    def hold(self, hold_ms=None):
+        """
+        Set how long the stepper coils stay energized after a move. Moves
+        started within the hold time continue from the held position, after
+        it the coils are turned off to save power.
+
+        Args:
+            hold_ms (optional int): hold time in ms, 0 turns the coils off
+                as soon as each move ends
+
+        Returns:
+            int: the hold time in ms
+        """
+        if hold_ms is not None:
+            self._hold_ms = hold_ms
+
+        return self._hold_ms
+
+
+    def profile(self, enable=True):
+        """
+        Start or stop recording step timing statistics. Starting clears
+        any statistics already recorded so each job can be profiled on its
+        own. Profiling adds a little time to each step so it is off unless
+        asked for.
+
+        Args:
+            enable (optional bool): True to start, False to stop profiling
+
+        Returns:
+            StepStats: the statistics being recorded or None if stopped
+        """
+        if enable:
+            if self._profile is None:
+                from stepstats import StepStats
+                self._profile = StepStats()
+            else:
+                self._profile.reset()
+        else:
+            self._profile = None
+
+        return self._profile
+
+
+    def stats(self):
+        """
+        Return the step timing statistics recorded since profiling started.
+        See `StepStats.results` for the values returned.
+
+        Returns:
+            dict: the statistics or None if not profiling
+        """
+        if self._profile is None:
+            return None
+
+        results = self._profile.results()
+        results['step_delay'] = self._step_delay
+        return results
+
+
+    def drive_mode(self, draw=None, travel=None):
+        """
+        Set the stepper drive modes used while drawing and while the pen is
+        up. Distances are always counted in half steps so the modes can be
+        changed between moves without losing position.
+
+        ============ ==================================================
+        Mode         Description
+        ============ ==================================================
+        HALF_STEP    8 phases per cycle, most precise, the default
+        FULL_STEP    two coils on, half the I2C writes and twice as fast
+        WAVE_DRIVE   one coil on, like FULL_STEP with less power and torque
+        ============ ==================================================
+
+        Args:
+            draw (optional int): drive mode while the pen is down
+            travel (optional int): drive mode while the pen is up
+
+        Returns:
+            tuple: (draw, travel) drive modes
+        """
+        if draw is not None:
+            self._draw_mode = draw
+
+        if travel is not None:
+            self._travel_mode = travel
+
+        return (self._draw_mode, self._travel_mode)
+
+
+    def _turn_steps(self):
+        """
+        Returns:
+            int: net steps turned left since the last reset
+        """
+        return -(self._wheel_steps[_LEFT_MOTOR] + self._wheel_steps[_RIGHT_MOTOR]) // 2 - self._turn_base
+
+
+    def odometry(self):
+        """
+        Return the position and heading the bot has actually moved to,
+        worked out from the whole steps taken by the motors.
+
+        Returns:
+            tuple: (Vec2D position in turtle units, heading in degrees
+            counterclockwise from the start orientation)
+        """
+        return (self._odometer, (self._turn_steps() / _STEPS_PER_DEG) % 360)
+
+
+    def _actual_angle(self):
+        """
+        Returns:
+            float: direction the bot is actually facing in degrees
+            counterclockwise from the x axis
+        """
+        start = self.START_ORIENTATION[self._mode]
+        return degrees(atan2(start[1], start[0])) + self._turn_steps() / _STEPS_PER_DEG
+
+
+    def reset(self):
+        """
+        Reset turtle's scale, position and orientation to its initial values
+        and restart the odometry at the current position.
+        """
+        super().reset()
+        self._turn_base = -(self._wheel_steps[_LEFT_MOTOR] + self._wheel_steps[_RIGHT_MOTOR]) // 2
+        self._odometer = Vec2D(0, 0)
+
+
+    def _goto(self, end, draw=None):
+        """
+        Move turtle to position end, turning and moving from the position
+        and heading worked out from the steps taken so errors in earlier
+        moves are corrected.
+
+        This Method overrides the TurtlePlot method
+        """
+        was_down = self._drawing if draw is None else draw
+
+        # raise pen while turning to destination
+        self.penup()
+        offset = end - self._odometer
+        distance = abs(offset)
+        if distance:
+            angle = degrees(atan2(offset[1], offset[0]))
+            turn = (angle - self._actual_angle() + 180) % 360 - 180
+            self._turn(turn)
+            self._orient = Vec2D(cos(radians(angle)), sin(radians(angle)))
+
+        # set the pen down if drawing
+        if was_down:
+            self.pendown()
+
+        self._move(distance * self._scale)
+        self._position = end
+
+
+    def home(self):
+        """
+        Move turtle to the origin and turn back to the start orientation
+        using the odometry.
+
+        This Method overrides the TurtlePlot method
+        """
+        self.goto(0, 0)
+        turn = (-self._turn_steps() / _STEPS_PER_DEG + 180) % 360 - 180
+        self._turn(turn)
+        self._orient = self.START_ORIENTATION[self._mode]
 
 
     def _turn(self, angle):
@@ -185,30 +476,107 @@ class TurtlePlotBot(TurtlePlot):  # pylint: disable=too-many-instance-attributes
 
         This Method overrides the TurtlePlotBot method
         """
+        moved = self._wheel_steps[_RIGHT_MOTOR] - self._wheel_steps[_LEFT_MOTOR]
         self._movesteppers(-distance, distance)
+        moved = self._wheel_steps[_RIGHT_MOTOR] - self._wheel_steps[_LEFT_MOTOR] - moved
+        if moved:
+            angle = radians(self._actual_angle())
+            length = moved / 2 / _STEPS_PER_MM / self._scale
+            self._odometer = self._odometer + Vec2D(cos(angle) * length, sin(angle) * length)
+
+
+    @staticmethod
+    def _wait_until(deadline):
+        """
+        Sleep until time.ticks_ms() reaches deadline
+
+        Args:
+                deadline (int): ticks_ms value to wait for
+        """
+        # pylint: disable=no-member
+        delay = time.ticks_diff(deadline, time.ticks_ms())
+        if delay > 0:
+            time.sleep_ms(delay)
 
 
     def _pen(self, down):
         """
         lower or raise the pen
 
+        Note:
+            Lowering waits for the pen to reach the paper. Raising returns
+            once the move is started, the next stepper move begins when the
+            pen has traveled `_pen_clearance` percent of the way up and the
+            rest of the lift overlaps with the motion.
+
         Args:
                 down (boolean):
 
         This Method overrides the TurtlePlotBot method
         """
-        if down:
-            self._pen_servo.write_angle(degrees=_PEN_DOWN_ANGLE)
-        else:
-            self._pen_servo.write_angle(degrees=_PEN_UP_ANGLE)
         # pylint: disable=no-member
-        time.sleep_ms(self._pen_delay)
-
+        if down:
+            # finish any lift in progress, the steppers have already stopped
+            self._wait_until(self._pen_settled)
+
+        delay = self._pen_servo.write_angle(
+            degrees=_PEN_DOWN_ANGLE if down else _PEN_UP_ANGLE)
+
+        # no wait if the servo did not move
+        if delay:
+            if self._profile is not None:
+                self._profile.pen_moves += 1
+
+            delay += self._pen_delay
+            now = time.ticks_ms()
+            self._pen_settled = time.ticks_add(now, delay)
+            if down:
+                self._wait_until(self._pen_settled)
+                self._pen_clear = self._pen_settled
+            else:
+                self._pen_clear = time.ticks_add(
+                    now,
+                    delay * self._pen_clearance // 100)
+
+
+    def reset_state(self):
+        """
+        Raise the pen and reset everything a program can change to its
+        initial value: the turtle's angle units, mode, scale, position and
+        heading, the drive modes, hold time, step delay, pen delay and
+        clearance and the glyph cache budget. Profiling and the glyphs
+        already cached are kept so a program can be profiled after it is
+        started from the menu and text drawn by earlier programs is not
+        read from the font file again. The hardware is not re-initialized.
+        """
+        self.penup()
+        self.degrees()
+        self.mode(self.DEFAULT_MODE)
+        self.drive_mode(HALF_STEP, HALF_STEP)
+        self.hold(_HOLD_MS)
+        self._step_delay = _STEP_DELAY
+        self._pen_delay = 0
+        self._pen_clearance = _PEN_CLEARANCE
+        if self._glyphs.budget != GlyphCache.DEFAULT_BUDGET:
+            self.glyph_cache(GlyphCache.DEFAULT_BUDGET)
 
     def done(self):
         """
-        Raise pen and turn off the stepper motors.
+        Raise pen, stop driving the servo and turn off the stepper motors.
+        The bot can still be used after done, use `close` to release the
+        hardware.
         """
         self.penup()
-        self._pen_servo.deinit()
+        self._wait_until(self._pen_settled)
+        self._pen_servo.write_us(0)
+        self._hold_timer.deinit()
+        self._holding = False
         self.mcp23017.porta.gpio = 0x00 # all outputs to zero
+
+    def close(self):
+        """
+        Raise pen, turn off the stepper motors and release the servo PWM.
+        The bot can not be used after close.
+        """
+        self.done()
+        self._pen_servo.deinit()
@@ -2,7 +2,7 @@
 hello.py: Simple example using write
 """
 #pylint: disable-msg=import-error
-from turtleplotbot import TurtlePlotBot
+import session
 import vga2_bold_16x16 as font
 import tftui
 
@@ -17,7 +17,7 @@ def main(ui):
     line = ui.height//2 - 16
     ui.draw(message, column, line, scale=2, font="fonts/scripts.fnt")
 
-    bot = TurtlePlotBot()
+    bot = session.bot()
     bot.setscale(2)
     bot.write(message, "fonts/scripts.fnt")
     bot.done()
@@ -2,8 +2,7 @@
 Write text using user provided values
 '''
 #pylint: disable-msg=import-error
-import uos
-from turtleplotbot import TurtlePlotBot
+import session
 import vga2_bold_16x16 as font
 import tftui
 import button
@@ -12,8 +11,8 @@ def main(ui):
     """
     Write text using user provided values
     """
-    fonts = [f for f in uos.listdir("/fonts") if f.endswith(".fnt")]
-    fonts_len = len(fonts)
+    fonts = tftui.DirItems("/fonts", ".fnt")
+    fonts_len = fonts.count()
     message = "Hello!"
     scale = 0
     ok = 0
@@ -36,8 +35,8 @@ def main(ui):
             if font is not None:
 
                 while again:
-                    ui.cls(fonts[font], 0)
-                    font_file = "/fonts/" + fonts[font]
+                    ui.cls(fonts.item(font), 0)
+                    font_file = "/fonts/" + fonts.item(font)
                     width = ui.size(message, font=font_file, scale=scale)
 
                     ui.draw(
@@ -53,9 +52,9 @@ def main(ui):
                     if btn == button.CENTER:
                         if response == 0:
                             ui.cls(0)
-                            bot = TurtlePlotBot()
+                            bot = session.bot()
                             bot.setscale(scale)
-                            bot.write(message, "/fonts/" + fonts[font])
+                            bot.write(message, "/fonts/" + fonts.item(font))
                             bot.done()
                             again = False
                         elif response == 2:
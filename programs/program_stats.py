@@ -0,0 +1,71 @@
+'''
+Show the memory and time used by the last run of each program and turn
+recording them on or off.
+'''
+#pylint: disable-msg=import-error
+import launcher
+import runstats
+import vga2_bold_16x16 as font
+import tftui
+
+def seconds(ms):
+    '''
+    Return ms as seconds with one decimal place
+    '''
+    return "{}.{}s".format(ms // 1000, ms % 1000 // 100)
+
+def show_times(ui, name, stats):
+    '''
+    Show the run count, status, times and allocations
+    '''
+    ui.cls()
+    ui.center(name, 0, ui.fg_hdr, ui.bg_hdr)
+    ui.write("Runs {} {}".format(stats['runs'], stats['status']), 0, 1)
+    ui.write("Time {}".format(seconds(stats['ms'])), 0, 2)
+    ui.write("Move {}".format(seconds(stats['move_ms'])), 0, 3)
+    ui.write("GC   {}".format(stats['gc_runs']), 0, 4)
+    ui.write("Alloc {:,}".format(stats['allocated']), 0, 5)
+    ui.wait("Continue", 7)
+
+def show_memory(ui, name, stats):
+    '''
+    Show the free memory before, during and after the run
+    '''
+    ui.cls()
+    ui.center(name, 0, ui.fg_hdr, ui.bg_hdr)
+    ui.write("Free  {:,}".format(stats['free_before']), 0, 1)
+    ui.write("Low   {:,}".format(stats['free_low']), 0, 2)
+    ui.write("High  {:,}".format(stats['free_high']), 0, 3)
+    ui.write("After {:,}".format(stats['free_after']), 0, 4)
+    ui.write("Used  {:,}".format(stats['free_before'] - stats['free_low']), 0, 5)
+    ui.wait("Continue", 7)
+
+def main(ui):
+    """
+    Main routine
+    """
+    option = 0
+    while True:
+        log = runstats.load()
+        names = sorted(log)
+        menu = names + [
+            "Profiling On" if launcher.profiling() else "Profiling Off",
+            "Clear Stats",
+            "Back"]
+
+        option = ui.menu("Program Stats", menu, option)
+        if option is None or menu[option] == "Back":
+            break
+
+        if option < len(names):
+            show_times(ui, names[option], log[names[option]])
+            show_memory(ui, names[option], log[names[option]])
+        elif menu[option] == "Clear Stats":
+            runstats.clear()
+            option = 0
+        else:
+            launcher.profiling(not launcher.profiling())
+
+main(tftui.UI(font))
+
+__import__("menu")      # return to turtleplotbot menu
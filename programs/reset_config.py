@@ -4,7 +4,7 @@ Write ui.cfg with default values
 """
 
 #pylint: disable-msg=import-error
-import btree
+import config
 import vga2_bold_16x16 as font
 import button
 import tftui
@@ -13,21 +13,18 @@ def reset_cfg():
     """
     Overwrite ui.cfg with default values
     """
-    cfg_file = open("ui.cfg", "w+b")
-    cfg_db = btree.open(cfg_file)
+    cfg = config.shared()
+    cfg.clear()
 
     # Add a default AP name and password
-    cfg_db[b'AP_NAME'] = b'TurtleBot'
-    cfg_db[b'AP_PASS'] = b'turtlebot'
+    cfg.put(b'AP_NAME', b'TurtleBot')
+    cfg.put(b'AP_PASS', b'turtlebot')
 
     # Add any password for ap's you use
-    cfg_db[b'MY_AP_NAME'] = b'mypassword'
+    cfg.put(b'MY_AP_NAME', b'mypassword')
 
-    for key  in cfg_db:
-        print("key", key, " = ", cfg_db[key])
-
-    cfg_db.close()
-    cfg_file.close()
+    for key, value in cfg.items():
+        print("key", key, " = ", value)
 
 def main(ui):
     """
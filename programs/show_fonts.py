@@ -3,7 +3,6 @@ scroll_fonts.py - Scroll Hershey fonts on display
 '''
 
 #pylint: disable-msg=import-error
-import uos
 import button
 import vga2_bold_16x16 as font
 import tftui
@@ -12,17 +11,16 @@ def main(ui):
     """
     Main routine
     """
-    fonts = [font for font in uos.listdir('/fonts') if font.endswith('.fnt')]
-    font_count = len(fonts)
+    fonts = tftui.DirItems('/fonts', '.fnt')
+    font_count = fonts.count()
     font_current = 0
     message="Hello!"
     again = True
-    joystick = button.JoyStick()
 
     while again:
-        ui.cls(fonts[font_current], 0)
+        ui.cls(fonts.item(font_current), 0)
 
-        font = '/fonts/' + fonts[font_current]
+        font = '/fonts/' + fonts.item(font_current)
         column = ui.width//2 - ui.size(message, scale=1, font=font)//2
         line = ui.height//2 - 16
 
@@ -30,7 +28,7 @@ def main(ui):
 
         ui.center('Up-Prev Dn-Next', 6)
         ui.center('other-exit', 7)
-        btn = button.JoyStick().read()
+        btn = ui.joystick.read()
 
         if btn == button.DOWN:
             font_current -= 1
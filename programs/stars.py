@@ -2,7 +2,7 @@
 Draw a star from user provided values
 '''
 #pylint: disable-msg=import-error
-from turtleplotbot import TurtlePlotBot
+import session
 import vga2_bold_16x16 as font
 import button
 import tftui
@@ -45,7 +45,7 @@ def main(ui):
         points = form[1][ui.VAL]
         length = form[2][ui.VAL]
 
-        bot = TurtlePlotBot()
+        bot = session.bot()
         star(bot, points, length)
 
 main(tftui.UI(font))
@@ -0,0 +1,100 @@
+'''
+Show the step timing statistics recorded by the TurtlePlotBot and start or
+stop profiling.
+'''
+#pylint: disable-msg=import-error
+import session
+import vga2_bold_16x16 as font
+import button
+import tftui
+
+def percent(part, whole):
+    '''
+    Return part as a percentage of whole
+    '''
+    return part * 100 // whole if whole else 0
+
+def show_times(ui, stats):
+    '''
+    Show the step counts and where the time went
+    '''
+    ui.cls()
+    ui.center("Step Stats", 0, ui.fg_hdr, ui.bg_hdr)
+    ui.write("Steps {}".format(stats['steps']), 0, 1)
+    ui.write("Mean  {}us".format(stats['mean_us']), 0, 2)
+    ui.write("{}-{}us".format(stats['min_us'], stats['max_us']), 0, 3)
+    ui.write("I2C   {}%".format(
+        percent(stats['i2c_us'], stats['total_us'])), 0, 4)
+    ui.write("Wait  {}%".format(
+        percent(stats['wait_us'], stats['total_us'])), 0, 5)
+    ui.write("Pen {} GC {}".format(stats['pen_moves'], stats['gc_runs']), 0, 6)
+    ui.wait("Continue", 7)
+
+def show_histogram(ui, stats):
+    '''
+    Show the step interval histogram as a bar graph
+    '''
+    ui.cls()
+    ui.center("Intervals", 0, ui.fg_hdr, ui.bg_hdr)
+
+    histogram = stats['histogram']
+    top = ui.font.HEIGHT
+    height = ui.font.HEIGHT * 5
+    width = ui.width // len(histogram)
+    most = max(histogram) or 1
+
+    for index, count in enumerate(histogram):
+        bar = count * height // most
+        if count and not bar:
+            bar = 1
+
+        ui.display.fill_rect(
+            index * width + 1,
+            top + height - bar,
+            width - 2,
+            bar,
+            ui.fg_act if index == len(histogram) - 1 else ui.fg)
+
+    ui.center("0-{}ms".format(
+        stats['bin_us'] * len(histogram) / 1000), 6)
+    ui.wait("Continue", 7)
+
+def main(ui):
+    """
+    Main routine
+    """
+    # looking at the statistics should not reset the bot
+    bot = session.active()
+    stats = bot.stats() if bot is not None else None
+
+    if stats is None:
+        options = ("Start", "Back")
+        form = [
+            [ui.HEAD, 0, "Step Stats"],
+            [ui.CENTER, 2, "Profiling"],
+            [ui.CENTER, 3, "is off"],
+            [ui.OK, 0, 7, options, 0],
+        ]
+    else:
+        show_times(ui, stats)
+        show_histogram(ui, stats)
+        options = ("Reset", "Stop", "Back")
+        form = [
+            [ui.HEAD, 0, "Step Stats"],
+            [ui.CENTER, 2, "Profiling"],
+            [ui.CENTER, 3, "is on"],
+            [ui.OK, 0, 7, options, 0],
+        ]
+
+    btn, ok = ui.form(form)
+    if btn == button.CENTER:
+        if options[ok] in ("Start", "Reset"):
+            if bot is None:
+                bot = session.bot()
+            bot.profile(True)
+        elif options[ok] == "Stop":
+            bot.profile(False)
+
+main(tftui.UI(font))
+
+__import__("menu")      # return to turtleplotbot menu
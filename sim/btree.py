@@ -0,0 +1,140 @@
+"""
+btree.py - simulated MicroPython btree module
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+The database is a dict kept in memory. It is read from the stream when
+opened and written back by `flush` and `close` as length prefixed key and
+value records, so the file is not compatible with the device btree format.
+"""
+
+INCL = 1
+DESC = 2
+
+def _record(data):
+    return len(data).to_bytes(2, 'little') + data
+
+class _DB():
+    """
+    Simulated btree database returned by `open`
+    """
+    def __init__(self, stream):
+        self.stream = stream
+        self.data = {}
+        stream.seek(0)
+        raw = stream.read()
+        offset = 0
+        while offset + 2 <= len(raw):
+            values = []
+            for _ in range(2):
+                length = int.from_bytes(raw[offset:offset + 2], 'little')
+                values.append(bytes(raw[offset + 2:offset + 2 + length]))
+                offset += 2 + length
+
+            self.data[values[0]] = values[1]
+
+    def __getitem__(self, key):
+        return self.data[bytes(key)]
+
+    def __setitem__(self, key, value):
+        self.data[bytes(key)] = bytes(value)
+
+    def __delitem__(self, key):
+        del self.data[bytes(key)]
+
+    def __contains__(self, key):
+        return bytes(key) in self.data
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def get(self, key, default=None):
+        """
+        Returns:
+            bytes: value of key or default
+        """
+        return self.data.get(bytes(key), default)
+
+    def _range(self, start_key, end_key, flags):
+        keys = sorted(self.data)
+        if start_key is not None:
+            keys = [key for key in keys if key >= bytes(start_key)]
+
+        if end_key is not None:
+            end = bytes(end_key)
+            keys = [
+                key for key in keys
+                if key < end or (flags & INCL and key == end)]
+
+        if flags & DESC:
+            keys.reverse()
+
+        return keys
+
+    def keys(self, start_key=None, end_key=None, flags=0):
+        """
+        Returns:
+            list: keys in sorted order
+        """
+        return self._range(start_key, end_key, flags)
+
+    def values(self, start_key=None, end_key=None, flags=0):
+        """
+        Returns:
+            list: values in key order
+        """
+        return [self.data[key] for key in self._range(start_key, end_key, flags)]
+
+    def items(self, start_key=None, end_key=None, flags=0):
+        """
+        Returns:
+            list: (key, value) tuples in key order
+        """
+        return [
+            (key, self.data[key])
+            for key in self._range(start_key, end_key, flags)]
+
+    def flush(self):
+        """
+        Write the database to the stream
+        """
+        self.stream.seek(0)
+        self.stream.truncate()
+        for key in sorted(self.data):
+            self.stream.write(_record(key) + _record(self.data[key]))
+
+        self.stream.flush()
+
+    def close(self):
+        """
+        Write the database to the stream, the stream is not closed
+        """
+        self.flush()
+
+def open(stream, **kwargs): # pylint: disable-msg=redefined-builtin, unused-argument
+    """
+    Open a database stored in stream
+
+    Returns:
+        the database
+    """
+    return _DB(stream)
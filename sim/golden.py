@@ -0,0 +1,209 @@
+"""
+golden.py - record reference step streams and check drawings against them
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Usage::
+
+    python3 sim/golden.py record [--dir DIR] [drawing ...]
+    python3 sim/golden.py check [--dir DIR] [drawing ...]
+    python3 sim/golden.py compare EXPECTED ACTUAL
+
+Record the step streams (see `stepstream`) of the reference drawings in DIR
+before changing the motion code, then check the drawings still produce the
+same streams after the change. `compare` compares two stream files.
+
+The reference drawings are the motion examples in `examples` and the
+upper and lower case alphabets in every font, named like
+`examples/star.py` and `font:romans.fnt`. Each drawing is run in its own
+simulator process. `check` exits with status 1 if any stream differs.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import simulator
+from stepstream import StepStream, compare
+
+_EXAMPLES = (
+    'async_star.py', 'box_better.py', 'box_even_better.py', 'box_simple.py',
+    'circle.py', 'circle2.py', 'polygon.py', 'star.py', 'write.py',
+)
+_ALPHABET = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ abcdefghijklmnopqrstuvwxyz'
+_IDLE_MS = 2000
+
+def drawings():
+    """
+    Returns:
+        list: names of the reference drawings
+    """
+    fonts = sorted(
+        name for name in os.listdir(os.path.join(simulator.REPO, 'fonts'))
+        if name.endswith('.fnt'))
+
+    return (['examples/' + name for name in _EXAMPLES]
+            + ['font:' + name for name in fonts])
+
+def stream_file(folder, drawing):
+    """
+    Returns:
+        str: path of the stream file for drawing in folder
+    """
+    name = drawing.replace('/', '_').replace(':', '_').rsplit('.', 1)[0]
+    return os.path.join(folder, name + '.tpbs')
+
+def _record_one(drawing, file_name):
+    """
+    Run drawing in this process and save its step stream, used by the
+    subprocesses `record` starts.
+    """
+    sim = simulator.install()
+    stream = StepStream()
+    sim.recorder = stream.record
+    sim.stop_when_idle(_IDLE_MS)
+
+    try:
+        if drawing.startswith('font:'):
+            import session
+            session.bot().write(_ALPHABET, '/fonts/' + drawing[5:])
+        else:
+            import runpy
+            runpy.run_path(
+                os.path.join(simulator.REPO, drawing), run_name='__main__')
+    except (simulator.Stop, SystemExit):
+        pass
+
+    stream.save(file_name)
+
+def record(folder, names):
+    """
+    Record the step streams of the drawings in names to folder
+
+    Returns:
+        int: 0 if every drawing was recorded
+    """
+    os.makedirs(folder, exist_ok=True)
+    failed = 0
+    for drawing in names:
+        file_name = stream_file(folder, drawing)
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '_record', drawing, file_name],
+            check=False)
+        if result.returncode:
+            print('{}: failed'.format(drawing))
+            failed += 1
+        else:
+            print('{}: {} bytes'.format(drawing, os.path.getsize(file_name)))
+
+    return 1 if failed else 0
+
+def report(name, result):
+    """
+    Print the result of a comparison
+
+    Returns:
+        bool: True if the streams are the same
+    """
+    if result['same']:
+        print('{}: same, max time difference {}us'.format(name, result['max_time_us']))
+        return True
+
+    divergence = result['divergence']
+    print('{}: differs at event {}, expected {} got {}'.format(
+        name, divergence['index'], divergence['expected'], divergence['actual']))
+    print('    path difference {:.2f}mm, final position {:.2f}mm and {:.2f} degrees apart'.format(
+        result['path_mm'], result['final_mm'], result['heading']))
+    for label in ('expected', 'actual'):
+        path = result[label]
+        print('    {:8} drawn {:.1f}mm, travel {:.1f}mm, {:.1f}s'.format(
+            label, path['drawn_mm'], path['travel_mm'], path['seconds']))
+
+    return False
+
+def check(folder, names):
+    """
+    Record the drawings in names and compare them with the streams in folder
+
+    Returns:
+        int: 0 if every stream is the same
+    """
+    differ = 0
+    with tempfile.TemporaryDirectory() as actual:
+        record(actual, names)
+        for drawing in names:
+            expected_file = stream_file(folder, drawing)
+            actual_file = stream_file(actual, drawing)
+            if not os.path.exists(expected_file):
+                print('{}: no reference stream'.format(drawing))
+                continue
+
+            if not os.path.exists(actual_file):
+                differ += 1
+                continue
+
+            result = compare(
+                StepStream.load(expected_file), StepStream.load(actual_file))
+            if not report(drawing, result):
+                differ += 1
+
+    return 1 if differ else 0
+
+def main():
+    """
+    Parse the command line and run the command
+    """
+    parser = argparse.ArgumentParser(description='TurtlePlotBot step streams')
+    commands = parser.add_subparsers(dest='command', required=True)
+    for command in ('record', 'check'):
+        sub = commands.add_parser(command)
+        sub.add_argument('--dir', default='golden', help='reference stream directory')
+        sub.add_argument('drawings', nargs='*', help='drawings, defaults to all')
+
+    sub = commands.add_parser('compare')
+    sub.add_argument('expected')
+    sub.add_argument('actual')
+
+    sub = commands.add_parser('_record')
+    sub.add_argument('drawing')
+    sub.add_argument('file')
+
+    args = parser.parse_args()
+    if args.command == '_record':
+        _record_one(args.drawing, os.path.abspath(args.file))
+        return 0
+
+    if args.command == 'compare':
+        result = compare(StepStream.load(args.expected), StepStream.load(args.actual))
+        return 0 if report(args.actual, result) else 1
+
+    folder = os.path.abspath(args.dir)
+    names = args.drawings or drawings()
+    if args.command == 'record':
+        return record(folder, names)
+
+    return check(folder, names)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,373 @@
+"""
+machine.py - simulated MicroPython machine module
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Pin, I2C, SPI, PWM and Timer classes that run on the `simulator` clock.
+Pin levels are shared by every Pin object for the same pin number, I2C
+transfers go to the simulated devices in `I2C.devices`.
+"""
+
+import errno
+import simulator
+
+def _clock():
+    return simulator.simulator().clock
+
+def freq(hz=None): # pylint: disable-msg=unused-argument
+    """
+    CPU frequency, always 240MHz
+    """
+    return 240000000
+
+def idle():
+    """
+    Wait for an interrupt, advances the clock 1ms
+    """
+    _clock().advance(1000)
+
+def reset():
+    """
+    Reset the device, ends the simulation
+    """
+    raise SystemExit()
+
+soft_reset = reset
+
+def unique_id():
+    """
+    Returns:
+        bytes: the simulated device id
+    """
+    return b'\x24\x0a\xc4\x00\x00\x01'
+
+def disable_irq():
+    """
+    Interrupts are only run when the clock advances, nothing to disable
+    """
+    return 0
+
+def enable_irq(state=0): # pylint: disable-msg=unused-argument
+    """
+    See disable_irq
+    """
+
+class Pin():
+    """
+    Simulated GPIO pin, input pins are driven with `drive`
+    """
+    IN = 1
+    OUT = 3
+    OPEN_DRAIN = 7
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 2
+    IRQ_RISING = 1
+
+    levels = {}             # pin number: level
+    handlers = {}           # pin number: (handler, trigger)
+
+    def __init__(self, pin, mode=-1, pull=-1, value=None):
+        self.pin = pin
+        self.mode = mode
+        self.pull = pull
+        if value is not None:
+            self.value(value)
+        elif pin not in self.levels:
+            self.levels[pin] = 1 if pull == self.PULL_UP else 0
+
+    def __repr__(self):
+        return 'Pin({})'.format(self.pin)
+
+    def __call__(self, value=None):
+        return self.value(value)
+
+    def value(self, value=None):
+        """
+        Read or set the pin level
+        """
+        if value is None:
+            return self.levels.get(self.pin, 0)
+
+        self.drive(1 if value else 0)
+        return None
+
+    def on(self):
+        """
+        Set the pin high
+        """
+        self.drive(1)
+
+    def off(self):
+        """
+        Set the pin low
+        """
+        self.drive(0)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        """
+        Re-initialize the pin
+        """
+        self.__init__(self.pin, mode, pull, value)
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING):
+        """
+        Call handler(pin) when the pin level changes
+        """
+        if handler is None:
+            self.handlers.pop(self.pin, None)
+        else:
+            self.handlers[self.pin] = (handler, trigger)
+
+    def drive(self, level):
+        """
+        Change the pin level, running the interrupt handler if the change
+        matches its trigger
+        """
+        old = self.levels.get(self.pin, 0)
+        self.levels[self.pin] = level
+        if level != old and self.pin in self.handlers:
+            handler, trigger = self.handlers[self.pin]
+            if trigger & (self.IRQ_RISING if level else self.IRQ_FALLING):
+                handler(self)
+
+class I2C():
+    """
+    Simulated I2C bus. Each transfer advances the clock by the time it
+    takes at the bus frequency and is passed to the device in `devices`
+    with a matching address. Devices provide `write(reg, data)` and
+    `read(reg, nbytes)`.
+    """
+    devices = {}            # address: simulated device
+
+    def __init__(self, bus=-1, scl=None, sda=None, freq=400000): # pylint: disable-msg=redefined-outer-name
+        self.bus = bus
+        self.scl = scl
+        self.sda = sda
+        self.freq = freq
+        self.active = True
+        self.transactions = 0
+        self.bytes = 0
+
+    def _transfer(self, address, nbytes, reads, action, *args):
+        """
+        Pass a transfer to the device at address then advance the clock by
+        9 clocks per byte plus the start, restart and stop conditions.
+        Interrupts and timers that fall due run after the transfer like
+        they do on the device.
+
+        Returns:
+            the result of calling the device method action with args
+        """
+        if address not in self.devices:
+            raise OSError(errno.ENODEV)
+
+        self.transactions += 1
+        self.bytes += nbytes
+        result = getattr(self.devices[address], action)(*args)
+        clock = _clock()
+        clock.active()
+        bits = (nbytes + 1 + reads) * 9 + 2 + reads
+        clock.advance(bits * 1000000 // self.freq)
+        return result
+
+    def scan(self):
+        """
+        Returns:
+            list: addresses of the devices on the bus
+        """
+        return sorted(self.devices)
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8): # pylint: disable-msg=unused-argument
+        """
+        Write buf to device addr starting at register memaddr
+        """
+        self._transfer(addr, len(buf) + 1, 0, 'write', memaddr, bytes(buf))
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8): # pylint: disable-msg=unused-argument
+        """
+        Read nbytes from device addr starting at register memaddr
+        """
+        return bytes(self._transfer(addr, nbytes + 1, 1, 'read', memaddr, nbytes))
+
+    def readfrom_mem_into(self, addr, memaddr, buf, addrsize=8): # pylint: disable-msg=unused-argument
+        """
+        Read into buf from device addr starting at register memaddr
+        """
+        buf[:] = self._transfer(addr, len(buf) + 1, 1, 'read', memaddr, len(buf))
+
+    def deinit(self):
+        """
+        Turn off the bus
+        """
+        self.active = False
+
+    def writeto(self, addr, buf, stop=True): # pylint: disable-msg=unused-argument
+        """
+        Write buf to device addr, the first byte is the register
+        """
+        buf = bytes(buf)
+        self._transfer(addr, len(buf), 0, 'write', buf[0], buf[1:])
+        return 1
+
+    def readfrom(self, addr, nbytes, stop=True): # pylint: disable-msg=unused-argument
+        """
+        Read nbytes from device addr at register 0
+        """
+        return bytes(self._transfer(addr, nbytes, 0, 'read', 0, nbytes))
+
+class SPI():
+    """
+    Simulated SPI bus, counts the bytes written and advances the clock by
+    the time they take at the baud rate
+    """
+    def __init__(self, bus=1, baudrate=1000000, polarity=0, phase=0, **kwargs):
+        self.bus = bus
+        self.baudrate = baudrate
+        self.polarity = polarity
+        self.phase = phase
+        self.pins = kwargs
+        self.transactions = 0
+        self.bytes = 0
+
+    def init(self, baudrate=None, **kwargs): # pylint: disable-msg=unused-argument
+        """
+        Change the baud rate
+        """
+        if baudrate is not None:
+            self.baudrate = baudrate
+
+    def send(self, nbytes):
+        """
+        Count a transfer of nbytes and advance the clock
+        """
+        self.transactions += 1
+        self.bytes += nbytes
+        _clock().advance(nbytes * 8 * 1000000 // self.baudrate)
+
+    def write(self, buf):
+        """
+        Write buf to the bus
+        """
+        self.send(len(buf))
+
+    def deinit(self):
+        """
+        Turn off the bus
+        """
+
+class PWM():
+    """
+    Simulated PWM output, keeps the frequency and duty
+    """
+    def __init__(self, pin, freq=5000, duty=512): # pylint: disable-msg=redefined-outer-name
+        self.pin = pin
+        self._freq = freq
+        self._duty = duty
+
+    def freq(self, value=None):
+        """
+        Read or set the frequency
+        """
+        if value is None:
+            return self._freq
+
+        self._freq = value
+        return None
+
+    def duty(self, value=None):
+        """
+        Read or set the duty, 0 to 1023
+        """
+        if value is None:
+            return self._duty
+
+        self._duty = value
+        simulator.record(simulator.DUTY, value)
+        return None
+
+    def deinit(self):
+        """
+        Turn off the PWM output
+        """
+        self.duty(0)
+
+class Timer():
+    """
+    Simulated hardware timer, callbacks run when the clock passes the
+    timer period
+    """
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, timer_id=-1, **kwargs):
+        self.timer_id = timer_id
+        self.event = None
+        self.period = 0
+        self.mode = self.PERIODIC
+        self.callback = None
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, mode=PERIODIC, period=-1, callback=None, freq=None): # pylint: disable-msg=redefined-outer-name
+        """
+        Start the timer, a running timer is restarted
+        """
+        self.deinit()
+        if freq is not None:
+            period = 1000 // freq
+
+        self.mode = mode
+        self.period = period
+        self.callback = callback
+        self._start()
+
+    def _start(self):
+        clock = _clock()
+        self.event = clock.schedule(
+            clock.now_us + max(self.period, 1) * 1000, self._fire)
+
+    def _fire(self):
+        self.event = None
+        if self.mode == self.PERIODIC:
+            self._start()
+
+        if self.callback is not None:
+            self.callback(self)
+
+    def deinit(self):
+        """
+        Stop the timer
+        """
+        if self.event is not None:
+            _clock().cancel(self.event)
+            self.event = None
+
+    def value(self):
+        """
+        Returns:
+            int: ms until the timer fires, 0 if stopped
+        """
+        if self.event is None:
+            return 0
+
+        return max(self.event[0] - _clock().now_us, 0) // 1000
@@ -0,0 +1,129 @@
+"""
+network.py - simulated MicroPython network module
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+`ACCESS_POINTS` lists the access points a station scan finds as
+(ssid, password) tuples, connecting succeeds if the ssid and password
+match one of them.
+"""
+
+STA_IF = 0
+AP_IF = 1
+
+AUTH_OPEN = 0
+AUTH_WEP = 1
+AUTH_WPA_PSK = 2
+AUTH_WPA2_PSK = 3
+AUTH_WPA_WPA2_PSK = 4
+
+ACCESS_POINTS = [
+    (b'TurtleNet', b'turtleplot'),
+    (b'OpenNet', b''),
+]
+
+_ADDRESSES = ('192.168.4.20', '192.168.4.1')
+
+class WLAN():
+    """
+    Simulated station or access point interface
+    """
+    _state = [{'active': False, 'connected': False, 'config': {}} for _ in range(2)]
+
+    def __init__(self, interface=STA_IF):
+        self.interface = interface
+        self.state = self._state[interface]
+
+    def active(self, active=None):
+        """
+        Read or set whether the interface is active
+        """
+        if active is None:
+            return self.state['active']
+
+        self.state['active'] = bool(active)
+        if not active:
+            self.state['connected'] = False
+
+        return None
+
+    def scan(self):
+        """
+        Returns:
+            list: (ssid, bssid, channel, RSSI, authmode, hidden) tuples
+        """
+        return [
+            (ssid, bytes(6), 1, -50, AUTH_WPA_WPA2_PSK if password else AUTH_OPEN, False)
+            for ssid, password in ACCESS_POINTS]
+
+    def connect(self, ssid=None, password=None, **kwargs): # pylint: disable-msg=unused-argument
+        """
+        Connect to an access point in ACCESS_POINTS
+        """
+        ssid = ssid.encode() if isinstance(ssid, str) else ssid
+        password = password.encode() if isinstance(password, str) else password or b''
+        self.state['connected'] = (
+            self.state['active'] and (ssid, password) in ACCESS_POINTS)
+
+    def disconnect(self):
+        """
+        Disconnect from the access point
+        """
+        self.state['connected'] = False
+
+    def isconnected(self):
+        """
+        Returns:
+            bool: True if connected, access points are always connected
+        """
+        if self.interface == AP_IF:
+            return self.state['active']
+
+        return self.state['connected']
+
+    def status(self):
+        """
+        Returns:
+            int: 1010 if connected, otherwise 1000
+        """
+        return 1010 if self.isconnected() else 1000
+
+    def config(self, *args, **kwargs):
+        """
+        Read or set configuration values
+        """
+        if args:
+            return self.state['config'].get(args[0])
+
+        self.state['config'].update(kwargs)
+        return None
+
+    def ifconfig(self, config=None):
+        """
+        Returns:
+            tuple: (ip, subnet, gateway, dns)
+        """
+        if config is not None:
+            return None
+
+        address = _ADDRESSES[self.interface] if self.isconnected() else '0.0.0.0'
+        return (address, '255.255.255.0', '192.168.4.1', '192.168.4.1')
@@ -0,0 +1,104 @@
+"""
+run.py - run TurtlePlotBot programs in the simulator
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Usage::
+
+    python3 sim/run.py [--keys SCRIPT] [--idle MS] [--limit SECONDS]
+                       [--screen FILE] [--root DIR] [module or file]
+
+Runs the menu, or the module or python file given, with the key presses in
+SCRIPT (see `simulator.Keys`). The simulation stops when the script has
+finished and the bot has not moved for IDLE ms of simulated time, or when
+the simulated time reaches SECONDS. The display is saved to FILE as a PPM
+image when the simulation ends.
+
+Example::
+
+    python3 sim/run.py --keys "UP UP CENTER" --screen menu.ppm
+"""
+
+import argparse
+import os
+import runpy
+import sys
+import time
+
+import simulator
+
+def main():
+    """
+    Parse the command line and run the simulation
+    """
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--keys', default='', help='joystick script')
+    parser.add_argument(
+        '--idle', type=int, default=2000,
+        help='ms without key presses or motion before stopping, 0 never stops')
+    parser.add_argument(
+        '--limit', type=float, default=0,
+        help='simulated seconds before stopping, 0 for no limit')
+    parser.add_argument('--screen', help='save the display to a PPM file')
+    parser.add_argument('--root', help='device root directory')
+    parser.add_argument('program', nargs='?', default='menu')
+    args = parser.parse_args()
+
+    program = args.program
+    if os.path.isfile(program):
+        program = os.path.abspath(program)
+
+    screen = os.path.abspath(args.screen) if args.screen else None
+
+    sim = simulator.install(args.root)
+    sim.keys.script(args.keys)
+    if args.idle:
+        sim.stop_when_idle(args.idle)
+
+    if args.limit:
+        sim.stop_at(args.limit)
+
+    started = time.perf_counter()
+    try:
+        if program.endswith('.py'):
+            runpy.run_path(program, run_name='__main__')
+        else:
+            __import__(program)
+        result = 'exited'
+    except simulator.Stop:
+        result = 'stopped'
+    except SystemExit:
+        result = 'exited'
+
+    elapsed = time.perf_counter() - started
+    simulated = sim.clock.now_us / 1000000
+    print('{} after {:.3f}s simulated in {:.3f}s, {} keys pressed'.format(
+        result, simulated, elapsed, sim.keys.pressed))
+
+    display = sim.display()
+    if screen and display is not None:
+        display.save(screen)
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
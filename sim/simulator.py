@@ -0,0 +1,496 @@
+"""
+simulator.py - run the TurtlePlotBot software on a computer
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+The `sim` directory holds CPython versions of the MicroPython modules the
+TurtlePlotBot software uses (`machine`, `st7789`, `btree`, `network`, `uos`
+and `uasyncio`) so the modules in `lib` run unmodified on a computer.
+
+Time is simulated. `install` replaces the MicroPython `time` functions with
+ones that read a `Clock`, sleeping advances the clock instantly and runs any
+timers, pin changes or key presses that fall due. I2C and SPI transfers
+advance the clock by the time they would take at the bus frequency, so
+drawings take as long in simulated time as they do on the bot.
+
+Files are opened relative to a device root directory, `/fonts/romans.fnt`
+is read from `<root>/fonts/romans.fnt`. The default root is a temporary
+directory linking to the repository `fonts` and `programs` directories so
+files written by a program, like ui.cfg, do not end up in the repository.
+
+Example::
+
+    import simulator
+
+    sim = simulator.install()
+    sim.keys.script("DOWN DOWN DOWN DOWN CENTER")
+    sim.run("menu")
+"""
+
+import builtins
+import gc
+import heapq
+import os
+import sys
+import tempfile
+import time
+
+_TICKS_PERIOD = 1 << 30
+_TICKS_MAX = _TICKS_PERIOD - 1
+_TICKS_HALF = _TICKS_PERIOD // 2
+_HEAP_SIZE = 111168         # MicroPython heap on an ESP32 without SPIRAM
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(_HERE)
+
+_SIM = None
+
+# kinds of output recorded by `record`
+GPIO = 0                    # MCP23017 port A output latch write
+DUTY = 1                    # PWM duty change
+
+class Stop(Exception):
+    """
+    Raised by the clock when the simulation reaches its time limit
+    """
+
+def ticks_add(ticks, delta):
+    """
+    MicroPython time.ticks_add
+    """
+    return (ticks + delta) & _TICKS_MAX
+
+def ticks_diff(ticks1, ticks2):
+    """
+    MicroPython time.ticks_diff
+    """
+    return ((ticks1 - ticks2 + _TICKS_HALF) & _TICKS_MAX) - _TICKS_HALF
+
+class Clock():
+    """
+    Simulated clock counting microseconds from the start of the simulation.
+    Events are callbacks scheduled to run when the clock reaches a given
+    time.
+
+    The simulation is stopped by raising `Stop` when the clock passes
+    `stop_us`, or when `idle_us` passes after `busy_us` without any I2C
+    transfers or key presses.
+
+    Args:
+        read_us (optional int): us the clock advances each time it is read,
+            so loops polling the clock without sleeping still make progress
+    """
+    def __init__(self, read_us=1):
+        self.now_us = 0
+        self.read_us = read_us
+        self.stop_us = None
+        self.idle_us = None
+        self.busy_us = 0
+        self.active_us = 0
+        self.events = []
+        self.sequence = 0
+
+    def active(self):
+        """
+        Note that the device is doing something, it is not idle
+        """
+        self.active_us = self.now_us
+
+    def schedule(self, at_us, callback, *args):
+        """
+        Run callback(*args) when the clock reaches at_us
+
+        Returns:
+            list: the event, pass it to `cancel` to remove it
+        """
+        self.sequence += 1
+        event = [at_us, self.sequence, callback, args]
+        heapq.heappush(self.events, event)
+        return event
+
+    @staticmethod
+    def cancel(event):
+        """
+        Stop a scheduled event from running
+        """
+        event[2] = None
+
+    def advance(self, delta_us):
+        """
+        Move the clock forward delta_us running events that fall due
+
+        Raises:
+            Stop: if the clock passes stop_us or the device is idle
+        """
+        target = self.now_us + max(int(delta_us), 0)
+        while self.events and self.events[0][0] <= target:
+            at_us, _, callback, args = heapq.heappop(self.events)
+            if callback is not None:
+                self.now_us = max(self.now_us, at_us)
+                callback(*args)
+
+        self.now_us = target
+        if self.stop_us is not None and self.now_us >= self.stop_us:
+            raise Stop()
+
+        if (self.idle_us is not None and self.now_us >= self.busy_us
+                and self.now_us - self.active_us >= self.idle_us):
+            raise Stop()
+
+    def ticks_us(self):
+        """
+        MicroPython time.ticks_us
+        """
+        self.advance(self.read_us)
+        return self.now_us & _TICKS_MAX
+
+    def ticks_ms(self):
+        """
+        MicroPython time.ticks_ms
+        """
+        self.advance(self.read_us)
+        return (self.now_us // 1000) & _TICKS_MAX
+
+    def ticks_cpu(self):
+        """
+        MicroPython time.ticks_cpu
+        """
+        return self.ticks_us()
+
+    def sleep(self, seconds):
+        """
+        MicroPython time.sleep
+        """
+        self.advance(seconds * 1000000)
+
+    def sleep_ms(self, delay):
+        """
+        MicroPython time.sleep_ms
+        """
+        self.advance(delay * 1000)
+
+    def sleep_us(self, delay):
+        """
+        MicroPython time.sleep_us
+        """
+        self.advance(delay)
+
+    def time(self):
+        """
+        Seconds since the start of the simulation
+        """
+        return self.now_us // 1000000
+
+# button name: (pin, active_low)
+_KEYS = {
+    'UP': (32, False),
+    'DOWN': (25, False),
+    'LEFT': (33, False),
+    'RIGHT': (26, False),
+    'CENTER': (27, False),
+    'CHANGE': (0, True),
+    'ENTER': (35, True),
+}
+_KEYS_ACTIVE_LOW = dict(_KEYS.values())
+
+class Keys():
+    """
+    Scripted joystick, presses buttons by changing the simulated input pins
+    at set times.
+
+    A script is a string of words run one after another:
+
+        ========== ===================================================
+        Word       Action
+        ========== ===================================================
+        UP         press and release a button, also DOWN, LEFT, RIGHT,
+                   CENTER, CHANGE and ENTER
+        LONG:name  press and hold a button for a long press
+        WAIT:ms    do nothing for ms milliseconds
+        ========== ===================================================
+
+    Args:
+        clock (Clock): the simulation clock
+        press_ms (optional int): how long a button is held for a press
+        long_ms (optional int): how long a button is held for a long press
+        gap_ms (optional int): time between presses
+    """
+    def __init__(self, clock, press_ms=100, long_ms=800, gap_ms=200):
+        self.clock = clock
+        self.press_ms = press_ms
+        self.long_ms = long_ms
+        self.gap_ms = gap_ms
+        self.next_us = 0
+        self.pressed = 0
+
+        for pin, active_low in _KEYS.values():
+            pin_level(pin, 1 if active_low else 0)
+
+    def press(self, name, hold_ms=None):
+        """
+        Add a button press to the script
+
+        Args:
+            name (str): button name
+            hold_ms (optional int): how long to hold the button
+        """
+        pin, active_low = _KEYS[name.upper()]
+        if hold_ms is None:
+            hold_ms = self.press_ms
+
+        start = max(self.next_us, self.clock.now_us) + self.gap_ms * 1000
+        self.clock.schedule(start, self._change, pin, 0 if active_low else 1)
+        self.clock.schedule(
+            start + hold_ms * 1000, self._change, pin, 1 if active_low else 0)
+        self.next_us = start + hold_ms * 1000
+        self.clock.busy_us = self.next_us
+
+    def _change(self, pin, level):
+        self.clock.active()
+        pin_level(pin, level)
+        if level == (1 if _KEYS_ACTIVE_LOW[pin] else 0):
+            self.pressed += 1
+
+    def wait(self, delay_ms):
+        """
+        Add a pause to the script
+        """
+        self.next_us = max(self.next_us, self.clock.now_us) + delay_ms * 1000
+        self.clock.busy_us = self.next_us
+
+    def script(self, words):
+        """
+        Add the words of a script, see the class description
+        """
+        for word in words.split():
+            action, _, value = word.partition(':')
+            action = action.upper()
+            if action == 'WAIT':
+                self.wait(int(value))
+            elif action == 'LONG':
+                self.press(value, self.long_ms)
+            else:
+                self.press(action)
+
+def pin_level(pin, level):
+    """
+    Drive a simulated input pin to level, running any pin interrupt handler
+    """
+    import machine
+    machine.Pin(pin).drive(level)
+
+def device_path(path):
+    """
+    Return the host path for a path on the device. Absolute paths starting
+    with a file or directory in the device root, or naming a new file in
+    it, are taken from the root, other host paths are left alone.
+    """
+    if isinstance(path, str) and path.startswith('/') and _SIM is not None:
+        if path.startswith(_SIM.root):
+            return path
+
+        name = path.lstrip('/')
+        if not name or os.path.exists(
+                os.path.join(_SIM.root, name.split('/')[0])):
+            return os.path.join(_SIM.root, name)
+
+        # new files in the device root, like /stats.log, are not host paths
+        if '/' not in name and not os.path.exists(path):
+            return os.path.join(_SIM.root, name)
+
+    return path
+
+def make_root():
+    """
+    Create a temporary device root linking to the repository `fonts` and
+    `programs` directories
+
+    Returns:
+        str: path of the device root
+    """
+    root = tempfile.mkdtemp(prefix='turtleplotbot-')
+    for name in ('fonts', 'programs'):
+        os.symlink(os.path.join(REPO, name), os.path.join(root, name))
+
+    return root
+
+class _File():
+    """
+    File opened by the simulated device, counts the calls that read it
+    """
+    def __init__(self, file):
+        self._file = file
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._file.close()
+
+    def __iter__(self):
+        return iter(self._file)
+
+    def read(self, *args):
+        _SIM.file_reads += 1
+        return self._file.read(*args)
+
+    def readinto(self, buf):
+        _SIM.file_reads += 1
+        return self._file.readinto(buf)
+
+    def readline(self, *args):
+        _SIM.file_reads += 1
+        return self._file.readline(*args)
+
+def _host_open(path, *args, **kwargs):
+    kwargs.pop('buffering', None)
+    _SIM.file_opens += 1
+    return _File(_OPEN(device_path(path), *args, **kwargs))
+
+_OPEN = builtins.open
+
+class Simulator():
+    """
+    The simulated device, created by `install`
+
+    Args:
+        root (str): host directory used as the device file system root
+    """
+    def __init__(self, root):
+        self.root = root
+        self.clock = Clock()
+        self.keys = Keys(self.clock)
+        self.file_opens = 0     # files opened by the device
+        self.recorder = None    # called with (us, kind, value) by `record`
+        self.file_reads = 0     # read calls on files opened by the device
+
+    def i2c_device(self, address):
+        """
+        Return the simulated device at an I2C address
+        """
+        import machine
+        return machine.I2C.devices.get(address)
+
+    def display(self):
+        """
+        Return the last display created or None
+        """
+        import st7789
+        return st7789.ST7789.last
+
+    def stop_when_idle(self, delay_ms):
+        """
+        Stop the simulation when the key script has finished and there have
+        been no I2C transfers or key presses for delay_ms
+        """
+        self.clock.idle_us = delay_ms * 1000
+
+    def stop_at(self, seconds):
+        """
+        Stop the simulation when the clock reaches seconds
+        """
+        self.clock.stop_us = int(seconds * 1000000)
+
+    def run(self, module):
+        """
+        Import module the way boot.py starts the menu. Returns when the
+        module exits, raises `Stop` or runs out of key presses.
+
+        Returns:
+            bool: True if the module exited by itself
+        """
+        try:
+            __import__(module)
+        except (Stop, SystemExit):
+            return False
+        return True
+
+def install(root=None):
+    """
+    Set up the simulated device, replacing the MicroPython time functions,
+    putting the `sim`, `lib` and `frozen` directories on sys.path and
+    changing to the device root directory.
+
+    Args:
+        root (optional str): device root directory, defaults to a new
+            directory from `make_root`
+
+    Returns:
+        Simulator: the simulated device
+    """
+    global _SIM # pylint: disable-msg=global-statement
+    for path in (
+            os.path.join(REPO, 'frozen'),
+            os.path.join(REPO, 'lib'),
+            _HERE):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    _SIM = Simulator(os.path.abspath(root or make_root()))
+
+    import machine
+    from virtual_mcp23017 import VirtualMCP23017
+    mcp = machine.I2C.devices.setdefault(0x20, VirtualMCP23017())
+    mcp.on_output = _mcp_output
+
+    sys.path.append(os.path.join(_SIM.root, 'programs'))
+    os.chdir(_SIM.root)
+
+    clock = _SIM.clock
+    for name in ('ticks_us', 'ticks_ms', 'ticks_cpu', 'sleep', 'sleep_ms', 'sleep_us'):
+        setattr(time, name, getattr(clock, name))
+
+    time.ticks_add = ticks_add
+    time.ticks_diff = ticks_diff
+
+    if not hasattr(gc, 'mem_alloc'):
+        import tracemalloc
+        gc.mem_alloc = lambda: tracemalloc.get_traced_memory()[0]
+        gc.mem_free = lambda: _HEAP_SIZE - gc.mem_alloc()
+
+    builtins.open = _host_open
+    return _SIM
+
+def _mcp_output(port, value):
+    if port == 0:
+        record(GPIO, value)
+
+def record(kind, value):
+    """
+    Pass an output change to the recorder if there is one
+
+    Args:
+        kind (int): GPIO or DUTY
+        value (int): the value written
+    """
+    if _SIM is not None and _SIM.recorder is not None:
+        _SIM.recorder(_SIM.clock.now_us, kind, value)
+
+def simulator():
+    """
+    Returns:
+        Simulator: the simulated device or None if not installed
+    """
+    return _SIM
@@ -0,0 +1,305 @@
+"""
+st7789.py - simulated st7789 display driver
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Draws into a framebuffer of RGB565 pixels instead of the LCD. The bytes the
+C driver would send are passed to the simulated SPI bus so drawing takes
+the time it takes on the device. `save` writes the framebuffer to a PPM
+image file.
+"""
+
+import array
+import types
+
+BLACK = 0x0000
+BLUE = 0x001F
+RED = 0xF800
+GREEN = 0x07E0
+CYAN = 0x07FF
+MAGENTA = 0xF81F
+YELLOW = 0xFFE0
+WHITE = 0xFFFF
+
+_WINDOW_BYTES = 11          # CASET, RASET and RAMWR commands and arguments
+
+def color565(red, green=0, blue=0):
+    """
+    Convert red, green and blue values (0-255) into a 16-bit 565 color
+    """
+    if isinstance(red, (tuple, list)):
+        red, green, blue = red[:3]
+
+    return (red & 0xf8) << 8 | (green & 0xfc) << 3 | blue >> 3
+
+class ST7789():
+    """
+    Simulated ST7789 display
+
+    Attributes:
+        last (ST7789): the last display created
+    """
+    last = None
+
+    # pylint: disable-msg=too-many-arguments
+    def __init__(self, spi, width, height, reset=None, dc=None, cs=None,
+                 backlight=None, rotation=0):
+        self.spi = spi
+        self.reset_pin = reset
+        self.dc_pin = dc
+        self.cs_pin = cs
+        self.backlight = backlight
+        self._display_width = width
+        self._display_height = height
+        self._width = width
+        self._height = height
+        self.buffer = None
+        self.rotation(rotation)
+        ST7789.last = self
+
+    def _send(self, nbytes):
+        if self.spi is not None and hasattr(self.spi, 'send'):
+            self.spi.send(nbytes)
+
+    def _window(self, pixels):
+        self._send(_WINDOW_BYTES + pixels * 2)
+
+    def init(self):
+        """
+        Initialize the display
+        """
+        self._send(32)
+
+    def on(self):
+        """
+        Turn on the backlight
+        """
+
+    def off(self):
+        """
+        Turn off the backlight
+        """
+
+    def hard_reset(self):
+        """
+        Reset the display
+        """
+
+    def soft_reset(self):
+        """
+        Reset the display
+        """
+        self._send(1)
+
+    def sleep_mode(self, value): # pylint: disable-msg=unused-argument
+        """
+        Enter or leave sleep mode
+        """
+        self._send(1)
+
+    def inversion_mode(self, value): # pylint: disable-msg=unused-argument
+        """
+        Turn color inversion on or off
+        """
+        self._send(1)
+
+    def width(self):
+        """
+        Returns:
+            int: width of the display in the current rotation
+        """
+        return self._width
+
+    def height(self):
+        """
+        Returns:
+            int: height of the display in the current rotation
+        """
+        return self._height
+
+    def rotation(self, rotation):
+        """
+        Set the rotation, 0 and 2 are portrait, 1 and 3 landscape. The
+        display is cleared.
+        """
+        if rotation & 1:
+            self._width, self._height = self._display_height, self._display_width
+        else:
+            self._width, self._height = self._display_width, self._display_height
+
+        self.buffer = array.array('H', bytes(self._width * self._height * 2))
+        self._send(2)
+
+    def _fill(self, x, y, width, height, color):
+        """
+        Fill the clipped rectangle in the framebuffer
+
+        Returns:
+            int: number of pixels filled
+        """
+        x_end = min(x + width, self._width)
+        y_end = min(y + height, self._height)
+        x = max(x, 0)
+        y = max(y, 0)
+        if x >= x_end or y >= y_end:
+            return 0
+
+        row = array.array('H', [color]) * (x_end - x)
+        for line in range(y, y_end):
+            start = line * self._width + x
+            self.buffer[start:start + x_end - x] = row
+
+        return (x_end - x) * (y_end - y)
+
+    def fill(self, color):
+        """
+        Fill the display with color
+        """
+        self._window(self._fill(0, 0, self._width, self._height, color))
+
+    def fill_rect(self, x, y, width, height, color):
+        """
+        Draw a filled rectangle
+        """
+        self._window(self._fill(x, y, width, height, color))
+
+    def rect(self, x, y, width, height, color):
+        """
+        Draw a rectangle outline
+        """
+        self.hline(x, y, width, color)
+        self.hline(x, y + height - 1, width, color)
+        self.vline(x, y, height, color)
+        self.vline(x + width - 1, y, height, color)
+
+    def pixel(self, x, y, color):
+        """
+        Draw a pixel
+        """
+        self._window(self._fill(x, y, 1, 1, color))
+
+    def hline(self, x, y, length, color):
+        """
+        Draw a horizontal line
+        """
+        self._window(self._fill(x, y, length, 1, color))
+
+    def vline(self, x, y, length, color):
+        """
+        Draw a vertical line
+        """
+        self._window(self._fill(x, y, 1, length, color))
+
+    def line(self, x0, y0, x1, y1, color):
+        """
+        Draw a line, the C driver sends each run of pixels on a row or
+        column as a line
+        """
+        steep = abs(y1 - y0) > abs(x1 - x0)
+        if steep:
+            x0, y0, x1, y1 = y0, x0, y1, x1
+
+        if x0 > x1:
+            x0, x1, y0, y1 = x1, x0, y1, y0
+
+        dx = x1 - x0
+        dy = abs(y1 - y0)
+        err = dx // 2
+        ystep = 1 if y0 < y1 else -1
+        start = x0
+        for x in range(x0, x1 + 1):
+            err -= dy
+            if err < 0 or x == x1:
+                if steep:
+                    self.vline(y0, start, x - start + 1, color)
+                else:
+                    self.hline(start, y0, x - start + 1, color)
+
+                start = x + 1
+                y0 += ystep
+                err += dx
+
+    def blit_buffer(self, buffer, x, y, width, height):
+        """
+        Copy a buffer of big endian RGB565 pixels to the display
+        """
+        for row in range(height):
+            for col in range(width):
+                index = (row * width + col) * 2
+                self._fill(
+                    x + col, y + row, 1, 1,
+                    buffer[index] << 8 | buffer[index + 1])
+
+        self._window(width * height)
+
+    # pylint: disable-msg=too-many-locals
+    def text(self, font, text, x0, y0, fg=WHITE, bg=BLACK):
+        """
+        Draw text using a bitmap font module with WIDTH, HEIGHT, FIRST,
+        LAST and FONT attributes. Each character is sent as one window.
+        The driver reads the font's module globals, so like the device
+        anything but a module is rejected.
+        """
+        if not isinstance(font, types.ModuleType):
+            raise TypeError('font must be a module')
+
+        if isinstance(text, (bytes, bytearray)):
+            chars = text
+        else:
+            chars = [ord(char) for char in text]
+
+        width = font.WIDTH
+        height = font.HEIGHT
+        row_bytes = (width + 7) // 8
+        char_bytes = row_bytes * height
+        for char in chars:
+            if font.FIRST <= char <= font.LAST:
+                offset = (char - font.FIRST) * char_bytes
+                for row in range(height):
+                    for col in range(width):
+                        byte = font.FONT[offset + row * row_bytes + (col >> 3)]
+                        bit = byte & (0x80 >> (col & 7))
+                        self._fill(x0 + col, y0 + row, 1, 1, fg if bit else bg)
+
+                self._window(width * height)
+                x0 += width
+
+    def get_pixel(self, x, y):
+        """
+        Returns:
+            int: RGB565 color of the pixel at x, y
+        """
+        return self.buffer[y * self._width + x]
+
+    def save(self, file_name):
+        """
+        Save the framebuffer as a binary PPM image
+        """
+        with open(file_name, 'wb') as file:
+            file.write('P6 {} {} 255\n'.format(self._width, self._height).encode())
+            pixels = bytearray()
+            for color in self.buffer:
+                pixels.append((color >> 8) & 0xf8)
+                pixels.append((color >> 3) & 0xfc)
+                pixels.append((color << 3) & 0xf8)
+
+            file.write(pixels)
@@ -0,0 +1,279 @@
+"""
+stepstream.py - record and compare the outputs driving the TurtlePlotBot
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+A step stream is the sequence of bytes written to the MCP23017 port A
+output latch and the pen servo PWM duty changes, each with the simulated
+time in us it happened.
+
+Streams are stored as a 5 byte header followed by zlib compressed records.
+Each record is a varint of the time since the previous record shifted left
+one bit with the kind in the low bit, then the value, one byte for GPIO
+writes and a varint for duty changes.
+
+`replay` works out where the bot went from the stepper phases written so
+streams can be compared by the paths drawn as well as byte by byte.
+"""
+
+import math
+import zlib
+
+import simulator
+
+_MAGIC = b'TPBS\x01'
+
+_STEPS_PER_REV = 4076           # these match turtleplotbot.py
+_WHEEL_DIAMETER = 64.5
+_WHEELBASE = 112.5
+_STEPS_PER_MM = _STEPS_PER_REV / (_WHEEL_DIAMETER * math.pi)
+_STEP_MASKS = (
+    0b1000, 0b1100, 0b0100, 0b0110, 0b0010, 0b0011, 0b0001, 0b1001
+)
+_PHASES = {mask: phase for phase, mask in enumerate(_STEP_MASKS)}
+
+_SERVO_FREQ = 50                # servo settings from turtleplotbot.py
+_SERVO_MIN_US = 600
+_SERVO_MAX_US = 2400
+_SERVO_ANGLE = 180
+_PEN_DOWN_OVER = 135            # angles above this have the pen down
+
+def _varint(value, out):
+    while value > 0x7f:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+
+    out.append(value)
+
+def _read_varint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, offset
+
+def duty_angle(duty):
+    """
+    Returns:
+        float: servo angle for a PWM duty, None if the servo is off
+    """
+    if not duty:
+        return None
+
+    pulse_us = duty * 1000000 / (1024 * _SERVO_FREQ)
+    return (pulse_us - _SERVO_MIN_US) * _SERVO_ANGLE / (_SERVO_MAX_US - _SERVO_MIN_US)
+
+class StepStream():
+    """
+    Recorded GPIO writes and servo duty changes
+
+    Attributes:
+        events (list): (us, kind, value) tuples, kind is simulator.GPIO or
+            simulator.DUTY
+    """
+    def __init__(self, events=None):
+        self.events = [] if events is None else events
+
+    def record(self, time_us, kind, value):
+        """
+        Add an event, used as the simulator recorder
+        """
+        self.events.append((time_us, kind, value))
+
+    def encode(self):
+        """
+        Returns:
+            bytes: the stream in the compact file format
+        """
+        body = bytearray()
+        last = 0
+        for time_us, kind, value in self.events:
+            _varint((time_us - last) << 1 | kind, body)
+            if kind == simulator.GPIO:
+                body.append(value)
+            else:
+                _varint(value, body)
+
+            last = time_us
+
+        return _MAGIC + zlib.compress(bytes(body), 9)
+
+    @classmethod
+    def decode(cls, data):
+        """
+        Returns:
+            StepStream: the stream stored in data
+
+        Raises:
+            ValueError: if data is not a step stream
+        """
+        if data[:len(_MAGIC)] != _MAGIC:
+            raise ValueError('not a step stream')
+
+        body = zlib.decompress(data[len(_MAGIC):])
+        events = []
+        offset = 0
+        time_us = 0
+        while offset < len(body):
+            delta, offset = _read_varint(body, offset)
+            time_us += delta >> 1
+            kind = delta & 1
+            if kind == simulator.GPIO:
+                value = body[offset]
+                offset += 1
+            else:
+                value, offset = _read_varint(body, offset)
+
+            events.append((time_us, kind, value))
+
+        return cls(events)
+
+    def save(self, file_name):
+        """
+        Write the stream to file_name
+        """
+        with open(file_name, 'wb') as file:
+            file.write(self.encode())
+
+    @classmethod
+    def load(cls, file_name):
+        """
+        Returns:
+            StepStream: the stream read from file_name
+        """
+        with open(file_name, 'rb') as file:
+            return cls.decode(file.read())
+
+# pylint: disable-msg=too-many-locals
+def replay(stream):
+    """
+    Follow the bot through a stream. The pen is taken to be midway between
+    the wheels.
+
+    Returns:
+        dict: `drawn_mm` and `travel_mm` moved with the pen down and up,
+        final `x`, `y` in mm and `heading` in degrees, `steps` taken by the
+        left and right motors and `seconds` from the first to the last event
+    """
+    phases = [None, None]
+    steps = [0, 0]
+    x_pos = y_pos = heading = 0.0
+    drawn = travel = 0.0
+    pen_down = False
+
+    for _, kind, value in stream.events:
+        if kind == simulator.DUTY:
+            angle = duty_angle(value)
+            if angle is not None:
+                pen_down = angle > _PEN_DOWN_OVER
+            continue
+
+        moved = [0, 0]
+        for motor in (0, 1):
+            phase = _PHASES.get(value >> (motor * 4) & 0x0f)
+            if phase is None:
+                continue
+
+            if phases[motor] is not None:
+                # the bot steps to a lower phase for a positive distance
+                moved[motor] = -((phase - phases[motor] + 4) % 8 - 4)
+
+            phases[motor] = phase
+
+        if moved == [0, 0]:
+            continue
+
+        steps[0] += moved[0]
+        steps[1] += moved[1]
+        left = moved[0] / _STEPS_PER_MM
+        right = moved[1] / _STEPS_PER_MM
+        distance = (right - left) / 2
+        turn = -(left + right) / _WHEELBASE
+        x_pos += distance * math.cos(heading + turn / 2)
+        y_pos += distance * math.sin(heading + turn / 2)
+        heading += turn
+        if pen_down:
+            drawn += abs(distance)
+        else:
+            travel += abs(distance)
+
+    events = stream.events
+    return {
+        'drawn_mm': drawn,
+        'travel_mm': travel,
+        'x': x_pos,
+        'y': y_pos,
+        'heading': math.degrees(heading) % 360,
+        'steps': steps,
+        'seconds': (events[-1][0] - events[0][0]) / 1000000 if events else 0,
+    }
+
+def compare(expected, actual):
+    """
+    Compare two streams
+
+    Returns:
+        dict: `same` is True if the events match ignoring times,
+        `divergence` is None or the index and (us, kind, value) of the
+        first differing event in each stream, `max_time_us` is the largest
+        time difference before the divergence, `path_mm` the difference in
+        distance drawn plus the difference in distance traveled with the pen
+        up, `final_mm` the distance between the final positions and
+        `heading` the difference in final headings.
+    """
+    first = None
+    max_time = 0
+    for index, (old, new) in enumerate(zip(expected.events, actual.events)):
+        if old[1:] != new[1:]:
+            first = index
+            break
+
+        max_time = max(max_time, abs(new[0] - old[0]))
+
+    if first is None and len(expected.events) != len(actual.events):
+        first = min(len(expected.events), len(actual.events))
+
+    divergence = None
+    if first is not None:
+        divergence = {
+            'index': first,
+            'expected': expected.events[first] if first < len(expected.events) else None,
+            'actual': actual.events[first] if first < len(actual.events) else None,
+        }
+
+    old = replay(expected)
+    new = replay(actual)
+    heading = (new['heading'] - old['heading'] + 180) % 360 - 180
+    return {
+        'same': first is None,
+        'divergence': divergence,
+        'max_time_us': max_time,
+        'path_mm': abs(new['drawn_mm'] - old['drawn_mm'])
+                   + abs(new['travel_mm'] - old['travel_mm']),
+        'final_mm': math.hypot(new['x'] - old['x'], new['y'] - old['y']),
+        'heading': heading,
+        'expected': old,
+        'actual': new,
+    }
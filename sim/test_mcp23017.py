@@ -0,0 +1,167 @@
+"""
+test_mcp23017.py - block transfers of lib/mcp23017.py against the simulated chip
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+
+Usage::
+
+    python3 -m unittest discover sim
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'lib'))
+
+from virtual_mcp23017 import VirtualMCP23017  # pylint: disable=wrong-import-position
+import mcp23017  # pylint: disable=wrong-import-position
+
+_ADDRESS = 0x20
+_IOCON = 0x05
+
+class _Bus():
+    """
+    I2C bus with only the simulated chip on it, counts the transfers
+    """
+    def __init__(self, chip):
+        self.chip = chip
+        self.transfers = 0
+
+    def scan(self):
+        return [_ADDRESS]
+
+    def writeto_mem(self, addr, memaddr, buf):
+        assert addr == _ADDRESS
+        self.transfers += 1
+        self.chip.write(memaddr, bytes(buf))
+
+    def readfrom_mem_into(self, addr, memaddr, buf):
+        assert addr == _ADDRESS
+        self.transfers += 1
+        buf[:] = self.chip.read(memaddr, len(buf))
+
+class BlockTransferTest(unittest.TestCase):
+    """
+    read_block, write_block, snapshot and restore with the address pointer
+    incrementing (SEQOP enabled) and fixed (SEQOP disabled)
+    """
+    def setUp(self):
+        self.chip = VirtualMCP23017()
+        self.bus = _Bus(self.chip)
+        self.mcp = mcp23017.MCP23017(self.bus, _ADDRESS)
+
+    def _shadow_matches_chip(self):
+        for reg in (0x00, 0x05, 0x06, 0x0a):
+            for port in (0, 1):
+                self.assertEqual(
+                    self.mcp._shadow[reg << 1 | port], self.chip.port(reg, port),
+                    'register {:#x} port {}'.format(reg, port))
+
+    def _check_modes(self, test):
+        for bank in (False, True):
+            for sequential in (True, False):
+                with self.subTest(bank=bank, sequential=sequential):
+                    self.setUp()
+                    self.mcp.config(sequential_operation=not sequential, bank=bank)
+                    test(bank, sequential)
+
+    def test_write_block(self):
+        def test(bank, sequential):
+            # GPPU and IODIR of port A in bank 1, IODIR to IPOL of B in bank 0
+            start = 0x00 if bank else 0x01
+            self.mcp.write_block(start, b'\x12\x34\x56')
+            if bank:
+                self.assertEqual([self.chip.port(reg, 0) for reg in range(3)], [0x12, 0x34, 0x56])
+            else:
+                self.assertEqual(
+                    [self.chip.port(0, 1), self.chip.port(1, 0), self.chip.port(1, 1)],
+                    [0x12, 0x34, 0x56])
+            self._shadow_matches_chip()
+
+        self._check_modes(test)
+
+    def test_read_block(self):
+        def test(bank, sequential):
+            self.mcp.porta.pullup = 0x5a
+            self.mcp.portb.pullup = 0xa5
+            start = 0x06 if bank else 0x0c
+            count = 1 if bank else 2
+            data = bytes(self.mcp.read_block(start, count))
+            self.assertEqual(data, b'\x5a' if bank else b'\x5a\xa5')
+
+        self._check_modes(test)
+
+    def test_one_transfer_when_sequential(self):
+        self.bus.transfers = 0
+        self.mcp.write_block(0x0c, b'\x01\x02')
+        self.assertEqual(self.bus.transfers, 1)
+
+        self.mcp.config(sequential_operation=True)
+        self.bus.transfers = 0
+        self.mcp.write_block(0x0c, b'\x01\x02')
+        self.assertEqual(self.bus.transfers, 2)
+
+    def test_snapshot_restore(self):
+        def test(bank, sequential):
+            self.mcp.porta.mode = 0x0f
+            self.mcp.portb.mode = 0xf0
+            self.mcp.porta.pullup = 0x33
+            self.mcp.portb.output_latch = 0x44
+            saved = self.mcp.snapshot()
+            self.assertEqual(saved[0x00], 0x0f)
+            self.assertEqual(saved[0x01], 0xf0)
+            self.assertEqual(saved[0x0c], 0x33)
+            self.assertEqual(saved[0x15], 0x44)
+
+            # back to bank 0 sequential with other register values
+            self.mcp.config(sequential_operation=False, bank=False)
+            self.mcp.porta.mode = 0xff
+            self.mcp.portb.pullup = 0x77
+            self.mcp.restore(saved)
+            self.assertEqual(self.mcp.snapshot(), saved)
+            self.assertEqual(self.chip.port(0x00, 0), 0x0f)
+            self.assertEqual(self.chip.port(0x00, 1), 0xf0)
+            self.assertEqual(self.chip.port(0x06, 0), 0x33)
+            self.assertEqual(self.chip.port(0x0a, 1), 0x44)
+            self._shadow_matches_chip()
+
+        self._check_modes(test)
+
+    def test_unmapped_addresses(self):
+        with self.assertRaises(ValueError):
+            self.mcp.write_block(0x15, b'\x00\x00')
+        with self.assertRaises(ValueError):
+            self.mcp.read_block(0x16, 1)
+
+        self.mcp.config(bank=True)
+        writes = self.chip.writes
+        with self.assertRaises(ValueError):
+            self.mcp.write_block(0x0a, b'\x00\x00')
+        with self.assertRaises(ValueError):
+            self.mcp.read_block(0x0c, 1)
+        self.assertEqual(self.chip.writes, writes)
+        self._shadow_matches_chip()
+
+if __name__ == '__main__':
+    unittest.main()
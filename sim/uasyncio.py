@@ -0,0 +1,284 @@
+"""
+uasyncio.py - simulated MicroPython uasyncio module
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+A small scheduler with the parts of uasyncio the TurtlePlotBot software
+uses. Tasks sleep on the `simulator` clock, when every task is sleeping the
+clock jumps to the next wake up time.
+"""
+
+import heapq
+import simulator
+
+class CancelledError(BaseException):
+    """
+    Thrown into a task when it is cancelled
+    """
+
+class TimeoutError(Exception): # pylint: disable-msg=redefined-builtin
+    """
+    Raised by wait_for when the timeout expires
+    """
+
+class _Sleep():
+    def __init__(self, delay_us):
+        self.delay_us = delay_us
+
+    def __await__(self):
+        yield self.delay_us
+
+def sleep_ms(delay):
+    """
+    Sleep for delay ms
+    """
+    return _Sleep(int(delay * 1000))
+
+def sleep(delay):
+    """
+    Sleep for delay seconds
+    """
+    return _Sleep(int(delay * 1000000))
+
+class Task():
+    """
+    A coroutine run by the scheduler
+    """
+    def __init__(self, coro):
+        self.coro = coro
+        self.done = False
+        self.result = None
+        self.error = None
+        self.waiting = []
+        self.cancelling = False
+
+    def cancel(self):
+        """
+        Throw CancelledError into the task the next time it runs
+        """
+        if not self.done:
+            self.cancelling = True
+            _LOOP.wake(self, 0)
+
+    def __await__(self):
+        while not self.done:
+            yield self
+
+        if self.error is not None:
+            raise self.error
+
+        return self.result
+
+class Loop():
+    """
+    Scheduler running tasks on the simulator clock
+    """
+    def __init__(self):
+        self.queue = []
+        self.sequence = 0
+        self.sleeping = {}
+
+    def wake(self, task, at_us):
+        """
+        Schedule task to run when the clock reaches at_us
+        """
+        self.sequence += 1
+        self.sleeping[task] = self.sequence
+        heapq.heappush(self.queue, (at_us, self.sequence, task))
+
+    def create_task(self, coro):
+        """
+        Returns:
+            Task: a new task running coro
+        """
+        task = Task(coro)
+        self.wake(task, simulator.simulator().clock.now_us)
+        return task
+
+    def _step(self, task):
+        try:
+            if task.cancelling:
+                task.cancelling = False
+                waits = task.coro.throw(CancelledError())
+            else:
+                waits = task.coro.send(None)
+        except StopIteration as stop:
+            task.done = True
+            task.result = stop.value
+        except CancelledError as error:
+            task.done = True
+            task.error = error
+        except Exception as error: # pylint: disable-msg=broad-except
+            task.done = True
+            task.error = error
+        else:
+            clock = simulator.simulator().clock
+            if isinstance(waits, Task):
+                waits.waiting.append(task)
+            else:
+                self.wake(task, clock.now_us + (waits or 0))
+            return
+
+        clock = simulator.simulator().clock
+        for waiter in task.waiting:
+            self.wake(waiter, clock.now_us)
+
+    def run_until_complete(self, main):
+        """
+        Run tasks until main is done
+
+        Returns:
+            the result of main
+        """
+        if not isinstance(main, Task):
+            main = self.create_task(main)
+
+        clock = simulator.simulator().clock
+        while not main.done and self.queue:
+            at_us, sequence, task = heapq.heappop(self.queue)
+            if task.done or self.sleeping.get(task) != sequence:
+                continue
+
+            del self.sleeping[task]
+            if at_us > clock.now_us:
+                clock.advance(at_us - clock.now_us)
+
+            self._step(task)
+
+        if main.error is not None:
+            raise main.error
+
+        return main.result
+
+    def run_forever(self):
+        """
+        Run tasks until there are none left
+        """
+        self.run_until_complete(self.create_task(_forever()))
+
+async def _forever():
+    while True:
+        await sleep_ms(1000)
+
+_LOOP = Loop()
+
+def get_event_loop():
+    """
+    Returns:
+        Loop: the scheduler
+    """
+    return _LOOP
+
+def new_event_loop():
+    """
+    Returns:
+        Loop: a new empty scheduler
+    """
+    global _LOOP # pylint: disable-msg=global-statement
+    _LOOP = Loop()
+    return _LOOP
+
+def create_task(coro):
+    """
+    Returns:
+        Task: a new task running coro
+    """
+    return _LOOP.create_task(coro)
+
+def run(coro):
+    """
+    Run coro and the tasks it creates until coro is done
+
+    Returns:
+        the result of coro
+    """
+    return _LOOP.run_until_complete(coro)
+
+async def gather(*awaitables):
+    """
+    Returns:
+        list: results of running awaitables concurrently
+    """
+    tasks = [
+        item if isinstance(item, Task) else create_task(item)
+        for item in awaitables]
+    return [await task for task in tasks]
+
+async def wait_for(awaitable, timeout):
+    """
+    Wait for awaitable, cancelling it after timeout seconds
+
+    Raises:
+        TimeoutError: if awaitable did not finish in time
+    """
+    task = awaitable if isinstance(awaitable, Task) else create_task(awaitable)
+    clock = simulator.simulator().clock
+    deadline = clock.now_us + int(timeout * 1000000)
+    while not task.done:
+        if clock.now_us >= deadline:
+            task.cancel()
+            raise TimeoutError()
+
+        await sleep_ms(1)
+
+    return await task
+
+def wait_for_ms(awaitable, timeout):
+    """
+    wait_for with the timeout in ms
+    """
+    return wait_for(awaitable, timeout / 1000)
+
+class Event():
+    """
+    Flag tasks can wait for
+    """
+    def __init__(self):
+        self.state = False
+
+    def set(self):
+        """
+        Set the flag, waiting tasks continue
+        """
+        self.state = True
+
+    def clear(self):
+        """
+        Clear the flag
+        """
+        self.state = False
+
+    def is_set(self):
+        """
+        Returns:
+            bool: True if set
+        """
+        return self.state
+
+    async def wait(self):
+        """
+        Wait until the flag is set
+        """
+        while not self.state:
+            await sleep_ms(1)
+
+        return True
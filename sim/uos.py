@@ -0,0 +1,132 @@
+"""
+uos.py - simulated MicroPython uos module
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+File system functions working in the simulator device root directory.
+"""
+
+import os
+from simulator import device_path
+
+_FS_BLOCKS = 512            # blocks in the simulated file system
+_FS_BLOCK_SIZE = 4096
+
+sep = '/'
+
+def ilistdir(path='.'):
+    """
+    Returns:
+        iterator: (name, type, inode, size) tuples, type 0x4000 for
+        directories and 0x8000 for files
+    """
+    for entry in os.scandir(device_path(path)):
+        is_dir = entry.is_dir()
+        yield (
+            entry.name,
+            0x4000 if is_dir else 0x8000,
+            0,
+            0 if is_dir else entry.stat().st_size)
+
+def listdir(path='.'):
+    """
+    Returns:
+        list: names in the directory
+    """
+    return sorted(os.listdir(device_path(path)))
+
+def stat(path):
+    """
+    Returns:
+        tuple: os.stat values for path, the mode uses the device types
+    """
+    result = os.stat(device_path(path))
+    mode = 0x4000 if os.path.isdir(device_path(path)) else 0x8000
+    return (mode, 0, 0, 0, 0, 0, result.st_size,
+            int(result.st_atime), int(result.st_mtime), int(result.st_ctime))
+
+def statvfs(path): # pylint: disable-msg=unused-argument
+    """
+    Returns:
+        tuple: file system sizes, used blocks are worked out from the files
+        in the device root
+    """
+    used = 0
+    for folder, _, files in os.walk(device_path('/'), followlinks=True):
+        for name in files:
+            used += os.path.getsize(os.path.join(folder, name))
+
+    used_blocks = min(-(-used // _FS_BLOCK_SIZE), _FS_BLOCKS)
+    free = _FS_BLOCKS - used_blocks
+    return (_FS_BLOCK_SIZE, _FS_BLOCK_SIZE, _FS_BLOCKS, free, free, 0, 0, 0, 0, 255)
+
+def remove(path):
+    """
+    Remove a file
+    """
+    os.remove(device_path(path))
+
+def rename(old_path, new_path):
+    """
+    Rename a file
+    """
+    os.rename(device_path(old_path), device_path(new_path))
+
+def mkdir(path):
+    """
+    Create a directory
+    """
+    os.mkdir(device_path(path))
+
+def rmdir(path):
+    """
+    Remove a directory
+    """
+    os.rmdir(device_path(path))
+
+def getcwd():
+    """
+    Returns:
+        str: the current directory on the device
+    """
+    path = os.path.relpath(os.getcwd(), device_path('/'))
+    return '/' if path == '.' else '/' + path
+
+def chdir(path):
+    """
+    Change the current directory
+    """
+    os.chdir(device_path(path))
+
+def uname():
+    """
+    Returns:
+        tuple: system name, node name, release, version and machine
+    """
+    return ('esp32', 'esp32', '1.12.0', 'v1.12 simulated', 'TurtlePlotBot with ESP32')
+
+def urandom(nbytes):
+    """
+    Returns:
+        bytes: nbytes random bytes
+    """
+    return os.urandom(nbytes)
@@ -0,0 +1,144 @@
+"""
+virtual_mcp23017.py - simulated MCP23017 register file
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Registers are kept in IOCON.BANK = 0 order, port A then port B for each
+register. Writing GPIO writes OLAT, reading GPIO returns OLAT for output
+pins and `inputs` for input pins. Both the BANK and SEQOP addressing modes
+are supported.
+"""
+
+_IODIR = 0x00
+_IPOL = 0x01
+_IOCON = 0x05
+_GPIO = 0x09
+_OLAT = 0x0A
+_REGISTERS = 11
+
+_IOCON_BANK = 0x80
+_IOCON_SEQOP = 0x20
+
+class VirtualMCP23017():
+    """
+    Simulated MCP23017 connected to the simulated I2C bus
+
+    Attributes:
+        registers (bytearray): register values in BANK = 0 order
+        inputs (list): levels on the port A and port B input pins
+        writes (int): number of register bytes written
+        on_output (function): called with (port, value) each time an
+            output latch is written, or None
+    """
+    def __init__(self):
+        self.registers = bytearray(_REGISTERS * 2)
+        self.inputs = [0, 0]
+        self.writes = 0
+        self.on_output = None
+        self.reset()
+
+    def reset(self):
+        """
+        Power on reset, all pins are inputs
+        """
+        for index in range(len(self.registers)):
+            self.registers[index] = 0
+
+        self.registers[_IODIR << 1] = 0xff
+        self.registers[_IODIR << 1 | 1] = 0xff
+
+    def _index(self, address):
+        """
+        Returns:
+            int: index into registers of the register at address
+        """
+        if self.registers[_IOCON << 1] & _IOCON_BANK:
+            return (address & 0x0f) << 1 | (address >> 4) & 1
+
+        return address
+
+    def _next(self, address):
+        """
+        Returns:
+            int: address of the register after address in a sequential
+            transfer
+        """
+        iocon = self.registers[_IOCON << 1]
+        if iocon & _IOCON_SEQOP:
+            if iocon & _IOCON_BANK:
+                return address
+
+            return address ^ 1
+
+        if iocon & _IOCON_BANK:
+            port = address & 0x10
+            return port | ((address & 0x0f) + 1) % _REGISTERS
+
+        return (address + 1) % (_REGISTERS * 2)
+
+    def port(self, reg, port):
+        """
+        Returns:
+            int: value of register reg for port 0 (A) or 1 (B)
+        """
+        return self.registers[reg << 1 | port]
+
+    def write(self, address, data):
+        """
+        Write data to the registers starting at address
+        """
+        for value in data:
+            index = self._index(address)
+            reg, port = index >> 1, index & 1
+            if reg == _GPIO:
+                index = _OLAT << 1 | port
+            elif reg == _IOCON:
+                # IOCON is one register seen at both port addresses
+                self.registers[_IOCON << 1 ^ port ^ 1] = value
+
+            self.registers[index] = value
+            self.writes += 1
+            if index >> 1 == _OLAT and self.on_output is not None:
+                self.on_output(port, value)
+
+            address = self._next(address)
+
+    def read(self, address, nbytes):
+        """
+        Read nbytes from the registers starting at address
+        """
+        data = bytearray(nbytes)
+        for offset in range(nbytes):
+            index = self._index(address)
+            reg, port = index >> 1, index & 1
+            if reg == _GPIO:
+                iodir = self.registers[_IODIR << 1 | port]
+                inputs = self.inputs[port] ^ self.registers[_IPOL << 1 | port]
+                data[offset] = (
+                    self.registers[_OLAT << 1 | port] & ~iodir
+                    | inputs & iodir) & 0xff
+            else:
+                data[offset] = self.registers[index]
+
+            address = self._next(address)
+
+        return data
@@ -0,0 +1,307 @@
+"""
+fontsubset.py - shrink Hershey and bitmap fonts to the characters used
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Usage::
+
+    python3 tools/fontsubset.py [--preset NAME] [--chars CHARS]
+        [--text FILE] [--pack] [-o DIR] font ...
+
+Writes copies of Hershey `.fnt` files and frozen bitmap font modules
+(`frozen/vga*.py`) holding only the characters in the chosen set to DIR,
+`subset` by default, with the same file names so they can replace the
+originals on the MicroSD card or in the firmware build.
+
+The character set is the preset, `ui` by default, plus any `--chars` and
+every character in the `--text` files, which may be given more than once,
+for example the programs that will be run::
+
+    python3 tools/fontsubset.py --preset alnum --text programs/hello.py \\
+        fonts/romans.fnt frozen/vga2_bold_16x16.py
+
+Hershey fonts keep their layout so `TurtlePlot.write` reads them as
+before. Characters left out point to one empty glyph and the offset table
+is cut after the last character kept.
+
+Bitmap fonts keep the characters in a single FIRST to LAST range when the
+set is contiguous. Otherwise only the glyphs in the set are kept, numbered
+from 1, and the module gets a MAP string of the characters in glyph order
+that `tftui.UI` uses to translate text before drawing it. Characters not
+in MAP are drawn as spaces.
+
+With `--pack` bitmap fonts are written in the packed format read by
+`lib/packedfont.py`, each different glyph row is stored once and glyphs
+are lists of row numbers with repeats. `tftui.UI` decodes the glyphs of a
+packed font as they are first drawn. Use the `all` preset to pack a font
+without leaving characters out. Fonts that packing does not make smaller,
+like the 8 pixel wide ones, are written unpacked.
+"""
+
+import argparse
+import os
+import string
+import sys
+
+_PRESETS = {
+    'ascii': string.printable[:95],
+    # the tftui keyboards use escape and delete for the cancel and back keys
+    'ui': string.printable[:95] + '\x1b\x7f',
+    'alnum': string.ascii_letters + string.digits + ' .,:;!?\'"-',
+    'all': ''.join(chr(code) for code in range(256)),
+}
+
+_VECTOR_OFFSET = 0x52           # added to Hershey glyph coordinates
+_MAP_FIRST = 0x01               # first glyph of a remapped bitmap font
+_MAP_LAST = 0x7f                # glyphs must be single byte characters
+_REPEAT = 0xf0                  # packedfont.REPEAT
+
+def subset_fnt(data, chars):
+    """
+    Subset a Hershey font
+
+    Args:
+        data (bytes): font file contents
+        chars (set): characters to keep
+
+    Returns:
+        bytes: the subset font file
+    """
+    count = int.from_bytes(data[0:2], 'little')
+    begins = 0x00 if count > 96 else 0x20
+    codes = [ord(char) - begins for char in chars
+             if 0 <= ord(char) - begins < count]
+
+    # keep a table long enough for the last character, write() picks the
+    # first character from the count so a table starting at 0 stays > 96
+    keep = max(codes) + 1 if codes else 1
+    if begins == 0x00:
+        keep = max(keep, 97)
+
+    keep = min(keep, count)
+    table = bytearray()
+    glyphs = bytearray()
+    offset = 2 + keep * 2
+    empty = None
+    for code in range(keep):
+        if code in codes:
+            start = int.from_bytes(data[2 + code * 2:4 + code * 2], 'little')
+            glyph = data[start:start + 3 + data[start] * 2]
+            table += (offset + len(glyphs)).to_bytes(2, 'little')
+            glyphs += glyph
+        else:
+            if empty is None:
+                empty = offset + len(glyphs)
+                glyphs += bytes((0, _VECTOR_OFFSET, _VECTOR_OFFSET))
+
+            table += empty.to_bytes(2, 'little')
+
+    return keep.to_bytes(2, 'little') + bytes(table) + bytes(glyphs)
+
+def load_bitmap(file_name):
+    """
+    Returns:
+        dict: WIDTH, HEIGHT, FIRST, LAST and _FONT of a bitmap font module
+    """
+    module = {}
+    with open(file_name) as file:
+        exec(file.read(), {'memoryview': bytes}, module)  # pylint: disable=exec-used
+
+    return module
+
+def _bytes_line(data):
+    return "b'" + ''.join('\\x{:02x}'.format(byte) for byte in data) + "'\\\n"
+
+def pack_glyphs(glyphs, row_bytes):
+    """
+    Pack glyphs into the packed font format, see `lib/packedfont.py`
+
+    Args:
+        glyphs (list): bitmap of each glyph
+        row_bytes (int): bytes in each glyph row
+
+    Returns:
+        tuple: ROWS, OFFSETS and GLYPHS bytes
+
+    Raises:
+        ValueError: if the glyphs have too many different rows
+    """
+    rows = {}
+    offsets = bytearray()
+    data = bytearray()
+    for glyph in glyphs:
+        offsets += len(data).to_bytes(2, 'little')
+        last = None
+        repeat = 0
+        for start in range(0, len(glyph), row_bytes):
+            row = bytes(glyph[start:start + row_bytes])
+            if row == last and repeat < 0x100 - _REPEAT:
+                if repeat:
+                    data[-1] += 1
+                else:
+                    data.append(_REPEAT)
+                repeat += 1
+                continue
+
+            index = rows.setdefault(row, len(rows))
+            if index >= _REPEAT:
+                raise ValueError('more than {} different glyph rows'.format(_REPEAT))
+
+            data.append(index)
+            last = row
+            repeat = 0
+
+    offsets += len(data).to_bytes(2, 'little')
+    return b''.join(rows), bytes(offsets), bytes(data)
+
+def _bytes_lines(name, data, per_line=32):
+    lines = ['{} =\\\n'.format(name)]
+    for start in range(0, len(data), per_line):
+        lines.append(_bytes_line(data[start:start + per_line]))
+
+    if not data:
+        lines.append("b''\\\n")
+
+    lines[-1] = lines[-1][:-2] + '\n'
+    return lines
+
+# pylint: disable-msg=too-many-locals
+def subset_bitmap(module, chars, name, pack=False):
+    """
+    Subset a bitmap font
+
+    Args:
+        module (dict): font loaded by `load_bitmap`
+        chars (set): characters to keep
+        name (str): file name of the original font
+        pack (bool): write a packed font if it is smaller
+
+    Returns:
+        str: source of the subset font module
+
+    Raises:
+        ValueError: if a remapped set has more glyphs than fit in single
+            byte characters or a packed font has too many different rows
+    """
+    first, last = module['FIRST'], module['LAST']
+    row_bytes = (module['WIDTH'] + 7) // 8
+    glyph_bytes = row_bytes * module['HEIGHT']
+    font = module['_FONT']
+    codes = sorted(ord(char) for char in chars if first <= ord(char) <= last)
+    if not codes:
+        codes = [first]
+
+    glyphs = [font[(code - first) * glyph_bytes:(code - first + 1) * glyph_bytes]
+              for code in codes]
+
+    packed = pack_glyphs(glyphs, row_bytes) if pack else None
+    if packed and sum(len(data) for data in packed) >= len(glyphs) * glyph_bytes:
+        print('{}: packing does not make it smaller'.format(name))
+        packed = None
+
+    lines = ['"""{} of {}, {} glyphs"""\n'.format(
+        'packed subset' if packed else 'subset', os.path.basename(name), len(codes))]
+    lines.append('WIDTH = {}\n'.format(module['WIDTH']))
+    lines.append('HEIGHT = {}\n'.format(module['HEIGHT']))
+    if codes == list(range(codes[0], codes[-1] + 1)):
+        lines.append('FIRST = 0x{:02x}\n'.format(codes[0]))
+        lines.append('LAST = 0x{:02x}\n'.format(codes[-1]))
+    else:
+        if len(codes) > _MAP_LAST - _MAP_FIRST + 1:
+            raise ValueError('{}: {} glyphs can not be remapped, at most {}'.format(
+                name, len(codes), _MAP_LAST - _MAP_FIRST + 1))
+
+        lines.append('FIRST = 0x{:02x}\n'.format(_MAP_FIRST))
+        lines.append('LAST = 0x{:02x}\n'.format(_MAP_FIRST + len(codes) - 1))
+        lines.append('MAP = {!r}\n'.format(''.join(chr(code) for code in codes)))
+
+    if packed:
+        for label, data in zip(('ROWS', 'OFFSETS', 'GLYPHS'), packed):
+            lines.extend(_bytes_lines(label, data))
+
+        return ''.join(lines)
+
+    lines.append('_FONT =\\\n')
+    for glyph in glyphs:
+        lines.append(_bytes_line(glyph))
+
+    lines.append('\nFONT = memoryview(_FONT)\n')
+    return ''.join(lines)
+
+def character_set(preset, chars, text_files):
+    """
+    Returns:
+        set: characters in the preset, chars and the text files
+    """
+    result = set(_PRESETS[preset])
+    result.update(chars or '')
+    for file_name in text_files or ():
+        with open(file_name, encoding='utf-8', errors='ignore') as file:
+            result.update(file.read())
+
+    return result
+
+def main():
+    """
+    Parse the command line and write the subset fonts
+
+    Returns:
+        int: 0 if every font was written
+    """
+    parser = argparse.ArgumentParser(description='Subset TurtlePlotBot fonts')
+    parser.add_argument('--preset', choices=sorted(_PRESETS), default='ui',
+                        help='base character set, defaults to ui')
+    parser.add_argument('--chars', help='more characters to keep')
+    parser.add_argument('--text', action='append', help='keep the characters in this file')
+    parser.add_argument('--pack', action='store_true',
+                        help='write packed bitmap fonts, see lib/packedfont.py')
+    parser.add_argument('-o', '--output', default='subset', help='output directory')
+    parser.add_argument('fonts', nargs='+', help='.fnt files and bitmap font modules')
+    args = parser.parse_args()
+
+    chars = character_set(args.preset, args.chars, args.text)
+    os.makedirs(args.output, exist_ok=True)
+    failed = 0
+    for name in args.fonts:
+        out_name = os.path.join(args.output, os.path.basename(name))
+        try:
+            if name.endswith('.fnt'):
+                with open(name, 'rb') as file:
+                    data = subset_fnt(file.read(), chars)
+                with open(out_name, 'wb') as file:
+                    file.write(data)
+            else:
+                data = subset_bitmap(load_bitmap(name), chars, name, args.pack)
+                with open(out_name, 'w') as file:
+                    file.write(data)
+        except ValueError as error:
+            print(error)
+            failed += 1
+            continue
+
+        print('{}: {} -> {} bytes'.format(
+            name, os.path.getsize(name), os.path.getsize(out_name)))
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
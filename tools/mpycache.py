@@ -0,0 +1,123 @@
+"""
+mpycache.py - precompile the programs run from the menu
+
+MIT License
+Copyright (c) 2020 Russ Hughes
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+Usage::
+
+    python3 tools/mpycache.py [--mpy-cross PATH] [--programs DIR]
+
+Compiles each program in DIR, `programs` by default, with mpy-cross into
+DIR/__mpy__ and writes the index read by `lib/launcher.py`. Programs whose
+source has the same size and digest as the last time are not compiled
+again. Use the mpy-cross built with the device firmware so the .mpy
+version matches, then copy DIR/__mpy__ to /programs/__mpy__ on the device.
+"""
+
+import argparse
+import hashlib
+import os
+import subprocess
+import sys
+
+_CACHE = '__mpy__'
+_INDEX = 'index'
+
+def read_index(file_name):
+    """
+    Returns:
+        dict: program name: [size, mtime, digest] from an index file
+    """
+    index = {}
+    if os.path.exists(file_name):
+        with open(file_name) as file:
+            for line in file:
+                fields = line.split()
+                if len(fields) == 4:
+                    index[fields[0]] = [int(fields[1]), int(fields[2]), fields[3]]
+
+    return index
+
+def main():
+    """
+    Parse the command line and compile the changed programs
+
+    Returns:
+        int: 0 if every program was compiled
+    """
+    parser = argparse.ArgumentParser(description='Precompile TurtlePlotBot programs')
+    parser.add_argument('--mpy-cross', default='mpy-cross', help='mpy-cross to run')
+    parser.add_argument('--programs', default='programs', help='program directory')
+    args = parser.parse_args()
+
+    folder = os.path.join(args.programs, _CACHE)
+    os.makedirs(folder, exist_ok=True)
+    index_file = os.path.join(folder, _INDEX)
+    old = read_index(index_file)
+    index = {}
+    failed = 0
+    for file_name in sorted(os.listdir(args.programs)):
+        if not file_name.endswith('.py'):
+            continue
+
+        name = file_name[:-3]
+        source = os.path.join(args.programs, file_name)
+        output = os.path.join(folder, name + '.mpy')
+        with open(source, 'rb') as file:
+            data = file.read()
+
+        digest = hashlib.sha256(data).hexdigest()
+        entry = old.get(name)
+        if entry and entry[0] == len(data) and entry[2] == digest and os.path.exists(output):
+            index[name] = entry
+            print('{}: unchanged'.format(file_name))
+            continue
+
+        try:
+            result = subprocess.run(
+                [args.mpy_cross, '-o', output, source], check=False)
+        except OSError as error:
+            print('{}: {}'.format(args.mpy_cross, error))
+            return 1
+
+        if result.returncode:
+            print('{}: failed'.format(file_name))
+            failed += 1
+            continue
+
+        # the device adds the mtime of its copy of the source the first
+        # time it checks the digest
+        index[name] = [len(data), 0, digest]
+        print('{}: {} -> {} bytes'.format(file_name, len(data), os.path.getsize(output)))
+
+    for name in old:
+        if name not in index and os.path.exists(os.path.join(folder, name + '.mpy')):
+            os.remove(os.path.join(folder, name + '.mpy'))
+
+    with open(index_file, 'w') as file:
+        for name, (size, mtime, digest) in sorted(index.items()):
+            file.write('{} {} {} {}\n'.format(name, size, mtime, digest))
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())